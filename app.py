@@ -1,11 +1,16 @@
 import streamlit as st
-import time
+import io
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 try:
     import utils.parser as parser
     import utils.nlp_processing as nlp_processing
     import utils.matcher as matcher
     import utils.report_generator as report_generator
+    import utils.batch as batch
     import plotly.graph_objects as go
+    import pandas as pd
 except Exception as e:
     st.error(f"Error importing modules: {e}")
     st.stop()
@@ -32,6 +37,231 @@ def local_css(file_name):
 local_css("assets/style.css")
 
 
+@st.cache_resource(show_spinner="Loading language model...")
+def load_nlp_model():
+    """spaCy pipeline, loaded once per server process and shared by all sessions (None with the engine sidecar)"""
+    return nlp_processing.warm_up()
+
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def run_analysis(file_hash, jd_hash, _file_bytes, _jd_text):
+    """
+    Full resume/JD analysis, cached on (file hash, JD hash).
+    The underscore arguments carry the content but are not hashed by Streamlit.
+    """
+    # 1. Parse PDF
+    resume_text = parser.extract_text_from_pdf(io.BytesIO(_file_bytes))
+    if not resume_text:
+        return None
+
+    # 2. Preprocessing
+    resume_clean = nlp_processing.clean_text(resume_text)
+    jd_clean = nlp_processing.clean_text(_jd_text)
+
+    resume_lemma = nlp_processing.preprocess_text(resume_clean)
+    jd_lemma = nlp_processing.preprocess_text(jd_clean)
+
+    # 3. Skill Extraction
+    resume_skills = nlp_processing.extract_skills(resume_clean)
+    jd_skills = nlp_processing.extract_skills(jd_clean)
+
+    matched_skills = sorted(list(set(resume_skills).intersection(set(jd_skills))))
+    missing_skills = sorted(list(set(jd_skills).difference(set(resume_skills))))
+
+    # 4. Hybrid Matching
+    match_score = matcher.calculate_hybrid_score(resume_lemma, jd_lemma, resume_skills, jd_skills)
+
+    # 5. Suggestions
+    suggestions = nlp_processing.generate_suggestions(missing_skills)
+
+    # 6. Generate Critique
+    critique = nlp_processing.generate_critique(missing_skills, match_score, resume_text)
+
+    return {
+        "score": match_score,
+        "matched": matched_skills,
+        "missing": missing_skills,
+        "suggestions": suggestions,
+        "critique": critique
+    }
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def build_pdf_report(analysis_key, filename, _result):
+    """PDF bytes for an analysis, rendered only when a download is requested"""
+    return report_generator.generate_report(
+        filename, _result['score'], _result['matched'], _result['missing'], _result['suggestions']
+    ).getvalue()
+
+
+@st.cache_resource
+def get_batch_pool():
+    """Worker processes for resume extraction, shared by all sessions"""
+    return ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+
+
+@st.cache_resource
+def get_extraction_cache():
+    """Processed resumes keyed on file hash, so re-ranking skips files already extracted (bounded LRU)"""
+    return batch.ResumeCache(max_entries=256)
+
+
+def render_batch_mode():
+    """Rank many uploaded resumes against one job description"""
+    st.markdown("#### 📂 Batch Screening")
+    uploaded_files = st.file_uploader("Upload Resumes (PDF)", type=["pdf"], accept_multiple_files=True)
+    jd_text = st.text_area("Paste Job Description", height=250, placeholder="Paste the full job description here...",
+                           key="batch_jd")
+
+    if st.button("🔍 Rank Candidates"):
+        if not uploaded_files:
+            st.error("Please upload at least one resume.")
+            return
+        if len(jd_text.strip()) < 50:
+            st.error("Job Description is too short. Please provide more details for accurate matching.")
+            return
+
+        load_nlp_model()
+        progress = st.progress(0.0, text="Extracting resumes...")
+        cache = get_extraction_cache()
+        pool = get_batch_pool()
+        processed, pending = [], {}
+        for uploaded in uploaded_files:
+            file_bytes = uploaded.getvalue()
+            file_hash = hashlib.sha256(file_bytes).hexdigest()
+            # Files seen before come from the cache; the rest are extracted in parallel
+            cached = cache.get(file_hash)
+            if cached is not None:
+                processed.append(dict(cached, filename=uploaded.name))
+            else:
+                pending[pool.submit(batch.process_resume_file, uploaded.name, file_bytes)] = file_hash
+
+        total = len(uploaded_files)
+        for future in as_completed(pending):
+            resume = future.result()
+            cache.put(pending[future], resume)
+            processed.append(resume)
+            progress.progress(len(processed) / total, text=f"Extracted {len(processed)} of {total} resumes")
+
+        with st.spinner("Scoring candidates..."):
+            st.session_state.batch_results = batch.rank_resumes(processed, jd_text)
+        progress.empty()
+
+    results = st.session_state.get('batch_results')
+    if not results:
+        return
+
+    st.markdown("#### 🏆 Ranked Candidates")
+    table = pd.DataFrame([{
+        "Rank": rank,
+        "Candidate": r["filename"],
+        "Match Score": r["score"],
+        "Matched Skills": len(r["matched"]),
+        "Missing Skills": len(r["missing"]),
+    } for rank, r in enumerate(results, start=1)])
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+    st.download_button(
+        label="📥 Download Rankings (CSV)",
+        data=table.assign(**{
+            "Matched Skills": [", ".join(r["matched"]) for r in results],
+            "Missing Skills": [", ".join(r["missing"]) for r in results],
+        }).to_csv(index=False),
+        file_name="Candidate_Rankings.csv",
+        mime="text/csv",
+    )
+
+    # Per-candidate drill-down
+    st.markdown("---")
+    selected = st.selectbox("Candidate details", range(len(results)),
+                            format_func=lambda i: f"{i + 1}. {results[i]['filename']}")
+    result = results[selected]
+    if result["score"] is None:
+        st.error(result["critique"][0])
+        return
+    st.plotly_chart(create_gauge_chart(result['score']), use_container_width=True)
+    col_matched, col_missing = st.columns(2)
+    with col_matched:
+        st.write(f"**Matched Skills ({len(result['matched'])})**")
+        st.markdown("".join([f'<span class="skill-tag matched-skill">{skill}</span>' for skill in result['matched']]),
+                    unsafe_allow_html=True)
+    with col_missing:
+        st.write(f"**Missing Skills ({len(result['missing'])})**")
+        st.markdown("".join([f'<span class="skill-tag missing-skill">{skill}</span>' for skill in result['missing']]),
+                    unsafe_allow_html=True)
+    st.markdown("### 📝 Detailed Resume Critique")
+    for point in result['critique']:
+        st.markdown(f"- {point}")
+
+
+def render_multi_jd_mode():
+    """Compare one resume against many job descriptions"""
+    st.markdown("#### 📂 Multi-JD Comparison")
+    uploaded_file = st.file_uploader("Upload Resume (PDF)", type=["pdf"], key="multi_resume")
+    jd_text = st.text_area("Paste Job Descriptions (separate each with a line containing ---)", height=250,
+                           placeholder="First job description...\n---\nSecond job description...", key="multi_jd")
+    jd_file = st.file_uploader("...or upload a JSONL/CSV file of job descriptions", type=["jsonl", "json", "csv"],
+                               help="Each record needs a 'description' field; 'title' is optional.")
+
+    if st.button("🔍 Compare Jobs"):
+        if uploaded_file is None:
+            st.error("Please upload a resume first.")
+            return
+        try:
+            jobs = batch.parse_job_descriptions(jd_text, jd_file.name if jd_file else None,
+                                                jd_file.getvalue() if jd_file else None)
+        except ValueError as e:
+            st.error(f"Could not read the job descriptions file: {e}")
+            return
+        if not jobs:
+            st.error("Please provide at least one job description.")
+            return
+
+        load_nlp_model()
+        with st.spinner(f"Comparing your resume against {len(jobs)} job descriptions..."):
+            # The resume is extracted and lemmatized once, whatever the number of JDs
+            file_bytes = uploaded_file.getvalue()
+            file_hash = hashlib.sha256(file_bytes).hexdigest()
+            cache = get_extraction_cache()
+            resume = cache.get(file_hash)
+            if resume is None:
+                resume = batch.process_resume_file(uploaded_file.name, file_bytes)
+                cache.put(file_hash, resume)
+            if not resume["text"]:
+                st.error("Could not extract text. PDF might be image-based.")
+                return
+            st.session_state.multi_jd_results = batch.compare_job_descriptions(resume, jobs)
+
+    results = st.session_state.get('multi_jd_results')
+    if not results:
+        return
+
+    st.markdown("#### 📊 Job Comparison")
+    summary = pd.DataFrame([{
+        "Job": r["title"],
+        "Match Score": r["score"],
+        "Matched Skills": len(r["matched"]),
+        "Missing Skills": ", ".join(r["missing"]),
+    } for r in results])
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+    st.download_button(
+        label="📥 Download Comparison (CSV)",
+        data=summary.to_csv(index=False),
+        file_name="Job_Comparison.csv",
+        mime="text/csv",
+    )
+
+    # Skill x job matrix: which required skills the resume covers for each JD
+    skills = sorted({skill for r in results for skill in r["required"]})
+    if skills:
+        st.markdown("#### 🧩 Skills Matrix")
+        columns = [f"{i}. {r['title']}" for i, r in enumerate(results, start=1)]
+        matrix = pd.DataFrame(
+            [["✅" if skill in r["matched"] else "❌" if skill in r["missing"] else "" for r in results]
+             for skill in skills],
+            index=skills, columns=columns
+        )
+        st.dataframe(matrix, use_container_width=True)
 
 
 def create_gauge_chart(score):
@@ -182,6 +412,14 @@ def main():
         """, unsafe_allow_html=True)
 
 
+    mode = st.sidebar.radio("Mode", ["Single Resume", "Batch Screening", "Multi-JD Comparison"])
+    if mode == "Batch Screening":
+        render_batch_mode()
+        return
+    if mode == "Multi-JD Comparison":
+        render_multi_jd_mode()
+        return
+
     col1, col2 = st.columns([1, 1.5], gap="large")
 
     with col1:
@@ -213,51 +451,21 @@ def main():
         elif len(jd_text.strip()) < 50:
             st.error("Job Description is too short. Please provide more details for accurate matching.")
         else:
+            load_nlp_model()
             with st.spinner("Analyzing profile against job requirements..."):
-                time.sleep(1) # Visual effect
-                
-                # 1. Parse PDF
-                resume_text = parser.extract_text_from_pdf(uploaded_file)
-                
-                if not resume_text:
-                    st.error("Could not extract text. PDF might be image-based.")
-                    return
+                file_bytes = uploaded_file.getvalue()
+                file_hash = hashlib.sha256(file_bytes).hexdigest()
+                jd_hash = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()
 
-                # 2. Preprocessing
-                resume_clean = nlp_processing.clean_text(resume_text)
-                jd_clean = nlp_processing.clean_text(jd_text)
-                
-                resume_lemma = nlp_processing.preprocess_text(resume_clean)
-                jd_lemma = nlp_processing.preprocess_text(jd_clean)
-
-                # 3. Skill Extraction
-                resume_skills = nlp_processing.extract_skills(resume_clean)
-                jd_skills = nlp_processing.extract_skills(jd_clean)
-                
-                matched_skills = sorted(list(set(resume_skills).intersection(set(jd_skills))))
-                missing_skills = sorted(list(set(jd_skills).difference(set(resume_skills))))
+                analysis = run_analysis(file_hash, jd_hash, file_bytes, jd_text)
 
-                # 4. Hybrid Matching
-                match_score = matcher.calculate_hybrid_score(resume_lemma, jd_lemma, resume_skills, jd_skills)
-                
-                # 5. Suggestions
-                suggestions = nlp_processing.generate_suggestions(missing_skills)
-                
-                # 6. Generate Critique
-                critique = nlp_processing.generate_critique(missing_skills, match_score, resume_text)
+                if analysis is None:
+                    st.error("Could not extract text. PDF might be image-based.")
+                    return
 
-                
                 # Save to session (for report gen)
-                st.session_state.analysis_result = {
-                    "score": match_score,
-                    "matched": matched_skills,
-                    "missing": missing_skills,
-                    "matched": matched_skills,
-                    "missing": missing_skills,
-                    "suggestions": suggestions,
-                    "critique": critique,
-                    "filename": uploaded_file.name
-                }
+                st.session_state.analysis_result = dict(analysis, filename=uploaded_file.name,
+                                                        key=f"{file_hash}:{jd_hash}")
 
                 st.session_state.analysis_done = True
 
@@ -313,19 +521,21 @@ def main():
                     st.markdown(f"- {point}")
 
 
-            # Download Report
+            # Download Report (rendered only on request, then cached per analysis)
             st.markdown("---")
-            report_bytes = report_generator.generate_report(
-                result['filename'], result['score'], result['matched'], result['missing'], result['suggestions']
-            )
-            
-            st.download_button(
-                label="📄 Download Detailed PDF Report",
-                data=report_bytes,
-                file_name="Resume_Analysis_Report.pdf",
-                mime="application/pdf",
-                help="Download a full report of this analysis."
-            )
+            if st.session_state.get('report_key') != result['key']:
+                if st.button("📄 Prepare PDF Report"):
+                    st.session_state.report_bytes = build_pdf_report(result['key'], result['filename'], result)
+                    st.session_state.report_key = result['key']
+
+            if st.session_state.get('report_key') == result['key']:
+                st.download_button(
+                    label="📄 Download Detailed PDF Report",
+                    data=st.session_state.report_bytes,
+                    file_name="Resume_Analysis_Report.pdf",
+                    mime="application/pdf",
+                    help="Download a full report of this analysis."
+                )
 
     # Future Scope Section
     st.markdown("---")
@@ -1,8 +1,49 @@
-from fastapi import FastAPI, UploadFile, File
+import os
+import sys
+import asyncio
+import tempfile
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+import aiofiles
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
-app = FastAPI()
+# Parsing, NLP and matching come from the project's `utils` modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import utils.batch as batch
+import utils.nlp_processing as nlp_processing
+
+# Matching runs in worker processes so the event loop is never blocked
+MATCH_WORKERS = int(os.environ.get("MATCH_WORKERS", "0")) or os.cpu_count() or 1
+# Requests admitted at once (uploading, queued or matching); beyond this the service answers 429
+MAX_PENDING = int(os.environ.get("MATCH_MAX_PENDING", "0")) or MATCH_WORKERS * 4
+MAX_UPLOAD_BYTES = 16 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# Jobs matched against when no job description is posted (JSONL or CSV, see utils.batch)
+JOBS_FILE = os.environ.get("JOBS_FILE", os.path.join(os.path.dirname(__file__), "jobs.jsonl"))
+
+
+def load_jobs(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, "rb") as f:
+        return batch.parse_job_descriptions(file_name=path, data=f.read())
+
+
+@asynccontextmanager
+async def lifespan(app):
+    # Each worker loads spaCy once at startup instead of on its first request
+    # (or not at all when AI_ENGINE_SOCKET points the workers at the engine sidecar)
+    app.state.pool = ProcessPoolExecutor(max_workers=MATCH_WORKERS, initializer=nlp_processing.warm_up)
+    app.state.pending = 0
+    app.state.jobs = load_jobs(JOBS_FILE)
+    yield
+    app.state.pool.shutdown(cancel_futures=True)
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,29 +54,73 @@ app.add_middleware(
 )
 
 
+async def save_upload(upload):
+    """Stream an upload to a temporary file in chunks and return its path"""
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    os.close(fd)
+    size = 0
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            while chunk := await upload.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="Resume is larger than 16MB")
+                await out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    return {"status": "ok", "pending": app.state.pending, "capacity": MAX_PENDING}
 
 
 @app.post("/match")
-async def match_resume(file: UploadFile = File(...)):
-    """Simple placeholder endpoint that returns a short text snippet and a dummy match.
+async def match_resume(file: UploadFile = File(...), job_description: str = Form(None),
+                       job_title: str = Form(None)):
+    """Match an uploaded PDF resume against a posted job description, or the job catalog.
 
-    Replace this with actual parsing, NLP processing and matching logic from the existing
-    project's `utils` modules when ready.
+    Parsing and scoring run in the process pool. Scores are 0-100, as in the
+    Streamlit app; matches are returned best first.
     """
-    content = await file.read()
-    text = None
+    # Backpressure: refuse new work instead of queueing without bound
+    if app.state.pending >= MAX_PENDING:
+        raise HTTPException(status_code=429, detail="Matching queue is full, retry shortly",
+                            headers={"Retry-After": "1"})
+
+    if job_description and job_description.strip():
+        jobs = [{"title": job_title or "Job Description", "description": job_description.strip()}]
+    else:
+        jobs = app.state.jobs
+    if not jobs:
+        raise HTTPException(status_code=400, detail="No job description provided")
+
+    app.state.pending += 1
     try:
-        text = content.decode(errors="ignore")
-    except Exception:
-        text = str(content)
+        path = await save_upload(file)
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(app.state.pool, batch.match_resume_path, path, jobs, file.filename)
+        finally:
+            os.remove(path)
+    finally:
+        app.state.pending -= 1
+
+    if result is None:
+        raise HTTPException(status_code=422, detail="Could not extract text. PDF might be image-based.")
 
     return {
-        "filename": file.filename,
-        "snippet": (text or "")[:1000],
-        "matches": [{"job_title": "Software Engineer", "score": 0.78}],
+        "filename": result["filename"],
+        "snippet": result["snippet"],
+        "skills": result["skills"],
+        "matches": [{
+            "job_title": match["title"],
+            "score": match["score"],
+            "matched_skills": match["matched"],
+            "missing_skills": match["missing"],
+        } for match in result["matches"]],
     }
 
 
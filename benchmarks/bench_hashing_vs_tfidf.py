@@ -0,0 +1,93 @@
+"""
+Benchmark: hashed TF-IDF features vs the fitted TF-IDF path in ResumeMatcher.
+
+Compares
+  1. memory: fitting a corpus-wide TfidfVectorizer vs streaming the same corpus
+     through HashingFeatureExtractor + IncrementalIDF (tracemalloc peak)
+  2. score quality: per-pair calculate_tfidf_score vs calculate_hashing_score,
+     both with pair-local IDF and with the streamed corpus IDF
+
+Usage:
+    python benchmarks/bench_hashing_vs_tfidf.py [n_documents]
+"""
+
+import os
+import sys
+import time
+import random
+import tracemalloc
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_app.ai_engine.core import ResumeMatcher, NLPProcessor
+from flask_app.ai_engine.features import HashingFeatureExtractor, IncrementalIDF
+
+
+def synthetic_corpus(n_documents, seed=7):
+    """Resume-like documents whose vocabulary keeps growing with the corpus"""
+    rng = random.Random(seed)
+    skills = sorted(NLPProcessor.SKILLS_DB)
+    common = ["experience", "developed", "team", "project", "built", "managed", "data",
+              "system", "design", "service", "years", "led", "improved", "production"]
+    documents = []
+    for i in range(n_documents):
+        words = rng.sample(skills, 8) + [rng.choice(common) for _ in range(120)]
+        # Domain-specific tokens make the fitted vocabulary grow without bound
+        words += [f"term{rng.randint(0, n_documents * 5)}" for _ in range(40)]
+        rng.shuffle(words)
+        documents.append(" ".join(words))
+    return documents
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def main(n_documents=5000, n_pairs=500):
+    corpus = synthetic_corpus(n_documents)
+    print(f"Corpus: {n_documents} documents")
+
+    fitted, t_fit, m_fit = measure(lambda: TfidfVectorizer(dtype=np.float32).fit(corpus))
+    print(f"Fitted TF-IDF   : {t_fit:6.2f}s  peak {m_fit:8.1f} MiB  vocabulary {len(fitted.vocabulary_)} terms")
+
+    extractor = HashingFeatureExtractor()
+
+    def stream():
+        idf = IncrementalIDF(extractor.n_features)
+        for counts in extractor.iter_transform(iter(corpus), batch_size=256):
+            idf.partial_fit(counts)
+        return idf
+
+    idf, t_hash, m_hash = measure(stream)
+    print(f"Hashed + IDF    : {t_hash:6.2f}s  peak {m_hash:8.1f} MiB  fixed {extractor.n_features} dims")
+
+    rng = random.Random(11)
+    pairs = [(rng.choice(corpus), rng.choice(corpus)) for _ in range(n_pairs)]
+
+    start = time.perf_counter()
+    reference = np.array([ResumeMatcher.calculate_tfidf_score(r, j) for r, j in pairs])
+    t_ref = time.perf_counter() - start
+
+    start = time.perf_counter()
+    local = np.array([ResumeMatcher.calculate_hashing_score(r, j) for r, j in pairs])
+    t_local = time.perf_counter() - start
+
+    corpus_idf = np.array([ResumeMatcher.calculate_hashing_score(r, j, idf=idf) for r, j in pairs])
+
+    print(f"\nScore quality over {n_pairs} pairs (reference: calculate_tfidf_score)")
+    print(f"  pair-local IDF : max |diff| {np.abs(local - reference).max():.5f}  "
+          f"corr {np.corrcoef(local, reference)[0, 1]:.4f}  ({t_ref / t_local:.2f}x speed)")
+    print(f"  corpus IDF     : mean |diff| {np.abs(corpus_idf - reference).mean():.5f}  "
+          f"corr {np.corrcoef(corpus_idf, reference)[0, 1]:.4f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
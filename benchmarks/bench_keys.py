@@ -0,0 +1,112 @@
+"""
+Benchmark: primary and foreign key formats.
+
+Builds the same users -> resumes -> analyses tables three times, keyed by
+  1. random uuid4 strings (the old default)
+  2. time-ordered ids from flask_app.keys.new_id, stored as text
+  3. the same ids stored as 16 bytes (DB_KEY_FORMAT=binary)
+and reports insert throughput, the throughput of the analyses/resumes join
+behind the dashboard, and database size.
+
+Usage:
+    python benchmarks/bench_keys.py [n_analyses]
+"""
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+import time
+import uuid
+
+import sqlalchemy as sa
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_app.keys import UUIDKey, new_id
+
+N_USERS = 200
+
+
+def make_tables(binary):
+    metadata = sa.MetaData()
+    users = sa.Table('users', metadata,
+                     sa.Column('id', UUIDKey(binary), primary_key=True),
+                     sa.Column('username', sa.String(80)))
+    resumes = sa.Table('resumes', metadata,
+                       sa.Column('id', UUIDKey(binary), primary_key=True),
+                       sa.Column('user_id', UUIDKey(binary), sa.ForeignKey('users.id'), index=True),
+                       sa.Column('filename', sa.String(255)))
+    analyses = sa.Table('analyses', metadata,
+                        sa.Column('id', UUIDKey(binary), primary_key=True),
+                        sa.Column('user_id', UUIDKey(binary), sa.ForeignKey('users.id'), index=True),
+                        sa.Column('resume_id', UUIDKey(binary), sa.ForeignKey('resumes.id'), index=True),
+                        sa.Column('match_score', sa.Float))
+    return metadata, users, resumes, analyses
+
+
+def run(label, engine, binary, make_id, n_analyses, batch_size=500):
+    metadata, users, resumes, analyses = make_tables(binary)
+    metadata.create_all(engine)
+    rng = random.Random(0)
+    user_ids = [make_id() for _ in range(N_USERS)]
+    resume_ids = []
+
+    # Rows arrive in small transactions, as they do from the web app
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(users.insert(), [{'id': id_, 'username': f'user{i}'} for i, id_ in enumerate(user_ids)])
+    for offset in range(0, n_analyses, batch_size):
+        with engine.begin() as conn:
+            resume_rows, analysis_rows = [], []
+            for _ in range(min(batch_size, n_analyses - offset)):
+                user_id = rng.choice(user_ids)
+                if not resume_ids or rng.random() < 0.3:
+                    resume_ids.append((make_id(), user_id))
+                    resume_rows.append({'id': resume_ids[-1][0], 'user_id': user_id, 'filename': 'cv.pdf'})
+                resume_id, owner = rng.choice(resume_ids)
+                analysis_rows.append({'id': make_id(), 'user_id': owner, 'resume_id': resume_id,
+                                      'match_score': rng.random()})
+            if resume_rows:
+                conn.execute(resumes.insert(), resume_rows)
+            conn.execute(analyses.insert(), analysis_rows)
+    insert_time = time.perf_counter() - start
+
+    statement = sa.select(analyses.c.id, analyses.c.match_score, resumes.c.filename) \
+        .join(resumes, analyses.c.resume_id == resumes.c.id) \
+        .where(analyses.c.user_id == sa.bindparam('user_id'))
+    start = time.perf_counter()
+    joined = 0
+    with engine.connect() as conn:
+        for user_id in user_ids:
+            joined += len(conn.execute(statement, {'user_id': user_id}).all())
+    join_time = time.perf_counter() - start
+
+    with engine.connect() as conn:
+        size = conn.exec_driver_sql('PRAGMA page_count').scalar() * \
+            conn.exec_driver_sql('PRAGMA page_size').scalar()
+    print(f"{label:<22}: insert {n_analyses / insert_time:9.0f} rows/s, "
+          f"join {joined / join_time:9.0f} rows/s, database {size / 1024 / 1024:6.1f} MiB")
+    return insert_time, join_time, size
+
+
+def main(n_analyses=100000):
+    workdir = tempfile.mkdtemp()
+    try:
+        results = {}
+        for label, binary, make_id in (('uuid4 text', False, lambda: str(uuid.uuid4())),
+                                       ('time-ordered text', False, new_id),
+                                       ('time-ordered binary', True, new_id)):
+            engine = sa.create_engine(f"sqlite:///{os.path.join(workdir, label.replace(' ', '_'))}.db")
+            results[label] = run(label, engine, binary, make_id, n_analyses)
+            engine.dispose()
+        before, after = results['uuid4 text'], results['time-ordered binary']
+        print(f"  binary vs uuid4: insert {before[0] / after[0]:.2f}x, join {before[1] / after[1]:.2f}x, "
+              f"size {before[2] / after[2]:.2f}x smaller")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,67 @@
+"""
+Benchmark: PDF report rendering throughput with per-call vs shared styles.
+
+Compares
+  1. flask_app ReportEngine: a fresh engine per report (stylesheet, styles and
+     headings rebuilt every call, as before) vs the shared engine's render_batch
+  2. utils.report_generator (Streamlit): styles rebuilt per call vs cached
+
+Usage:
+    python benchmarks/bench_report_rendering.py [n_reports]
+"""
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_app.ai_engine.report_engine import ReportEngine
+import utils.report_generator as report_generator
+
+
+def sample_reports(n_reports):
+    return [{
+        'resume_name': f'candidate_{i}.pdf',
+        'match_score': 40 + i % 60,
+        'matched_skills': ['python', 'flask', 'sql', 'docker'][:1 + i % 4],
+        'missing_skills': ['aws', 'kubernetes', 'react'][:i % 3],
+        'suggestions': ['Add a project using AWS.', 'Quantify your impact with metrics.'],
+        'ats_score': 75.0,
+        'ats_findings': ['Contact information found.', 'Consider adding a summary section.'],
+    } for i in range(n_reports)]
+
+
+def throughput(label, fn, n_reports):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<38}: {n_reports / elapsed:8.1f} reports/sec  ({elapsed * 1000 / n_reports:6.2f} ms each)")
+    return n_reports / elapsed
+
+
+def main(n_reports=300):
+    reports = sample_reports(n_reports)
+    streamlit_reports = [{key: report[key] for key in ('resume_name', 'match_score', 'matched_skills',
+                                                       'missing_skills', 'suggestions')} for report in reports]
+    # Warm up fonts and module imports
+    ReportEngine().render(**reports[0])
+
+    before = throughput("ReportEngine, styles per call", lambda: [ReportEngine().render(**r) for r in reports], n_reports)
+    shared = ReportEngine()
+    after = throughput("ReportEngine, shared render_batch", lambda: list(shared.render_batch(reports)), n_reports)
+    print(f"  speedup: {after / before:.2f}x")
+
+    def streamlit_per_call():
+        for report in streamlit_reports:
+            report_generator._STYLES = None
+            report_generator.generate_report(**report)
+
+    before = throughput("utils.report_generator, per call", streamlit_per_call, n_reports)
+    after = throughput("utils.report_generator, cached styles",
+                       lambda: list(report_generator.generate_reports(streamlit_reports)), n_reports)
+    print(f"  speedup: {after / before:.2f}x")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
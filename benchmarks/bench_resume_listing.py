@@ -0,0 +1,143 @@
+"""
+Benchmark: resume list-page query with inline vs side-table resume text.
+
+Loads one tenant's resumes newest first, as analysis.resume_list does, from
+  1. the old layout: extracted_text, embedding and minhash inline in resumes
+  2. the current models: text compressed in resume_texts, blobs deferred
+and reports query time and peak Python memory of the loaded rows.
+
+Usage:
+    python benchmarks/bench_resume_listing.py [n_resumes]
+"""
+
+import os
+import sys
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session, declarative_base
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_app.models import Resume, ResumeText
+from flask_app.migrations import upgrade
+
+LegacyBase = declarative_base()
+
+USER_ID = 'bench-user'
+WORDS = ('python flask django sql postgresql docker kubernetes aws react javascript team led built '
+         'scalable services api design testing deployment pipeline data analysis machine learning '
+         'experience project university degree managed improved reduced latency customers').split()
+
+
+class LegacyResume(LegacyBase):
+    """The resumes row before resume text moved to resume_texts"""
+    __tablename__ = 'resumes'
+
+    id = sa.Column(sa.String(36), primary_key=True)
+    user_id = sa.Column(sa.String(36), nullable=False, index=True)
+    filename = sa.Column(sa.String(255), nullable=False)
+    filepath = sa.Column(sa.String(500), nullable=False)
+    extracted_text = sa.Column(sa.Text)
+    extracted_skills = sa.Column(sa.JSON)
+    embedding = sa.Column(sa.LargeBinary)
+    content_hash = sa.Column(sa.String(64))
+    minhash = sa.Column(sa.LargeBinary)
+    duplicate_of_id = sa.Column(sa.String(36))
+    duplicate_similarity = sa.Column(sa.Float)
+    created_at = sa.Column(sa.DateTime)
+    updated_at = sa.Column(sa.DateTime)
+
+
+def sample_rows(n_resumes):
+    rng = random.Random(0)
+    start = datetime(2024, 1, 1)
+    for i in range(n_resumes):
+        yield {
+            'id': f'{i:036d}',
+            'user_id': USER_ID,
+            'filename': f'resume_{i}.pdf',
+            'filepath': f'/uploads/resume_{i}.pdf',
+            'text': ' '.join(rng.choice(WORDS) for _ in range(900)),
+            'extracted_skills': rng.sample(WORDS[:10], 5),
+            'embedding': os.urandom(256 * 4),
+            'content_hash': f'{i:064x}',
+            'minhash': os.urandom(128 * 4),
+            'created_at': start + timedelta(minutes=i),
+            'updated_at': start + timedelta(minutes=i),
+        }
+
+
+def populate(engine, model, rows, split_text):
+    with engine.begin() as conn:
+        batch, texts = [], []
+        for row in rows:
+            row = dict(row)
+            text = row.pop('text')
+            if split_text:
+                texts.append({'resume_id': row['id'], 'body': ResumeText.encode(text)})
+            else:
+                row['extracted_text'] = text
+            batch.append(row)
+            if len(batch) == 1000:
+                conn.execute(model.__table__.insert(), batch)
+                if texts:
+                    conn.execute(ResumeText.__table__.insert(), texts)
+                batch, texts = [], []
+        if batch:
+            conn.execute(model.__table__.insert(), batch)
+        if texts:
+            conn.execute(ResumeText.__table__.insert(), texts)
+
+
+def measure(label, engine, model, repeats=5):
+    statement = sa.select(model).where(model.user_id == USER_ID).order_by(model.created_at.desc())
+    timings = []
+    for _ in range(repeats):
+        with Session(engine) as session:
+            start = time.perf_counter()
+            rows = session.scalars(statement).all()
+            timings.append(time.perf_counter() - start)
+    with Session(engine) as session:
+        tracemalloc.start()
+        rows = session.scalars(statement).all()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    best = min(timings)
+    print(f"{label:<34}: {len(rows)} rows in {best * 1000:7.1f} ms, peak {peak / 1024 / 1024:6.1f} MiB")
+    return best, peak
+
+
+def main(n_resumes=10000):
+    workdir = tempfile.mkdtemp()
+    try:
+        legacy = sa.create_engine(f"sqlite:///{os.path.join(workdir, 'legacy.db')}")
+        LegacyBase.metadata.create_all(legacy)
+        populate(legacy, LegacyResume, sample_rows(n_resumes), split_text=False)
+
+        current = sa.create_engine(f"sqlite:///{os.path.join(workdir, 'current.db')}")
+        upgrade(current)
+        populate(current, Resume, sample_rows(n_resumes), split_text=True)
+
+        for label, engine in (('inline text', legacy), ('resume_texts side table', current)):
+            with engine.connect() as conn:
+                size = conn.exec_driver_sql('PRAGMA page_count').scalar() * \
+                    conn.exec_driver_sql('PRAGMA page_size').scalar()
+            print(f"{label:<34}: database {size / 1024 / 1024:6.1f} MiB")
+
+        before_time, before_peak = measure('list page, inline text', legacy, LegacyResume)
+        after_time, after_peak = measure('list page, side table + deferred', current, Resume)
+        print(f"  speedup: {before_time / after_time:.2f}x, memory: {before_peak / after_peak:.2f}x less")
+        legacy.dispose()
+        current.dispose()
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
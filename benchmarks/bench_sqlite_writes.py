@@ -0,0 +1,123 @@
+"""
+Benchmark: concurrent workers on one SQLite file, default vs tuned engines.
+
+Each worker process plays a gunicorn worker serving page views: every request
+reads a user's recent analyses, and every fourth one also records a new
+analysis. Workers run
+  1. on engines as Flask-SQLAlchemy builds them by default (rollback journal)
+  2. on the engines of flask_app/database.py: WAL plus Config.SQLITE_PRAGMAS,
+     writes on a BEGIN IMMEDIATE connection, reads on a query_only pool
+and the benchmark reports requests per second and "database is locked" errors.
+
+Usage:
+    python benchmarks/bench_sqlite_writes.py [n_workers] [requests_per_worker]
+"""
+
+import os
+import sys
+import json
+import random
+import shutil
+import tempfile
+import time
+import multiprocessing
+
+import sqlalchemy as sa
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_app.config import Config
+from flask_app.database import tune_sqlite
+
+N_USERS = 100
+WRITE_EVERY = 4
+
+metadata = sa.MetaData()
+analyses = sa.Table('analyses', metadata,
+                    sa.Column('id', sa.Integer, primary_key=True),
+                    sa.Column('user_id', sa.Integer, nullable=False),
+                    sa.Column('match_score', sa.Float),
+                    sa.Column('matched_skills', sa.Text),
+                    sa.Column('created_at', sa.Float),
+                    sa.Index('ix_analyses_user_id_created_at', 'user_id', 'created_at'))
+
+
+def make_engines(db_path, tuned):
+    """(write engine, read engine) for one worker process"""
+    url = f'sqlite:///{db_path}'
+    if not tuned:
+        engine = sa.create_engine(url)
+        return engine, engine
+    timeout = Config.SQLITE_PRAGMAS['busy_timeout'] / 1000
+    writer = sa.create_engine(url, pool_size=1, max_overflow=0, pool_timeout=timeout)
+    tune_sqlite(writer, Config.SQLITE_PRAGMAS, immediate=True)
+    reader = sa.create_engine(url, pool_size=1, max_overflow=0, pool_timeout=timeout)
+    tune_sqlite(reader, {**Config.SQLITE_PRAGMAS, 'query_only': 1})
+    return writer, reader
+
+
+def worker(db_path, tuned, n_requests, seed, results):
+    writer, reader = make_engines(db_path, tuned)
+    rng = random.Random(seed)
+    skills = json.dumps(['python', 'flask', 'sql', 'docker', 'aws'] * 40)
+    recent = sa.select(analyses.c.id, analyses.c.match_score).where(analyses.c.user_id == sa.bindparam('user_id')) \
+        .order_by(analyses.c.created_at.desc()).limit(5)
+    done = errors = 0
+    for i in range(n_requests):
+        user_id = rng.randrange(N_USERS)
+        try:
+            if i % WRITE_EVERY:
+                with reader.connect() as conn:
+                    conn.execute(recent, {'user_id': user_id}).all()
+            else:
+                # A request that records an analysis reads and writes in one session transaction
+                with writer.begin() as conn:
+                    conn.execute(recent, {'user_id': user_id}).all()
+                    conn.execute(analyses.insert(), {'user_id': user_id, 'match_score': rng.random(),
+                                                     'matched_skills': skills, 'created_at': time.time()})
+            done += 1
+        except sa.exc.OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            errors += 1
+    results.put((done, errors))
+    writer.dispose()
+    reader.dispose()
+
+
+def run(label, workdir, tuned, n_workers, n_requests):
+    db_path = os.path.join(workdir, f"{label.replace(' ', '_')}.db")
+    engine = sa.create_engine(f'sqlite:///{db_path}')
+    metadata.create_all(engine)
+    engine.dispose()
+
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=worker, args=(db_path, tuned, n_requests, seed, results))
+                 for seed in range(n_workers)]
+    start = time.perf_counter()
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+    done = sum(outcome[0] for outcome in outcomes)
+    errors = sum(outcome[1] for outcome in outcomes)
+    print(f"{label:<16}: {done / elapsed:8.0f} requests/s, {errors} 'database is locked' errors "
+          f"of {n_workers * n_requests} requests")
+    return done / elapsed
+
+
+def main(n_workers=8, n_requests=2000):
+    workdir = tempfile.mkdtemp()
+    try:
+        before = run('default engine', workdir, False, n_workers, n_requests)
+        after = run('tuned engines', workdir, True, n_workers, n_requests)
+        print(f"  throughput: {after / before:.2f}x")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 8,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 2000)
@@ -0,0 +1,44 @@
+"""
+Builds the corpus IDF for the 'hashing' matcher feature mode.
+
+Streams every stored resume and job description through the stateless
+HashingFeatureExtractor in fixed-size batches, so memory stays flat however
+large the corpus is. Re-running updates the accumulator from scratch.
+
+Usage:
+    python build_hashing_idf.py
+"""
+
+import os
+from flask_app import create_app, db
+from flask_app.models import ResumeText, JobPosting
+from flask_app.ai_engine.features import HashingFeatureExtractor, IncrementalIDF
+
+app = create_app(os.environ.get('FLASK_ENV', 'development'))
+
+
+def iter_corpus(batch_size):
+    """Yield resume and job texts without loading whole rows into memory"""
+    for (body,) in db.session.query(ResumeText.body).execution_options(yield_per=batch_size):
+        yield ResumeText.decode(body)
+    for (text,) in db.session.query(JobPosting.description).execution_options(yield_per=batch_size):
+        if text:
+            yield text
+
+
+def build_idf(batch_size=256):
+    with app.app_context():
+        extractor = HashingFeatureExtractor()
+        accumulator = IncrementalIDF(extractor.n_features)
+
+        for counts in extractor.iter_transform(iter_corpus(batch_size), batch_size=batch_size):
+            accumulator.partial_fit(counts)
+
+        path = app.config['HASHING_IDF_PATH']
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        accumulator.save(path)
+        print(f"Indexed {accumulator.n_documents} documents into {path}")
+
+
+if __name__ == '__main__':
+    build_idf()
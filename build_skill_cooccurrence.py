@@ -0,0 +1,45 @@
+"""
+Builds the skill co-occurrence (NPMI) matrix used for partial skill credit.
+
+Collects the skill set of every stored resume and job posting, computes the
+sparse normalized PMI between skills and writes it as raw CSR arrays to
+SKILL_COOCCURRENCE_PATH, where matcher workers memory-map it. Enable with
+SKILL_PARTIAL_CREDIT=true.
+
+Usage:
+    python build_skill_cooccurrence.py [min_count]
+"""
+
+import os
+import sys
+from flask_app import create_app, db
+from flask_app.models import Resume, JobPosting
+from flask_app.ai_engine import NLPProcessor
+from flask_app.ai_engine.cooccurrence import SkillCooccurrence
+
+app = create_app(os.environ.get('FLASK_ENV', 'development'))
+
+
+def iter_skill_lists(batch_size=256):
+    """Yield one skill list per resume and job posting"""
+    for (skills,) in db.session.query(Resume.extracted_skills).execution_options(yield_per=batch_size):
+        if skills:
+            yield skills
+    jobs = db.session.query(JobPosting.required_skills, JobPosting.description).execution_options(yield_per=batch_size)
+    for required, description in jobs:
+        # Manually entered requirements are often partial; add skills found in the description
+        skills = {skill.lower() for skill in required or []} | set(NLPProcessor.extract_skills(description or ""))
+        if skills:
+            yield sorted(skills)
+
+
+def build(min_count=2):
+    with app.app_context():
+        matrix = SkillCooccurrence.build(iter_skill_lists(), min_count=min_count)
+        path = app.config['SKILL_COOCCURRENCE_PATH']
+        matrix.save(path)
+        print(f"Built co-occurrence of {len(matrix.vocabulary)} skills with {len(matrix.data)} related pairs -> {path}")
+
+
+if __name__ == '__main__':
+    build(int(sys.argv[1]) if len(sys.argv) > 1 else 2)
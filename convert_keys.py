@@ -0,0 +1,80 @@
+"""
+Converts stored UUID keys from 36-character text to 16 bytes, for running the
+Flask app with DB_KEY_FORMAT=binary (see flask_app/keys.py). SQLite only.
+
+Each table is walked in rowid order and every key column of a batch of rows
+is rewritten in one short transaction, so writers are never held up for long
+and no table is rebuilt. Keys already stored as bytes are left alone, so the
+conversion can be stopped and re-run at any time.
+
+Switch the app to DB_KEY_FORMAT=binary first: it reads both formats, and a
+row not yet converted is only unreachable by id until its batch commits.
+
+Usage:
+    python convert_keys.py [batch_size]
+"""
+
+import os
+import sys
+from sqlalchemy import text
+from flask_app import create_app, db
+from flask_app.keys import UUIDKey, key_bytes
+
+app = create_app(os.environ.get('FLASK_ENV', 'development'))
+
+
+def key_columns():
+    """{table name: [UUID key column names]} for every table that has any"""
+    tables = {}
+    for table in db.metadata.sorted_tables:
+        columns = [column.name for column in table.columns if isinstance(column.type, UUIDKey)]
+        if columns:
+            tables[table.name] = columns
+    return tables
+
+
+def convert_table(conn, table, columns, batch_size):
+    """Convert one table's text keys. Returns (rows converted, values left as text)"""
+    select = text(f"SELECT rowid, {', '.join(columns)} FROM {table} "
+                  f"WHERE rowid > :last_rowid ORDER BY rowid LIMIT :limit")
+    update = text(f"UPDATE {table} SET {', '.join(f'{column} = :{column}' for column in columns)} "
+                  f"WHERE rowid = :rowid")
+    converted = skipped = 0
+    last_rowid = 0
+    while True:
+        with conn.begin():
+            rows = conn.execute(select, {'last_rowid': last_rowid, 'limit': batch_size}).fetchall()
+            if not rows:
+                return converted, skipped
+            updates = []
+            for rowid, *values in rows:
+                row = {'rowid': rowid}
+                for column, value in zip(columns, values):
+                    row[column] = value
+                    if isinstance(value, str):
+                        row[column] = key_bytes(value)
+                        if row[column] is None:
+                            # Not a UUID: keep it as it is
+                            row[column] = value
+                            skipped += 1
+                if row != dict(zip(['rowid', *columns], [rowid, *values])):
+                    updates.append(row)
+            if updates:
+                conn.execute(update, updates)
+            converted += len(updates)
+        last_rowid = rows[-1][0]
+
+
+def convert(batch_size=500):
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            sys.exit("convert_keys.py converts SQLite databases only.")
+        with db.engine.connect() as conn:
+            for table, columns in key_columns().items():
+                converted, skipped = convert_table(conn, table, columns, batch_size)
+                print(f"{table}: converted {converted} rows"
+                      + (f", left {skipped} values that are not UUIDs" if skipped else ""))
+
+
+if __name__ == '__main__':
+    convert(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,50 @@
+"""
+Backfills MinHash signatures for stored resumes and flags near-duplicates.
+
+Resumes are processed per user in upload order, so each resume can only be
+flagged as a duplicate of an earlier one. Each batch is committed on its own,
+so an interrupted run picks up where it stopped. Run after migrate_db.py.
+
+Usage:
+    python dedup_resumes.py
+"""
+
+import os
+from flask_app import create_app, db
+from sqlalchemy.orm import selectinload
+from flask_app.models import Resume
+from flask_app.duplicates import file_sha256, resume_signature, find_near_duplicate, index_resume
+
+app = create_app(os.environ.get('FLASK_ENV', 'development'))
+
+
+def backfill(batch_size=200):
+    """Index every resume without a signature, committing batch_size resumes at a time"""
+    with app.app_context():
+        ids = [row.id for row in db.session.query(Resume.id)
+               .filter(Resume.minhash.is_(None), Resume.text_record.has())
+               .order_by(Resume.user_id, Resume.created_at, Resume.id)]
+        flagged = 0
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            loaded = {resume.id: resume for resume in Resume.query.filter(Resume.id.in_(batch))
+                      .options(selectinload(Resume.text_record))}
+            for resume in (loaded[resume_id] for resume_id in batch):
+                if not resume.content_hash and os.path.exists(resume.filepath):
+                    resume.content_hash = file_sha256(resume.filepath)
+                signature = resume_signature(resume.extracted_text)
+                duplicate_of, similarity = find_near_duplicate(resume.user_id, signature, exclude_id=resume.id)
+                if duplicate_of and duplicate_of.created_at <= resume.created_at:
+                    resume.duplicate_of_id = duplicate_of.id
+                    resume.duplicate_similarity = similarity
+                    flagged += 1
+                index_resume(resume, signature)
+                # Flush so later resumes of the same user can match this one
+                db.session.flush()
+            # Committed band rows match resumes in later batches, and a rerun resumes from here
+            db.session.commit()
+            db.session.expunge_all()
+        print(f"Indexed {len(ids)} resumes, flagged {flagged} near-duplicates.")
+
+if __name__ == '__main__':
+    backfill()
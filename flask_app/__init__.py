@@ -5,10 +5,11 @@ from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
+from flask_app.database import RoutingSession, init_database
 import os
 from datetime import timedelta
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 login_manager = LoginManager()
 csrf = CSRFProtect()
 
@@ -26,7 +27,7 @@ def create_app(config_name='development'):
         app.config.from_object('flask_app.config.DevelopmentConfig')
     
     # Initialize extensions
-    db.init_app(app)
+    init_database(app, db)
     login_manager.init_app(app)
     csrf.init_app(app)
     
@@ -50,6 +51,7 @@ def create_app(config_name='development'):
     from flask_app.routes.admin import admin_bp
     from flask_app.routes.hr import hr_bp
     from flask_app.routes.resume import resume_bp
+    from flask_app.routes.api import api_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(main_bp)
@@ -59,8 +61,14 @@ def create_app(config_name='development'):
     app.register_blueprint(hr_bp)
     app.register_blueprint(resume_bp)
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+    # JSON API clients authenticate with the session cookie and send no CSRF token
+    csrf.exempt(api_bp)
+    app.register_blueprint(api_bp)
+    
+    # Bring the schema up to date (see flask_app/migrations.py)
+    if app.config.get('AUTO_MIGRATE', True):
+        from flask_app.migrations import upgrade
+        with app.app_context():
+            upgrade()
     
     return app
@@ -0,0 +1,96 @@
+"""
+Admin dashboard queries
+
+Site totals come from one query over user_stats and are cached in a JSON file
+for ADMIN_STATS_TTL seconds, so every worker process on the host shares one
+result. The user listing is keyset-paginated on (created_at, id), as the API
+lists are, and takes each user's counts from the same user_stats join.
+"""
+
+import os
+import json
+import time
+import tempfile
+from flask import current_app
+from sqlalchemy import func, select, or_, and_
+from flask_app import db
+from flask_app.models import User, UserStats, JobPosting
+from flask_app.utils import encode_cursor, decode_cursor
+
+
+def cached_json(path, ttl, compute):
+    """
+    compute() memoized in a JSON file for ttl seconds; ttl <= 0 disables the cache.
+
+    Workers that miss at the same time each compute and the last write wins,
+    which is harmless for a cheap query.
+    """
+    if ttl > 0:
+        try:
+            if time.time() - os.path.getmtime(path) < ttl:
+                with open(path) as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+    value = compute()
+    if ttl > 0:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(value, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError:
+            current_app.logger.warning('Could not write admin stats cache %s', path)
+    return value
+
+
+def site_stats():
+    """Site totals: users, resumes, analyses and job postings"""
+    users, resumes, analyses, jobs = db.session.query(
+        func.count(UserStats.user_id),
+        func.coalesce(func.sum(UserStats.resume_count), 0),
+        func.coalesce(func.sum(UserStats.analysis_count), 0),
+        select(func.count()).select_from(JobPosting).scalar_subquery()
+    ).one()
+    return {'total_users': users, 'total_resumes': int(resumes), 'total_analyses': int(analyses),
+            'total_jobs': jobs}
+
+
+def cached_site_stats():
+    """site_stats(), at most ADMIN_STATS_TTL seconds old"""
+    config = current_app.config
+    return cached_json(config['ADMIN_STATS_CACHE_PATH'], config['ADMIN_STATS_TTL'], site_stats)
+
+
+def users_page(after=None, per_page=50):
+    """
+    One page of users, newest first, with their resume and analysis counts.
+
+    Args:
+        after: Cursor of the previous page (the second value this returned)
+        per_page: Users per page
+
+    Returns:
+        tuple: ([(User, resume_count, analysis_count)], cursor to pass as after
+        for the next page or None on the last page)
+
+    Raises:
+        ValueError or TypeError: after is not a valid cursor
+    """
+    query = db.session.query(User, func.coalesce(UserStats.resume_count, 0),
+                             func.coalesce(UserStats.analysis_count, 0)) \
+        .outerjoin(UserStats, UserStats.user_id == User.id)
+    if after:
+        created_at, user_id = decode_cursor(after)
+        query = query.filter(or_(User.created_at < created_at,
+                                 and_(User.created_at == created_at, User.id < user_id)))
+    rows = query.order_by(User.created_at.desc(), User.id.desc()).limit(per_page + 1).all()
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        return rows, encode_cursor(rows[-1][0])
+    return rows, None
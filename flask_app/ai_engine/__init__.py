@@ -8,5 +8,12 @@ from flask_app.ai_engine.core import (
     ResumeMatcher,
     ReportGenerator
 )
+from flask_app.ai_engine.features import HashingFeatureExtractor, IncrementalIDF
+from flask_app.ai_engine.semantic import LSAEmbedder, RandomProjectionLSH
+from flask_app.ai_engine.minhash import MinHasher, LSHIndex
+from flask_app.ai_engine.cooccurrence import SkillCooccurrence
+from flask_app.ai_engine.sidecar import EngineClient, EngineServer
 
-__all__ = ['ResumeParser', 'NLPProcessor', 'ResumeMatcher', 'ReportGenerator']
+__all__ = ['ResumeParser', 'NLPProcessor', 'ResumeMatcher', 'ReportGenerator',
+           'HashingFeatureExtractor', 'IncrementalIDF', 'LSAEmbedder', 'RandomProjectionLSH',
+           'MinHasher', 'LSHIndex', 'SkillCooccurrence', 'EngineClient', 'EngineServer']
@@ -0,0 +1,174 @@
+"""
+Skill Co-occurrence - Corpus-derived skill relatedness for partial-credit matching
+Built offline as a sparse NPMI matrix and memory-mapped by workers without copying
+"""
+
+import os
+import json
+import numpy as np
+from scipy import sparse
+
+
+class SkillCooccurrence:
+    """
+    Sparse normalized PMI between skills that appear together in resumes and jobs.
+    Stored as raw CSR arrays (.npy) so every worker maps the same pages read-only.
+    """
+
+    ARRAYS = ('data', 'indices', 'indptr')
+    VOCABULARY_FILE = 'vocabulary.json'
+
+    # Share of a missing skill credited at NPMI 1.0; related never counts as much as exact
+    PARTIAL_CREDIT_WEIGHT = 0.5
+
+    def __init__(self, vocabulary, data, indices, indptr):
+        self.vocabulary = list(vocabulary)
+        self.index = {skill: i for i, skill in enumerate(self.vocabulary)}
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+
+    @classmethod
+    def build(cls, skill_lists, min_count=2, min_npmi=0.1):
+        """
+        Builds the matrix from per-document skill lists.
+
+        Args:
+            skill_lists: Iterable of skill lists, one per resume or job
+            min_count: Minimum number of documents a pair must share
+            min_npmi: Pairs below this relatedness are dropped
+
+        Returns:
+            SkillCooccurrence
+        """
+        index = {}
+        rows, cols = [], []
+        n_documents = 0
+        for skills in skill_lists:
+            for skill in set(skills or ()):
+                rows.append(n_documents)
+                cols.append(index.setdefault(skill, len(index)))
+            n_documents += 1
+
+        vocabulary = sorted(index, key=index.get)
+        n_skills = len(vocabulary)
+        documents = sparse.csr_matrix((np.ones(len(rows), dtype=np.float64), (rows, cols)),
+                                      shape=(n_documents, n_skills))
+        counts = (documents.T @ documents).tocoo()
+        frequency = np.asarray(documents.sum(axis=0)).ravel()
+
+        keep = (counts.row != counts.col) & (counts.data >= min_count)
+        i, j, joint = counts.row[keep], counts.col[keep], counts.data[keep]
+        if n_documents and len(joint):
+            p_joint = joint / n_documents
+            pmi = np.log(p_joint / ((frequency[i] / n_documents) * (frequency[j] / n_documents)))
+            # Pairs present in every document have -log(p) = 0; treat them as fully related
+            denominator = -np.log(p_joint)
+            npmi = np.divide(pmi, denominator, out=np.ones_like(pmi), where=denominator > 0)
+        else:
+            npmi = np.zeros(0)
+
+        related = npmi >= min_npmi
+        matrix = sparse.csr_matrix((npmi[related].astype(np.float32), (i[related], j[related])),
+                                   shape=(n_skills, n_skills))
+        matrix.sort_indices()
+        return cls(vocabulary, matrix.data, matrix.indices.astype(np.int32), matrix.indptr.astype(np.int64))
+
+    def save(self, directory):
+        """
+        Writes the CSR arrays and vocabulary. Files are replaced atomically so
+        workers holding the previous mapping keep reading the old inode.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in self.ARRAYS:
+            path = os.path.join(directory, f'{name}.npy')
+            with open(path + '.tmp', 'wb') as f:
+                np.save(f, getattr(self, name))
+            os.replace(path + '.tmp', path)
+        # Vocabulary last: its mtime marks a complete build
+        path = os.path.join(directory, self.VOCABULARY_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.vocabulary, f)
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Restores a matrix saved with save(), memory-mapped read-only by default"""
+        with open(os.path.join(directory, cls.VOCABULARY_FILE)) as f:
+            vocabulary = json.load(f)
+        mode = 'r' if mmap else None
+        arrays = [np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mode) for name in cls.ARRAYS]
+        data, indices, indptr = arrays
+        if len(indptr) != len(vocabulary) + 1 or len(indices) != len(data) or indptr[-1] != len(data):
+            raise ValueError(f"Inconsistent co-occurrence files in {directory}")
+        return cls(vocabulary, data, indices, indptr)
+
+    def related(self, skill):
+        """
+        Skills related to a skill with their NPMI.
+
+        Returns:
+            dict: {skill: npmi}
+        """
+        i = self.index.get(skill)
+        if i is None:
+            return {}
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return {self.vocabulary[j]: float(v) for j, v in zip(self.indices[start:end], self.data[start:end])}
+
+    def partial_credit(self, missing_skill, resume_skill_ids):
+        """
+        Credit for a missing skill: the strongest NPMI between it and any resume
+        skill, found with one CSR row slice.
+
+        Args:
+            missing_skill: Required skill absent from the resume
+            resume_skill_ids: Sorted int array of the resume's vocabulary indices
+
+        Returns:
+            float: Credit between 0 and PARTIAL_CREDIT_WEIGHT
+        """
+        i = self.index.get(missing_skill)
+        if i is None or not len(resume_skill_ids):
+            return 0.0
+        start, end = self.indptr[i], self.indptr[i + 1]
+        hits = np.isin(self.indices[start:end], resume_skill_ids, assume_unique=True)
+        if not hits.any():
+            return 0.0
+        return self.PARTIAL_CREDIT_WEIGHT * float(self.data[start:end][hits].max())
+
+    def skill_match_ratio(self, resume_skills, jd_skills):
+        """
+        Fraction of required skills covered, with partial credit for missing
+        skills that co-occur with skills the resume does have.
+        """
+        resume_set = set(resume_skills)
+        matched = resume_set.intersection(jd_skills)
+        resume_ids = np.array(sorted(self.index[s] for s in resume_set if s in self.index), dtype=np.int32)
+        credit = sum(self.partial_credit(skill, resume_ids) for skill in set(jd_skills) - resume_set)
+        return (len(matched) + credit) / len(jd_skills)
+
+
+_cooccurrence_cache = {}
+
+
+def load_shared_cooccurrence(path):
+    """
+    Maps the co-occurrence matrix once per process, remapping after a rebuild.
+
+    Returns:
+        SkillCooccurrence or None if the matrix has not been built yet
+    """
+    manifest = os.path.join(path, SkillCooccurrence.VOCABULARY_FILE) if path else None
+    if not manifest or not os.path.exists(manifest):
+        return None
+    mtime = os.path.getmtime(manifest)
+    cached = _cooccurrence_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        try:
+            cached = (mtime, SkillCooccurrence.load(path))
+        except ValueError:
+            # Rebuild in progress; keep serving the previous mapping
+            return cached[1] if cached else None
+        _cooccurrence_cache[path] = cached
+    return cached[1]
@@ -3,16 +3,48 @@ AI Engine - Unified interface for all AI/ML operations
 Organizes existing AI logic: resume parsing, NLP processing, and matching
 """
 
+import io
+import os
 import pdfplumber
-import spacy
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
+import threading
+from functools import lru_cache
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-import io
+from flask_app.ai_engine.features import HashingFeatureExtractor, IncrementalIDF, pairwise_local_tfidf_cosine
+from flask_app.ai_engine.report_engine import ReportEngine, get_report_engine
+from flask_app.ai_engine.sidecar import delegate, get_engine_client, NOT_DELEGATED
+
+
+class _LazySpacyModel:
+    """
+    Class attribute that loads the spaCy model on first access, so processes
+    delegating to the engine sidecar never load it.
+    """
+    
+    def __init__(self, name):
+        self.name = name
+        self._nlp = None
+        self._lock = threading.Lock()
+    
+    def __get__(self, instance, owner):
+        if self._nlp is None:
+            with self._lock:
+                if self._nlp is None:
+                    self._nlp = self._load()
+        return self._nlp
+    
+    def _load(self):
+        import spacy
+        try:
+            return spacy.load(self.name)
+        except OSError:
+            print(f"Downloading '{self.name}' model...")
+            from spacy.cli import download
+            download(self.name)
+            return spacy.load(self.name)
 
 
 class ResumeParser:
@@ -29,6 +61,19 @@ class ResumeParser:
         Returns:
             str: Extracted text or None if error
         """
+        if get_engine_client() is not None:
+            # The sidecar opens paths under the shared upload root itself; anything else is sent as bytes
+            if isinstance(file, str):
+                delegated = delegate('extract_text_from_pdf', file)
+                if delegated is NOT_DELEGATED and os.path.isfile(file):
+                    with open(file, 'rb') as f:
+                        delegated = delegate('extract_text_from_pdf', f.read())
+            else:
+                file = io.BytesIO(file.read())
+                delegated = delegate('extract_text_from_pdf', file.getvalue())
+            if delegated is not NOT_DELEGATED:
+                return delegated
+        
         text = ""
         try:
             with pdfplumber.open(file) as pdf:
@@ -45,14 +90,8 @@ class ResumeParser:
 class NLPProcessor:
     """Handles NLP processing and skill extraction"""
     
-    # Load spaCy model with fallback
-    try:
-        nlp = spacy.load("en_core_web_sm")
-    except OSError:
-        print("Downloading 'en_core_web_sm' model...")
-        from spacy.cli import download
-        download("en_core_web_sm")
-        nlp = spacy.load("en_core_web_sm")
+    # spaCy model, loaded (and downloaded if missing) on first use
+    nlp = _LazySpacyModel("en_core_web_sm")
     
     # Common technical skills database (extendable)
     SKILLS_DB = {
@@ -93,10 +132,33 @@ class NLPProcessor:
         Returns:
             str: Preprocessed text with lemmatized tokens
         """
+        delegated = delegate('preprocess_text', text)
+        if delegated is not NOT_DELEGATED:
+            return delegated
+        
         doc = cls.nlp(text)
         tokens = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct]
         return " ".join(tokens)
     
+    @classmethod
+    def preprocess_texts(cls, texts, batch_size=32):
+        """
+        preprocess_text for many texts, streamed through spaCy's nlp.pipe.
+        
+        Args:
+            texts: List of raw text strings
+            batch_size: Documents per spaCy batch
+            
+        Returns:
+            list: Preprocessed texts aligned with the input
+        """
+        delegated = delegate('preprocess_texts', list(texts))
+        if delegated is not NOT_DELEGATED:
+            return delegated
+        
+        return [" ".join(token.lemma_ for token in doc if not token.is_stop and not token.is_punct)
+                for doc in cls.nlp.pipe(texts, batch_size=batch_size)]
+    
     @classmethod
     def extract_skills(cls, text):
         """
@@ -119,36 +181,55 @@ class NLPProcessor:
         
         return sorted(list(found_skills))
     
+    # Resume sections the ATS check looks for, with the headers that count for each
+    ATS_SECTIONS = {
+        'experience': ['experience', 'work history', 'employment'],
+        'education': ['education', 'academic'],
+        'skills': ['skills', 'technologies', 'expertise'],
+        'summary': ['summary', 'objective', 'profile'],
+        'contact': ['contact', 'personal info']
+    }
+    
+    # ATS finding codes and their messages; analyses store the codes
+    ATS_FINDINGS = {
+        'missing_section': "Missing '{}' section header.",
+        'no_email': "Email address not detected.",
+        'no_phone': "Phone number not detected.",
+        'short_text': "Resume text is quite short; consider adding more detail.",
+        'long_text': "Resume is very long; ensure it remains concise.",
+        'special_chars': "Detected high density of special characters; check for complex formatting.",
+    }
+    
+    @classmethod
+    def ats_finding_text(cls, code):
+        """Message for an ATS finding code ('code' or 'code:argument'); unknown codes are returned as is"""
+        name, _, argument = code.partition(':')
+        if name not in cls.ATS_FINDINGS:
+            return code
+        return cls.ATS_FINDINGS[name].format(argument.title())
+    
     @classmethod
     def check_ats_friendliness(cls, text):
         """
         Checks for ATS friendliness: sections, contact info, formatting.
         
         Returns:
-            dict: ATS score and detailed findings
+            dict: ATS score, detailed findings and their finding codes
         """
         if not text:
             return {'score': 0, 'details': {'error': 'No text provided'}}
             
         text_lower = text.lower()
-        findings = []
+        codes = []
         score = 0
         
         # 1. Section Checks (30 points)
-        sections = {
-            'experience': ['experience', 'work history', 'employment'],
-            'education': ['education', 'academic'],
-            'skills': ['skills', 'technologies', 'expertise'],
-            'summary': ['summary', 'objective', 'profile'],
-            'contact': ['contact', 'personal info']
-        }
-        
         section_score = 0
-        for section, keywords in sections.items():
+        for section, keywords in cls.ATS_SECTIONS.items():
             if any(k in text_lower for k in keywords):
                 section_score += 6
             else:
-                findings.append(f"Missing '{section.title()}' section header.")
+                codes.append(f'missing_section:{section}')
         score += section_score
         
         # 2. Contact Info (20 points)
@@ -158,12 +239,12 @@ class NLPProcessor:
         if re.search(email_pattern, text):
             score += 10
         else:
-            findings.append("Email address not detected.")
+            codes.append('no_email')
             
         if re.search(phone_pattern, text):
             score += 10
         else:
-            findings.append("Phone number not detected.")
+            codes.append('no_phone')
             
         # 3. Text Volume/Density (20 points)
         word_count = len(text.split())
@@ -171,10 +252,10 @@ class NLPProcessor:
             score += 20
         elif word_count < 200:
             score += 10
-            findings.append("Resume text is quite short; consider adding more detail.")
+            codes.append('short_text')
         else:
             score += 15
-            findings.append("Resume is very long; ensure it remains concise.")
+            codes.append('long_text')
             
         # 4. Formatting - No tables/columns detection (simulated) (30 points)
         # In a real app, we'd check PDF structure. Here we check for common clean text patterns.
@@ -184,11 +265,12 @@ class NLPProcessor:
             score += 30
         else:
             score += 15
-            findings.append("Detected high density of special characters; check for complex formatting.")
+            codes.append('special_chars')
             
         return {
             'score': score,
-            'findings': findings
+            'findings': [cls.ats_finding_text(code) for code in codes],
+            'finding_codes': codes
         }
 
     @classmethod
@@ -328,9 +410,37 @@ class SkillRecommender:
         return resources
 
 
+@lru_cache(maxsize=4096)
+def _derived_text(missing_skills, engine_version):
+    missing_skills = list(missing_skills)
+    generate_suggestions, generate_questions, get_resources = ResumeMatcher.DERIVED_TEXT[engine_version]
+    return (generate_suggestions(missing_skills),
+            generate_questions(missing_skills),
+            get_resources(missing_skills))
+
+
 class ResumeMatcher:
     """Handles resume to job description matching"""
     
+    # Bump when scoring, ATS findings or the suggestion/question/resource banks change;
+    # stored analyses record it and only same-version analyses are reused
+    ENGINE_VERSION = 1
+    
+    # (suggestions, questions, resources) renderers for every version stored analyses may
+    # carry. Analyses expand their derived text with the banks of the version that made
+    # them, so a bump that changes the banks keeps the old renderers here under the old
+    # number; versions missing from this map render with the current banks.
+    DERIVED_TEXT = {
+        1: (NLPProcessor.generate_suggestions, InterviewPrep.generate_questions, SkillRecommender.get_resources),
+    }
+    
+    # Stateless extractor for the 'hashing' feature mode (no fit step)
+    HASHING_EXTRACTOR = HashingFeatureExtractor()
+    
+    # Hybrid weights (content, skills) and (content, skills, semantic) when embeddings are enabled
+    HYBRID_WEIGHTS = (0.4, 0.6)
+    SEMANTIC_HYBRID_WEIGHTS = (0.25, 0.55, 0.2)
+    
     @staticmethod
     def calculate_tfidf_score(resume_text, jd_text):
         """
@@ -352,17 +462,69 @@ class ResumeMatcher:
         
         return similarity
     
+    @classmethod
+    def calculate_hashing_score(cls, resume_text, jd_text, idf=None):
+        """
+        Calculates cosine similarity over hashed TF-IDF features.
+        Needs no fitted vocabulary, so memory stays constant as the corpus grows.
+        
+        Args:
+            resume_text: Resume content
+            jd_text: Job description content
+            idf: Optional corpus-wide IncrementalIDF; when omitted, IDF is computed
+                 from the pair itself, mirroring calculate_tfidf_score
+            
+        Returns:
+            float: Similarity score between 0 and 1
+        """
+        if not resume_text or not jd_text:
+            return 0.0
+        
+        counts = cls.HASHING_EXTRACTOR.transform([resume_text, jd_text])
+        if idf is None:
+            vectors = IncrementalIDF.transform_local(counts)
+        else:
+            vectors = idf.transform(counts)
+        
+        return float(vectors[0].multiply(vectors[1]).sum())
+    
+    @staticmethod
+    def calculate_semantic_score(resume_text, jd_text, embedder):
+        """
+        Calculates cosine similarity between LSA embeddings, which credits related
+        vocabulary (e.g. "ML engineer" vs "machine learning") that TF-IDF misses.
+        
+        Args:
+            resume_text: Resume content
+            jd_text: Job description content
+            embedder: Fitted LSAEmbedder
+            
+        Returns:
+            float: Similarity score between 0 and 1
+        """
+        if not resume_text or not jd_text:
+            return 0.0
+        
+        resume_vec, jd_vec = embedder.transform([resume_text, jd_text])
+        return max(0.0, float(resume_vec @ jd_vec))
+    
     @staticmethod
-    def calculate_hybrid_score(resume_text, jd_text, resume_skills, jd_skills):
+    def calculate_hybrid_score(resume_text, jd_text, resume_skills, jd_skills, feature_mode='tfidf', idf=None,
+                               embedder=None, cooccurrence=None):
         """
         Calculates a weighted hybrid score based on TF-IDF and skill matching.
         Weight: 40% Content Similarity + 60% Skill Match (better for technical roles)
+        With an embedder: 25% Content + 55% Skills + 20% Semantic Similarity
         
         Args:
             resume_text: Resume content
             jd_text: Job description content
             resume_skills: List of skills found in resume
             jd_skills: List of skills required in job description
+            feature_mode: 'tfidf' (fitted vocabulary) or 'hashing' (stateless features)
+            idf: Optional IncrementalIDF used by the 'hashing' mode
+            embedder: Optional LSAEmbedder adding semantic similarity as a third component
+            cooccurrence: Optional SkillCooccurrence giving partial credit for related skills
             
         Returns:
             float: Final score between 0 and 100
@@ -371,39 +533,74 @@ class ResumeMatcher:
             return 0.0
         
         # Content similarity using TF-IDF
-        content_sim = ResumeMatcher.calculate_tfidf_score(resume_text, jd_text)
+        if feature_mode == 'hashing':
+            content_sim = ResumeMatcher.calculate_hashing_score(resume_text, jd_text, idf=idf)
+        else:
+            content_sim = ResumeMatcher.calculate_tfidf_score(resume_text, jd_text)
+        
+        semantic_sim = None
+        if embedder is not None:
+            semantic_sim = ResumeMatcher.calculate_semantic_score(resume_text, jd_text, embedder)
         
-        # Skill match ratio
+        skill_match = ResumeMatcher._skill_match_ratio(resume_skills, jd_skills, cooccurrence)
+        return ResumeMatcher._combine_scores(content_sim, skill_match, semantic_sim)
+    
+    @staticmethod
+    def _skill_match_ratio(resume_skills, jd_skills, cooccurrence=None):
+        """Fraction of required skills present in the resume"""
+        # Avoid division by zero
         if not jd_skills:
-            skill_match = 1.0 if resume_skills else 0.0
+            return 1.0 if resume_skills else 0.0
+        if cooccurrence is not None:
+            return cooccurrence.skill_match_ratio(resume_skills, jd_skills)
+        matched_count = len(set(resume_skills).intersection(set(jd_skills)))
+        return matched_count / len(jd_skills)
+    
+    @staticmethod
+    def _combine_scores(content_sim, skill_match, semantic_sim=None):
+        """Weights the score components into a final 0-100 score"""
+        if semantic_sim is not None:
+            content_w, skill_w, semantic_w = ResumeMatcher.SEMANTIC_HYBRID_WEIGHTS
+            final_score = (content_sim * content_w) + (skill_match * skill_w) + (semantic_sim * semantic_w)
         else:
-            matched_count = len(set(resume_skills).intersection(set(jd_skills)))
-            skill_match = matched_count / len(jd_skills)
-        
-        # Weighted average: 40% TF-IDF + 60% Skills
-        final_score = (content_sim * 0.4) + (skill_match * 0.6)
+            # Weighted average: 40% TF-IDF + 60% Skills
+            content_w, skill_w = ResumeMatcher.HYBRID_WEIGHTS
+            final_score = (content_sim * content_w) + (skill_match * skill_w)
         
         return round(final_score * 100, 2)
     
     @staticmethod
-    def analyze_match(resume_text, jd_text, resume_skills, jd_skills):
+    def derived_text(missing_skills, engine_version=None):
         """
-        Performs comprehensive match analysis.
+        Suggestions, interview questions and learning resources for missing skills.
+        They depend only on the skills and the static banks, so analyses store the
+        skills and expand these at render time; results are cached and shared, so
+        callers must not modify them.
         
+        Args:
+            missing_skills: Skill names
+            engine_version: ENGINE_VERSION whose banks to render with (default: current)
+            
         Returns:
-            dict: Analysis results including score, matched/missing skills, ATS data,
-                  interview questions, and skill resources.
+            tuple: (suggestions, interview_questions, skill_resources)
         """
-        score = ResumeMatcher.calculate_hybrid_score(resume_text, jd_text, resume_skills, jd_skills)
-        ats_data = NLPProcessor.check_ats_friendliness(resume_text)
+        if engine_version not in ResumeMatcher.DERIVED_TEXT:
+            engine_version = ResumeMatcher.ENGINE_VERSION
+        return _derived_text(tuple(missing_skills or ()), engine_version)
+    
+    @staticmethod
+    def _build_result(score, ats_data, resume_skills, jd_skills, generate_questions=None, get_resources=None):
+        """Assembles the analysis dict shared by analyze_match and analyze_batch"""
+        generate_questions = generate_questions or InterviewPrep.generate_questions
+        get_resources = get_resources or SkillRecommender.get_resources
         
         matched_skills = list(set(resume_skills) & set(jd_skills))
         missing_skills = list(set(jd_skills) - set(resume_skills))
         missing_skills.sort()
         
         # New Feature Integration
-        interview_questions = InterviewPrep.generate_questions(missing_skills)
-        skill_resources = SkillRecommender.get_resources(missing_skills)
+        interview_questions = generate_questions(missing_skills)
+        skill_resources = get_resources(missing_skills)
         
         return {
             'score': score,
@@ -411,96 +608,188 @@ class ResumeMatcher:
             'missing_skills': missing_skills,
             'match_percentage': min(100, int((len(matched_skills) / max(len(jd_skills), 1)) * 100)),
             'ats_score': ats_data['score'],
-            'ats_findings': ats_data['findings'],
+            'ats_findings': ats_data.get('findings', []),
+            'ats_finding_codes': ats_data.get('finding_codes', []),
             'interview_questions': interview_questions,
             'skill_resources': skill_resources
         }
+    
+    @staticmethod
+    def analyze_match(resume_text, jd_text, resume_skills, jd_skills, feature_mode='tfidf', idf=None,
+                      embedder=None, cooccurrence=None):
+        """
+        Performs comprehensive match analysis.
+        
+        Returns:
+            dict: Analysis results including score, matched/missing skills, ATS data,
+                  interview questions, and skill resources.
+        """
+        # The sidecar applies its own copies of the IDF, embedder and co-occurrence matrix
+        options = {'feature_mode': feature_mode, 'idf': idf is not None, 'embedder': embedder is not None,
+                   'cooccurrence': cooccurrence is not None}
+        delegated = delegate('analyze_match', resume_text, jd_text, list(resume_skills), list(jd_skills),
+                             options=options)
+        if delegated is not NOT_DELEGATED:
+            return delegated
+        
+        score = ResumeMatcher.calculate_hybrid_score(resume_text, jd_text, resume_skills, jd_skills,
+                                                     feature_mode=feature_mode, idf=idf, embedder=embedder,
+                                                     cooccurrence=cooccurrence)
+        ats_data = NLPProcessor.check_ats_friendliness(resume_text)
+        
+        return ResumeMatcher._build_result(score, ats_data, resume_skills, jd_skills)
+    
+    @staticmethod
+    def analyze_batch(resume_texts, jd_texts, resume_skills=None, jd_skills=None, cross_product=False,
+                      batch_size=256, feature_mode='tfidf', idf=None, embedder=None, cooccurrence=None):
+        """
+        Analyzes many (resume, job description) pairs at once.
+        
+        Identical inputs are deduplicated, each chunk of pairs is vectorized into a
+        single matrix and scored with sparse operations, and per-input work (skill
+        extraction, ATS checks, questions, resources) runs once per distinct value.
+        Scores equal analyze_match for the same pair.
+        
+        Args:
+            resume_texts: List of resume contents
+            jd_texts: List of job description contents
+            resume_skills: Optional list of skill lists aligned with resume_texts
+                           (extracted with NLPProcessor when omitted)
+            jd_skills: Optional list of skill lists aligned with jd_texts
+            cross_product: Score every resume against every JD instead of pairing by position
+            batch_size: Pairs vectorized together; bounds peak memory
+            feature_mode, idf, embedder, cooccurrence: As for analyze_match
+            
+        Yields:
+            dict: analyze_match results plus 'resume_index' and 'jd_index'
+        """
+        if cross_product:
+            pairs = ((r, j) for r in range(len(resume_texts)) for j in range(len(jd_texts)))
+        else:
+            if len(resume_texts) != len(jd_texts):
+                raise ValueError("resume_texts and jd_texts must have the same length unless cross_product=True")
+            pairs = ((i, i) for i in range(len(resume_texts)))
+        
+        # Per-distinct-input caches, shared across chunks
+        skill_cache = {}
+        ats_cache = {}
+        questions_cache = {}
+        resources_cache = {}
+        
+        def skills_for(text, given):
+            if given is not None:
+                return given
+            if text not in skill_cache:
+                skill_cache[text] = NLPProcessor.extract_skills(text or "")
+            return skill_cache[text]
+        
+        def ats_for(text):
+            if text not in ats_cache:
+                ats_cache[text] = NLPProcessor.check_ats_friendliness(text)
+            return ats_cache[text]
+        
+        def cached(cache, fn):
+            def wrapper(missing_skills):
+                key = tuple(missing_skills)
+                if key not in cache:
+                    cache[key] = fn(missing_skills)
+                return list(cache[key])
+            return wrapper
+        
+        generate_questions = cached(questions_cache, InterviewPrep.generate_questions)
+        get_resources = cached(resources_cache, SkillRecommender.get_resources)
+        
+        chunk = []
+        for pair in pairs:
+            chunk.append(pair)
+            if len(chunk) >= batch_size:
+                yield from ResumeMatcher._analyze_chunk(chunk, resume_texts, jd_texts, resume_skills, jd_skills,
+                                                        feature_mode, idf, embedder, cooccurrence, skills_for, ats_for,
+                                                        generate_questions, get_resources)
+                chunk = []
+        if chunk:
+            yield from ResumeMatcher._analyze_chunk(chunk, resume_texts, jd_texts, resume_skills, jd_skills,
+                                                    feature_mode, idf, embedder, cooccurrence, skills_for, ats_for,
+                                                    generate_questions, get_resources)
+    
+    @staticmethod
+    def _analyze_chunk(chunk, resume_texts, jd_texts, resume_skills, jd_skills, feature_mode, idf, embedder,
+                       cooccurrence, skills_for, ats_for, generate_questions, get_resources):
+        """Scores one chunk of (resume_index, jd_index) pairs with a single document matrix"""
+        # One matrix row per distinct document in the chunk
+        rows = {}
+        for r, j in chunk:
+            rows.setdefault(resume_texts[r] or "", len(rows))
+            rows.setdefault(jd_texts[j] or "", len(rows))
+        documents = list(rows)
+        left = [rows[resume_texts[r] or ""] for r, _ in chunk]
+        right = [rows[jd_texts[j] or ""] for _, j in chunk]
+        
+        if feature_mode == 'hashing':
+            counts = ResumeMatcher.HASHING_EXTRACTOR.transform(documents)
+        else:
+            try:
+                counts = CountVectorizer().fit_transform(documents)
+            except ValueError:
+                # No tokens anywhere in the chunk: every content similarity is 0
+                counts = sparse.csr_matrix((len(documents), 1))
+        
+        if feature_mode == 'hashing' and idf is not None:
+            vectors = idf.transform(counts)
+            content = np.asarray(vectors[left].multiply(vectors[right]).sum(axis=1)).ravel()
+        else:
+            content = pairwise_local_tfidf_cosine(counts[left], counts[right])
+        
+        semantic = None
+        if embedder is not None:
+            embeddings = embedder.transform(documents)
+            semantic = np.maximum(0.0, np.einsum('ij,ij->i', embeddings[left], embeddings[right]))
+        
+        for position, (r, j) in enumerate(chunk):
+            resume_text, jd_text = resume_texts[r], jd_texts[j]
+            r_skills = skills_for(resume_text, resume_skills[r] if resume_skills is not None else None)
+            j_skills = skills_for(jd_text, jd_skills[j] if jd_skills is not None else None)
+            
+            if not resume_text or not jd_text:
+                score = 0.0
+            else:
+                score = ResumeMatcher._combine_scores(
+                    float(content[position]),
+                    ResumeMatcher._skill_match_ratio(r_skills, j_skills, cooccurrence),
+                    float(semantic[position]) if semantic is not None else None
+                )
+            
+            result = ResumeMatcher._build_result(score, ats_for(resume_text), r_skills, j_skills,
+                                                 generate_questions, get_resources)
+            result['resume_index'] = r
+            result['jd_index'] = j
+            yield result
 
 
 class ReportGenerator:
     """Generates PDF reports for resume analysis"""
     
+    # Bump whenever the report layout changes so cached renders are invalidated
+    TEMPLATE_VERSION = ReportEngine.TEMPLATE_VERSION
+    
     @staticmethod
     def generate_report(resume_name, match_score, matched_skills, missing_skills, suggestions, ats_score=None, ats_findings=None):
         """
         Generates a professional PDF report for resume analysis.
+        Styles are shared through the process-wide ReportEngine.
         """
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(
-            buffer, 
-            pagesize=letter, 
-            rightMargin=72, 
-            leftMargin=72, 
-            topMargin=72, 
-            bottomMargin=18
-        )
-        
-        styles = getSampleStyleSheet()
-        styles.add(ParagraphStyle(name='Header', fontSize=18, spaceAfter=20, alignment=1, 
-                                 textColor=colors.HexColor("#4F46E5")))
-        styles.add(ParagraphStyle(name='SubSection', fontSize=14, spaceBefore=15, spaceAfter=10, 
-                                 textColor=colors.HexColor("#4F46E5")))
-        
-        elements = []
-        
-        # Title
-        elements.append(Paragraph("AI Resume Analysis Report", styles['Header']))
-        elements.append(Paragraph(f"Candidate: {resume_name}", styles['Normal']))
-        elements.append(Spacer(1, 12))
-        
-        # Scores Section
-        col1_text = f"Match Score: <font color='#4F46E5'><b>{match_score}%</b></font>"
-        elements.append(Paragraph(col1_text, styles['SubSection']))
-        
-        if ats_score is not None:
-            ats_color = '#10B981' if ats_score >= 70 else '#F59E0B' if ats_score >= 40 else '#EF4444'
-            elements.append(Paragraph(f"ATS Friendliness Score: <font color='{ats_color}'><b>{ats_score}%</b></font>", 
-                                     styles['SubSection']))
-        
-        elements.append(Spacer(1, 12))
-        
-        # Skills table
-        elements.append(Paragraph("Skill Analysis:", styles['SubSection']))
-        
-        data = [['Matched Skills', 'Missing Skills']]
-        max_len = max(len(matched_skills), len(missing_skills))
-        
-        for i in range(max_len):
-            m = matched_skills[i] if i < len(matched_skills) else ""
-            miss = missing_skills[i] if i < len(missing_skills) else ""
-            data.append([m, miss])
-        
-        if not data[1:]:
-            data.append(["None", "None"])
-        
-        table = Table(data, colWidths=[200, 200])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#4F46E5")),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor("#F3F4F6")),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-        ]))
-        elements.append(table)
-        elements.append(Spacer(1, 20))
-
-        # ATS Findings
-        if ats_findings:
-            elements.append(Paragraph("ATS Friendliness Feedback:", styles['SubSection']))
-            for finding in ats_findings:
-                elements.append(Paragraph(f"• {finding}", styles['Normal']))
-                elements.append(Spacer(1, 6))
-            elements.append(Spacer(1, 12))
-        
-        # Suggestions
-        elements.append(Paragraph("Improvement Suggestions:", styles['SubSection']))
-        for suggestion in suggestions:
-            elements.append(Paragraph(f"• {suggestion}", styles['Normal']))
-            elements.append(Spacer(1, 6))
-        
-        # Build PDF
-        doc.build(elements)
-        buffer.seek(0)
-        return buffer
+        return get_report_engine().render(resume_name, match_score, matched_skills, missing_skills, suggestions,
+                                          ats_score=ats_score, ats_findings=ats_findings)
+    
+    @staticmethod
+    def generate_reports(reports):
+        """
+        Generates many reports in one go.
+        
+        Args:
+            reports: Iterable of dicts with generate_report's keyword arguments
+            
+        Yields:
+            bytes: One PDF per report, in input order
+        """
+        return get_report_engine().render_batch(reports)
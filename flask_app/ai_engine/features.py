@@ -0,0 +1,195 @@
+"""
+Feature Extraction - Stateless hashing features for streaming ingestion
+Fixed-size alternative to the fitted TF-IDF vocabulary used by ResumeMatcher
+"""
+
+import os
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class HashingFeatureExtractor:
+    """Maps documents into a fixed 2^k float32 term-count space without a fit step"""
+
+    DEFAULT_N_BITS = 18
+
+    def __init__(self, n_bits=DEFAULT_N_BITS):
+        self.n_bits = n_bits
+        self.n_features = 2 ** n_bits
+        # Same tokenization as TfidfVectorizer; raw counts so IDF can be applied later
+        self.vectorizer = HashingVectorizer(
+            n_features=self.n_features,
+            alternate_sign=False,
+            norm=None,
+            dtype=np.float32
+        )
+
+    def transform(self, documents):
+        """
+        Hashes a batch of documents into term counts.
+
+        Args:
+            documents: List of text strings
+
+        Returns:
+            scipy.sparse.csr_matrix: float32 counts of shape (n_docs, 2^k)
+        """
+        return self.vectorizer.transform([doc or "" for doc in documents])
+
+    def iter_transform(self, documents, batch_size=256):
+        """
+        Hashes an iterable of documents in fixed-size batches.
+        Memory stays flat regardless of how many documents are streamed.
+
+        Args:
+            documents: Any iterable of text strings (e.g. a DB cursor)
+            batch_size: Documents per yielded batch
+
+        Yields:
+            scipy.sparse.csr_matrix: Term counts for each batch
+        """
+        batch = []
+        for doc in documents:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                yield self.transform(batch)
+                batch = []
+        if batch:
+            yield self.transform(batch)
+
+
+class IncrementalIDF:
+    """Document-frequency accumulator over hashed features, updated batch by batch"""
+
+    def __init__(self, n_features):
+        self.n_features = n_features
+        self.n_documents = 0
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+
+    def partial_fit(self, counts):
+        """
+        Adds a batch of hashed documents to the running statistics.
+
+        Args:
+            counts: Sparse term counts from HashingFeatureExtractor
+
+        Returns:
+            IncrementalIDF: self, for chaining
+        """
+        counts = sparse.csr_matrix(counts)
+        counts.eliminate_zeros()
+        self.n_documents += counts.shape[0]
+        self.document_frequency += np.bincount(counts.indices, minlength=self.n_features)
+        return self
+
+    @staticmethod
+    def _smoothed_idf(n_documents, document_frequency):
+        """Smoothed IDF, matching TfidfVectorizer(smooth_idf=True)"""
+        return (np.log((1.0 + n_documents) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+
+    @property
+    def idf(self):
+        """Dense IDF weights for every hashed feature"""
+        return self._smoothed_idf(self.n_documents, self.document_frequency)
+
+    @staticmethod
+    def _weighted(counts, weights):
+        """Scales each stored count by its feature weight and L2-normalizes rows"""
+        weighted = sparse.csr_matrix(counts, dtype=np.float32, copy=True)
+        weighted.data *= weights
+        return normalize(weighted, norm='l2', copy=False)
+
+    def transform(self, counts):
+        """
+        Applies IDF weighting and L2 normalization to hashed counts.
+        Only the features present in the batch are looked up, so cost is O(nnz).
+
+        Returns:
+            scipy.sparse.csr_matrix: float32 TF-IDF vectors
+        """
+        counts = sparse.csr_matrix(counts)
+        weights = self._smoothed_idf(self.n_documents, self.document_frequency[counts.indices])
+        return self._weighted(counts, weights)
+
+    @classmethod
+    def transform_local(cls, counts):
+        """
+        TF-IDF using document frequencies from the batch itself, without
+        allocating the full 2^k accumulator (equivalent to fitting on the batch).
+
+        Returns:
+            scipy.sparse.csr_matrix: float32 TF-IDF vectors
+        """
+        counts = sparse.csr_matrix(counts)
+        counts.eliminate_zeros()
+        _, inverse, frequency = np.unique(counts.indices, return_inverse=True, return_counts=True)
+        weights = cls._smoothed_idf(counts.shape[0], frequency)[inverse]
+        return cls._weighted(counts, weights)
+
+    def save(self, path):
+        """Persists the accumulator to an .npz file"""
+        np.savez(path, n_documents=self.n_documents, document_frequency=self.document_frequency)
+
+    @classmethod
+    def load(cls, path):
+        """Restores an accumulator saved with save()"""
+        with np.load(path) as data:
+            accumulator = cls(len(data['document_frequency']))
+            accumulator.n_documents = int(data['n_documents'])
+            accumulator.document_frequency = data['document_frequency'].astype(np.int64)
+        return accumulator
+
+
+_idf_cache = {}
+
+
+def load_shared_idf(path):
+    """
+    Loads a persisted IDF accumulator once per process, reloading if the file changes.
+
+    Returns:
+        IncrementalIDF or None if no accumulator has been built yet
+    """
+    if not path or not os.path.exists(path):
+        return None
+    mtime = os.path.getmtime(path)
+    cached = _idf_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, IncrementalIDF.load(path))
+        _idf_cache[path] = cached
+    return cached[1]
+
+
+def pairwise_local_tfidf_cosine(left_counts, right_counts):
+    """
+    Row-wise cosine similarity of TF-IDF vectors where each (left, right) row pair
+    gets the IDF it would have if the two documents were fitted on their own, as
+    TfidfVectorizer().fit_transform([left, right]) does. Computed for all pairs at
+    once with sparse element-wise operations instead of one vectorizer per pair.
+
+    With n=2 smoothed IDF, shared terms weigh 1 and unshared terms ln(3/2) + 1,
+    so only the shared term mass is needed to reweight each row's norm.
+
+    Args:
+        left_counts: Sparse term counts, one row per pair
+        right_counts: Sparse term counts aligned row-by-row with left_counts
+
+    Returns:
+        np.ndarray: Cosine similarity per pair (0 where a document has no terms)
+    """
+    left = sparse.csr_matrix(left_counts, dtype=np.float64)
+    right = sparse.csr_matrix(right_counts, dtype=np.float64)
+    unshared_idf_sq = (np.log(1.5) + 1.0) ** 2
+
+    dot = np.asarray(left.multiply(right).sum(axis=1)).ravel()
+    left_sq = left.multiply(left)
+    right_sq = right.multiply(right)
+    left_shared = np.asarray(left_sq.multiply(right > 0).sum(axis=1)).ravel()
+    right_shared = np.asarray(right_sq.multiply(left > 0).sum(axis=1)).ravel()
+    left_norm_sq = unshared_idf_sq * (np.asarray(left_sq.sum(axis=1)).ravel() - left_shared) + left_shared
+    right_norm_sq = unshared_idf_sq * (np.asarray(right_sq.sum(axis=1)).ravel() - right_shared) + right_shared
+
+    denominator = np.sqrt(left_norm_sq * right_norm_sq)
+    return np.divide(dot, denominator, out=np.zeros_like(dot), where=denominator > 0)
@@ -0,0 +1,118 @@
+"""
+Near-Duplicate Detection - MinHash signatures with LSH banding
+Estimates Jaccard similarity of word shingles so near-identical resumes can be found
+without comparing every pair
+"""
+
+import re
+import zlib
+import hashlib
+import numpy as np
+
+
+class MinHasher:
+    """Computes fixed-size MinHash signatures over word shingles"""
+
+    # Largest prime below 2^32 keeps every permuted hash in uint32
+    PRIME = 4294967291
+    TOKEN_PATTERN = re.compile(r'\w+')
+
+    def __init__(self, num_perm=128, shingle_size=5, seed=1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # a < 2^31 so a * hash + b stays below 2^64
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, self.PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text):
+        """Set of word n-grams from normalized text"""
+        tokens = self.TOKEN_PATTERN.findall((text or "").lower())
+        if len(tokens) < self.shingle_size:
+            return {" ".join(tokens)} if tokens else set()
+        return {" ".join(tokens[i:i + self.shingle_size]) for i in range(len(tokens) - self.shingle_size + 1)}
+
+    def signature(self, text):
+        """
+        Computes the MinHash signature of a document.
+
+        Returns:
+            np.ndarray: uint32 array of length num_perm
+        """
+        shingles = self.shingles(text)
+        if not shingles:
+            return np.full(self.num_perm, self.PRIME, dtype=np.uint32)
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(hashes, self._a) + self._b) % np.uint64(self.PRIME)
+        return permuted.min(axis=0).astype(np.uint32)
+
+    @staticmethod
+    def jaccard(signature_a, signature_b):
+        """Estimated Jaccard similarity of the documents behind two signatures"""
+        return float(np.mean(np.asarray(signature_a) == np.asarray(signature_b)))
+
+    @staticmethod
+    def to_bytes(signature):
+        """Serializes a signature for a LargeBinary column"""
+        return np.asarray(signature, dtype=np.uint32).tobytes()
+
+    @staticmethod
+    def from_bytes(blob):
+        """Deserializes a signature stored with to_bytes()"""
+        return np.frombuffer(blob, dtype=np.uint32)
+
+
+class LSHBands:
+    """
+    Splits signatures into bands; documents sharing any band key are candidates.
+    With 16 bands of 8 rows, pairs above ~0.7 Jaccard collide with high probability.
+    """
+
+    def __init__(self, num_perm=128, bands=16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by the number of bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+
+    def keys(self, signature):
+        """
+        Band keys for a signature, suitable for an indexed integer column.
+
+        Returns:
+            list: One signed 64-bit key per band (the band number is mixed in)
+        """
+        signature = np.asarray(signature, dtype=np.uint32)
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(chunk.tobytes(), digest_size=8, person=band.to_bytes(2, 'little')).digest()
+            keys.append(int.from_bytes(digest, 'little', signed=True))
+        return keys
+
+
+class LSHIndex:
+    """In-memory LSH banding index for batch de-duplication"""
+
+    def __init__(self, num_perm=128, bands=16):
+        self.banding = LSHBands(num_perm, bands)
+        self.buckets = {}
+        self.signatures = {}
+
+    def add(self, item_id, signature):
+        self.signatures[item_id] = np.asarray(signature, dtype=np.uint32)
+        for key in self.banding.keys(signature):
+            self.buckets.setdefault(key, []).append(item_id)
+
+    def query(self, signature, threshold=0.8):
+        """
+        Finds indexed items whose estimated Jaccard similarity meets the threshold.
+
+        Returns:
+            list: (item_id, similarity) tuples, most similar first
+        """
+        candidates = set()
+        for key in self.banding.keys(signature):
+            candidates.update(self.buckets.get(key, ()))
+        matches = [(item_id, MinHasher.jaccard(signature, self.signatures[item_id])) for item_id in candidates]
+        return sorted([m for m in matches if m[1] >= threshold], key=lambda m: -m[1])
@@ -0,0 +1,148 @@
+"""
+Report Engine - PDF analysis reports with styles compiled once per process
+Depends only on ReportLab, so worker processes can render without loading spaCy
+"""
+
+import io
+import copy
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib import colors
+
+
+class ReportEngine:
+    """
+    Renders analysis reports. The stylesheet, paragraph styles, table style and
+    the fixed headings are built in __init__ and shared by every render; only the
+    per-report content is parsed per call.
+    """
+
+    # Bump whenever the report layout changes so cached renders are invalidated
+    TEMPLATE_VERSION = 1
+
+    PAGE_OPTIONS = dict(pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    SKILL_COLUMN_WIDTHS = [200, 200]
+
+    def __init__(self, accent="#4F46E5", table_body="#F3F4F6"):
+        self.styles = getSampleStyleSheet()
+        self.styles.add(ParagraphStyle(name='Header', fontSize=18, spaceAfter=20, alignment=1,
+                                       textColor=colors.HexColor(accent)))
+        self.styles.add(ParagraphStyle(name='SubSection', fontSize=14, spaceBefore=15, spaceAfter=10,
+                                       textColor=colors.HexColor(accent)))
+        self.header_style = self.styles['Header']
+        self.subsection_style = self.styles['SubSection']
+        self.normal_style = self.styles['Normal']
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(accent)),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(table_body)),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ])
+        self.accent = accent
+
+        # Fixed headings are parsed once; each render gets a shallow copy so layout
+        # state (wrap/split) is never shared between concurrent builds
+        self._headings = {
+            'title': Paragraph("AI Resume Analysis Report", self.header_style),
+            'skills': Paragraph("Skill Analysis:", self.subsection_style),
+            'ats': Paragraph("ATS Friendliness Feedback:", self.subsection_style),
+            'suggestions': Paragraph("Improvement Suggestions:", self.subsection_style),
+        }
+
+    def _heading(self, name):
+        return copy.copy(self._headings[name])
+
+    @staticmethod
+    def _ats_color(ats_score):
+        return '#10B981' if ats_score >= 70 else '#F59E0B' if ats_score >= 40 else '#EF4444'
+
+    def _bullets(self, items):
+        elements = []
+        for item in items:
+            elements.append(Paragraph(f"• {item}", self.normal_style))
+            elements.append(Spacer(1, 6))
+        return elements
+
+    def build_elements(self, resume_name, match_score, matched_skills, missing_skills, suggestions,
+                       ats_score=None, ats_findings=None):
+        """Flowables for one report"""
+        matched_skills = matched_skills or []
+        missing_skills = missing_skills or []
+
+        elements = [
+            self._heading('title'),
+            Paragraph(f"Candidate: {resume_name}", self.normal_style),
+            Spacer(1, 12),
+            Paragraph(f"Match Score: <font color='{self.accent}'><b>{match_score}%</b></font>", self.subsection_style),
+        ]
+        if ats_score is not None:
+            elements.append(Paragraph(
+                f"ATS Friendliness Score: <font color='{self._ats_color(ats_score)}'><b>{ats_score}%</b></font>",
+                self.subsection_style))
+        elements.append(Spacer(1, 12))
+
+        # Skills table
+        elements.append(self._heading('skills'))
+        rows = max(len(matched_skills), len(missing_skills))
+        data = [['Matched Skills', 'Missing Skills']]
+        data += [[matched_skills[i] if i < len(matched_skills) else "",
+                  missing_skills[i] if i < len(missing_skills) else ""] for i in range(rows)]
+        if not rows:
+            data.append(["None", "None"])
+        table = Table(data, colWidths=self.SKILL_COLUMN_WIDTHS)
+        table.setStyle(self.table_style)
+        elements += [table, Spacer(1, 20)]
+
+        # ATS Findings
+        if ats_findings:
+            elements.append(self._heading('ats'))
+            elements += self._bullets(ats_findings)
+            elements.append(Spacer(1, 12))
+
+        # Suggestions
+        elements.append(self._heading('suggestions'))
+        elements += self._bullets(suggestions or [])
+        return elements
+
+    def render(self, resume_name, match_score, matched_skills, missing_skills, suggestions,
+               ats_score=None, ats_findings=None):
+        """
+        Renders one report.
+
+        Returns:
+            io.BytesIO: PDF positioned at the start
+        """
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, **self.PAGE_OPTIONS)
+        doc.build(self.build_elements(resume_name, match_score, matched_skills, missing_skills, suggestions,
+                                      ats_score=ats_score, ats_findings=ats_findings))
+        buffer.seek(0)
+        return buffer
+
+    def render_batch(self, reports):
+        """
+        Renders many reports with the shared styles.
+
+        Args:
+            reports: Iterable of keyword dicts accepted by render()
+
+        Yields:
+            bytes: One PDF per report, in input order
+        """
+        for report in reports:
+            yield self.render(**report).getvalue()
+
+
+_engine = None
+
+
+def get_report_engine():
+    """The process-wide ReportEngine, created on first use"""
+    global _engine
+    if _engine is None:
+        _engine = ReportEngine()
+    return _engine
@@ -0,0 +1,180 @@
+"""
+Semantic Matching - Latent semantic (LSA) embeddings and approximate nearest-neighbour search
+Trained offline on the stored corpus; no external model downloads required
+"""
+
+import os
+import pickle
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+
+class LSAEmbedder:
+    """TF-IDF + TruncatedSVD embedding that maps related vocabulary onto shared directions"""
+
+    DEFAULT_COMPONENTS = 128
+
+    def __init__(self, n_components=DEFAULT_COMPONENTS, random_state=42):
+        self.n_components = n_components
+        self.random_state = random_state
+        self.vectorizer = None
+        self.svd = None
+
+    @property
+    def dim(self):
+        return self.svd.n_components if self.svd is not None else self.n_components
+
+    def fit(self, documents):
+        """
+        Fits the embedding on a corpus of resumes and job descriptions.
+
+        Args:
+            documents: List of text strings
+
+        Returns:
+            LSAEmbedder: self
+        """
+        # Frequency pruning only makes sense once the corpus has some size
+        min_df, max_df = (2, 0.9) if len(documents) >= 20 else (1, 1.0)
+        self.vectorizer = TfidfVectorizer(sublinear_tf=True, stop_words='english', min_df=min_df, max_df=max_df)
+        tfidf = self.vectorizer.fit_transform(documents)
+        # SVD rank cannot exceed the smaller matrix dimension
+        n_components = max(1, min(self.n_components, tfidf.shape[0] - 1, tfidf.shape[1] - 1))
+        self.svd = TruncatedSVD(n_components=n_components, random_state=self.random_state)
+        self.svd.fit(tfidf)
+        return self
+
+    def transform(self, documents):
+        """
+        Embeds documents into the latent space.
+
+        Returns:
+            np.ndarray: L2-normalized float32 array of shape (n_docs, dim)
+        """
+        tfidf = self.vectorizer.transform([doc or "" for doc in documents])
+        embeddings = self.svd.transform(tfidf).astype(np.float32)
+        return normalize(embeddings, norm='l2', copy=False)
+
+    def embed(self, text):
+        """Embeds a single document"""
+        return self.transform([text])[0]
+
+    def save(self, path):
+        """Persists the fitted model"""
+        with open(path, 'wb') as f:
+            pickle.dump({'vectorizer': self.vectorizer, 'svd': self.svd,
+                         'random_state': self.random_state}, f)
+
+    @classmethod
+    def load(cls, path):
+        """Restores a model saved with save()"""
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        embedder = cls(n_components=state['svd'].n_components, random_state=state['random_state'])
+        embedder.vectorizer = state['vectorizer']
+        embedder.svd = state['svd']
+        return embedder
+
+    @staticmethod
+    def to_bytes(vector):
+        """Serializes an embedding for a LargeBinary column"""
+        return np.asarray(vector, dtype=np.float32).tobytes()
+
+    @staticmethod
+    def from_bytes(blob):
+        """Deserializes an embedding stored with to_bytes()"""
+        return np.frombuffer(blob, dtype=np.float32)
+
+
+class RandomProjectionLSH:
+    """
+    Approximate nearest-neighbour index over unit vectors.
+    Each table hashes a vector to the sign pattern of n_bits random hyperplanes;
+    candidates from matching buckets are re-ranked by exact cosine similarity.
+    """
+
+    def __init__(self, dim, n_tables=8, n_bits=10, seed=13):
+        self.dim = dim
+        self.n_bits = n_bits
+        rng = np.random.default_rng(seed)
+        self.hyperplanes = rng.standard_normal((n_tables, n_bits, dim)).astype(np.float32)
+        self._powers = 1 << np.arange(n_bits, dtype=np.int64)
+        self.tables = [{} for _ in range(n_tables)]
+        self.ids = []
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _hash(self, vectors):
+        """Bucket keys with shape (n_vectors, n_tables)"""
+        bits = np.einsum('tbd,nd->ntb', self.hyperplanes, vectors) > 0
+        return bits.astype(np.int64) @ self._powers
+
+    def add(self, ids, vectors):
+        """
+        Adds vectors to the index.
+
+        Args:
+            ids: Item identifiers (e.g. resume or job ids)
+            vectors: Array of shape (n, dim)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        offset = len(self.ids)
+        keys = self._hash(vectors)
+        for row, item_keys in enumerate(keys):
+            for table, key in zip(self.tables, item_keys):
+                table.setdefault(int(key), []).append(offset + row)
+        self.ids.extend(ids)
+        self._vectors = np.vstack([self._vectors, vectors])
+
+    def query(self, vector, k=10, probe_neighbours=True):
+        """
+        Finds approximate nearest neighbours by cosine similarity.
+
+        Args:
+            vector: Query embedding
+            k: Number of results
+            probe_neighbours: Also probe buckets one bit away (better recall)
+
+        Returns:
+            list: (id, similarity) tuples, best first
+        """
+        if not self.ids:
+            return []
+        vector = np.asarray(vector, dtype=np.float32).reshape(1, self.dim)
+        candidates = set()
+        for table, key in zip(self.tables, self._hash(vector)[0]):
+            key = int(key)
+            candidates.update(table.get(key, ()))
+            if probe_neighbours:
+                for power in self._powers:
+                    candidates.update(table.get(key ^ int(power), ()))
+        if not candidates:
+            return []
+        rows = np.fromiter(candidates, dtype=np.int64)
+        scores = self._vectors[rows] @ vector[0]
+        best = np.argsort(-scores)[:k]
+        return [(self.ids[rows[i]], float(scores[i])) for i in best]
+
+
+_embedder_cache = {}
+
+
+def load_shared_embedder(path):
+    """
+    Loads the trained LSA model once per process, reloading if the file changes.
+
+    Returns:
+        LSAEmbedder or None if no model has been trained yet
+    """
+    if not path or not os.path.exists(path):
+        return None
+    mtime = os.path.getmtime(path)
+    cached = _embedder_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, LSAEmbedder.load(path))
+        _embedder_cache[path] = cached
+    return cached[1]
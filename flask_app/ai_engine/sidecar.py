@@ -0,0 +1,455 @@
+"""
+Engine Sidecar - One process per host serving parsing, NLP and matching over a Unix socket
+Web workers delegate to it through EngineClient so spaCy and the matcher state load once
+"""
+
+import io
+import os
+import json
+import time
+import queue
+import base64
+import itertools
+import signal
+import socket
+import struct
+import tempfile
+import threading
+import socketserver
+from concurrent.futures import Future
+
+try:
+    import msgpack
+except ImportError:  # JSON framing is used instead
+    msgpack = None
+
+# Workers delegate to the sidecar listening here when this variable is set
+ENV_VAR = 'AI_ENGINE_SOCKET'
+DEFAULT_SOCKET_PATH = os.path.join(tempfile.gettempdir(), 'resume-engine.sock')
+
+_HEADER = struct.Struct('!I')
+MAX_FRAME = 64 * 1024 * 1024
+CODEC_MSGPACK = b'M'
+CODEC_JSON = b'J'
+DEFAULT_CODEC = CODEC_MSGPACK if msgpack is not None else CODEC_JSON
+
+
+# Set on the sidecar's own threads, whose work must never be delegated back to it
+_serving = threading.local()
+
+
+class EngineUnavailable(ConnectionError):
+    """The sidecar could not be reached; callers fall back to in-process work"""
+
+
+class EngineError(RuntimeError):
+    """The sidecar ran the request and it failed; error_type names the exception raised there"""
+
+    def __init__(self, message, error_type=None):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+# Framing: 4-byte big-endian length, then a codec byte and the encoded message
+
+def _json_default(value):
+    if isinstance(value, (bytes, bytearray)):
+        return {'__bytes__': base64.b64encode(value).decode('ascii')}
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def _json_object_hook(value):
+    if len(value) == 1 and '__bytes__' in value:
+        return base64.b64decode(value['__bytes__'])
+    return value
+
+
+def encode_message(message, codec=DEFAULT_CODEC):
+    if codec == CODEC_MSGPACK:
+        payload = msgpack.packb(message, use_bin_type=True)
+    else:
+        payload = json.dumps(message, default=_json_default).encode('utf-8')
+    return _HEADER.pack(len(payload) + 1) + codec + payload
+
+
+def _recv_exactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise EOFError("connection closed")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def read_message(sock):
+    """
+    Reads one framed message.
+
+    Returns:
+        tuple: (message, codec)
+    """
+    (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    if not 0 < size <= MAX_FRAME:
+        raise ValueError(f"Invalid frame size {size}")
+    frame = _recv_exactly(sock, size)
+    codec, payload = frame[:1], frame[1:]
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack frame received but msgpack is not installed")
+        return msgpack.unpackb(payload, raw=False), codec
+    if codec == CODEC_JSON:
+        return json.loads(payload.decode('utf-8'), object_hook=_json_object_hook), codec
+    raise ValueError(f"Unknown codec {codec!r}")
+
+
+class RequestBatcher:
+    """
+    Collects single requests from concurrent connections and runs them together.
+    A batch closes when it reaches max_batch items or max_wait seconds after its
+    first item, so a lone request waits at most max_wait.
+    """
+
+    def __init__(self, handler, max_batch=32, max_wait=0.005, name='engine-batcher'):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """Queue one item; returns a Future resolved with its result"""
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        _serving.active = True
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    self._queue.put(None)
+                    break
+                batch.append(entry)
+
+            items = [item for item, _ in batch]
+            try:
+                results = self.handler(items)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Serves framed requests on one connection until the client disconnects"""
+
+    def handle(self):
+        _serving.active = True
+        while True:
+            try:
+                request, codec = read_message(self.request)
+            except (EOFError, ConnectionError):
+                return
+            except ValueError as e:
+                self.request.sendall(encode_message({'id': None, 'error': {'type': 'ValueError', 'message': str(e)}},
+                                                    CODEC_JSON))
+                return
+
+            response = {'id': request.get('id')}
+            method = self.server.methods.get(request.get('method'))
+            if method is None:
+                response['error'] = {'type': 'KeyError', 'message': f"Unknown method {request.get('method')!r}"}
+            else:
+                try:
+                    response['result'] = method(*request.get('args', ()), **request.get('kwargs', {}))
+                except Exception as e:
+                    response['error'] = {'type': e.__class__.__name__, 'message': str(e)}
+            self.request.sendall(encode_message(response, codec))
+
+
+class EngineServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Hosts ResumeParser, NLPProcessor and ResumeMatcher for every worker on the host.
+
+    Lemmatization requests are batched through spaCy's nlp.pipe, and analyze_match
+    requests are batched into ResumeMatcher.analyze_batch (grouped by matcher
+    options), so concurrent workers share vectorized passes. The hashing IDF,
+    LSA embedder and skill co-occurrence matrix are loaded here from the same
+    paths the web app uses; workers only say whether to apply them.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, idf_path=None, lsa_model_path=None, cooccurrence_path=None,
+                 max_batch=32, max_wait=0.005, upload_root=None):
+        # Work requested of this process must never be delegated back to the sidecar
+        os.environ.pop(ENV_VAR, None)
+        reset_engine_client()
+
+        from flask_app.ai_engine.core import ResumeParser, NLPProcessor, ResumeMatcher
+        self.parser = ResumeParser
+        self.nlp = NLPProcessor
+        self.matcher = ResumeMatcher
+        self.idf_path = idf_path
+        self.lsa_model_path = lsa_model_path
+        self.cooccurrence_path = cooccurrence_path
+        self.upload_root = os.path.realpath(upload_root) if upload_root else None
+
+        self.preprocess_batcher = RequestBatcher(NLPProcessor.preprocess_texts, max_batch, max_wait,
+                                                 name='engine-preprocess')
+        self.match_batcher = RequestBatcher(self._analyze_pairs, max_batch, max_wait, name='engine-match')
+        self.methods = {
+            'ping': lambda: 'pong',
+            'extract_text_from_pdf': self.extract_text_from_pdf,
+            'preprocess_text': lambda text: self.preprocess_batcher.submit(text).result(),
+            'preprocess_texts': self.preprocess_texts,
+            'extract_skills': NLPProcessor.extract_skills,
+            'check_ats_friendliness': NLPProcessor.check_ats_friendliness,
+            'analyze_match': self.analyze_match,
+            'analyze_batch': self.analyze_batch,
+        }
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o660)
+
+    def server_close(self):
+        super().server_close()
+        self.preprocess_batcher.close()
+        self.match_batcher.close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+    def warm_up(self):
+        """Loads the spaCy model before the first request"""
+        self.nlp.preprocess_text("warm up")
+
+    def extract_text_from_pdf(self, source):
+        # Workers send a path under the shared upload root, or else the file's bytes
+        if isinstance(source, str):
+            path = os.path.realpath(source)
+            if self.upload_root is None or os.path.commonpath([path, self.upload_root]) != self.upload_root:
+                raise PermissionError(f"{source} is not under the engine's upload root; send the file's bytes")
+            with open(path, 'rb') as f:
+                return self.parser.extract_text_from_pdf(f)
+        if not isinstance(source, (bytes, bytearray)):
+            raise TypeError("extract_text_from_pdf takes a path under the upload root or the file's bytes")
+        return self.parser.extract_text_from_pdf(io.BytesIO(source))
+
+    def preprocess_texts(self, texts):
+        futures = [self.preprocess_batcher.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def matcher_options(self, feature_mode='tfidf', idf=False, embedder=False, cooccurrence=False):
+        """Resolve the option flags sent by a worker into analyze_match keyword arguments"""
+        from flask_app.ai_engine.features import load_shared_idf
+        from flask_app.ai_engine.semantic import load_shared_embedder
+        from flask_app.ai_engine.cooccurrence import load_shared_cooccurrence
+        return {
+            'feature_mode': feature_mode,
+            'idf': load_shared_idf(self.idf_path) if idf else None,
+            'embedder': load_shared_embedder(self.lsa_model_path) if embedder else None,
+            'cooccurrence': load_shared_cooccurrence(self.cooccurrence_path) if cooccurrence else None,
+        }
+
+    def _analyze_pairs(self, items):
+        """Batch handler: items are (resume_text, jd_text, resume_skills, jd_skills, options)"""
+        results = [None] * len(items)
+        groups = {}
+        for position, item in enumerate(items):
+            groups.setdefault(json.dumps(item[4], sort_keys=True), []).append(position)
+        for positions in groups.values():
+            options = self.matcher_options(**items[positions[0]][4])
+            batch = self.matcher.analyze_batch([items[p][0] for p in positions], [items[p][1] for p in positions],
+                                               [items[p][2] for p in positions], [items[p][3] for p in positions],
+                                               **options)
+            for position, result in zip(positions, batch):
+                result.pop('resume_index', None)
+                result.pop('jd_index', None)
+                results[position] = result
+        return results
+
+    def analyze_match(self, resume_text, jd_text, resume_skills, jd_skills, options=None):
+        return self.match_batcher.submit((resume_text, jd_text, resume_skills, jd_skills, options or {})).result()
+
+    def analyze_batch(self, resume_texts, jd_texts, resume_skills=None, jd_skills=None, cross_product=False,
+                      options=None):
+        return list(self.matcher.analyze_batch(resume_texts, jd_texts, resume_skills, jd_skills,
+                                               cross_product=cross_product, **self.matcher_options(**(options or {}))))
+
+
+class EngineClient:
+    """
+    Thin client for the engine sidecar. Each thread (and each forked worker)
+    keeps its own connection. After a failed connection, calls fail fast with
+    EngineUnavailable for retry_after seconds instead of reconnecting every time.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, timeout=60.0, retry_after=5.0, codec=DEFAULT_CODEC):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.codec = codec
+        self._local = threading.local()
+        self._down_until = 0.0
+        self._ids = itertools.count(1)
+
+    def _pooled(self):
+        """This thread's open connection, or None"""
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None and self._local.pid == os.getpid():
+            return sock
+        return None
+
+    def _connection(self):
+        sock = self._pooled()
+        if sock is not None:
+            return sock
+        if time.monotonic() < self._down_until:
+            raise EngineUnavailable(f"Engine sidecar at {self.socket_path} is unavailable")
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        except OSError as e:
+            self._down_until = time.monotonic() + self.retry_after
+            raise EngineUnavailable(f"Cannot connect to engine sidecar at {self.socket_path}: {e}") from e
+        self._local.sock, self._local.pid = sock, os.getpid()
+        return sock
+
+    def _disconnect(self):
+        sock = getattr(self._local, 'sock', None)
+        self._local.sock = None
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def call(self, method, *args, **kwargs):
+        """
+        Runs a method on the sidecar.
+
+        Raises:
+            EngineUnavailable: The sidecar could not be reached
+            EngineError: The method raised on the sidecar
+        """
+        frame = encode_message({'id': next(self._ids), 'method': method, 'args': list(args), 'kwargs': kwargs},
+                               self.codec)
+        for attempt in range(2):
+            reused = self._pooled() is not None
+            sock = self._connection()
+            try:
+                sock.sendall(frame)
+                response, _ = read_message(sock)
+                break
+            except socket.timeout as e:
+                # The sidecar may still be running the request; sending it again would run it twice
+                self._disconnect()
+                self._down_until = time.monotonic() + self.retry_after
+                raise EngineUnavailable(f"Engine sidecar at {self.socket_path} did not answer within "
+                                        f"{self.timeout}s") from e
+            except (OSError, EOFError) as e:
+                self._disconnect()
+                # A pooled connection may have been closed by a sidecar restart; retry once on a fresh one
+                if reused and not attempt and isinstance(e, (BrokenPipeError, ConnectionResetError, EOFError)):
+                    continue
+                self._down_until = time.monotonic() + self.retry_after
+                raise EngineUnavailable(f"Engine sidecar at {self.socket_path} dropped the connection: {e}") from e
+
+        if 'error' in response:
+            raise EngineError(f"{response['error']['type']}: {response['error']['message']}", response['error']['type'])
+        return response['result']
+
+    def close(self):
+        self._disconnect()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+# Returned by delegate() when the call should run in-process
+NOT_DELEGATED = object()
+
+
+def get_engine_client():
+    """The process-wide client, or None unless AI_ENGINE_SOCKET is set"""
+    global _client
+    socket_path = os.environ.get(ENV_VAR)
+    if not socket_path:
+        return None
+    if _client is None or _client.socket_path != socket_path:
+        with _client_lock:
+            if _client is None or _client.socket_path != socket_path:
+                _client = EngineClient(socket_path)
+    return _client
+
+
+def reset_engine_client():
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+def delegate(method, *args, **kwargs):
+    """
+    Runs a facade method on the sidecar when one is configured and reachable.
+
+    Returns:
+        The sidecar's result, or NOT_DELEGATED to run the method in-process
+    """
+    client = get_engine_client()
+    if client is None or getattr(_serving, 'active', False):
+        return NOT_DELEGATED
+    try:
+        return client.call(method, *args, **kwargs)
+    except EngineUnavailable:
+        return NOT_DELEGATED
+    except EngineError as e:
+        # The sidecar cannot open a file this process can (outside its upload root or not mounted there)
+        if e.error_type in ('FileNotFoundError', 'PermissionError'):
+            return NOT_DELEGATED
+        raise
+
+
+def serve(socket_path=DEFAULT_SOCKET_PATH, **options):
+    """Runs the sidecar until interrupted"""
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    # Process managers stop the sidecar with SIGTERM; exit as on Ctrl+C so the socket is removed
+    signal.signal(signal.SIGTERM, stop)
+    server = EngineServer(socket_path, **options)
+    server.warm_up()
+    print(f"Engine sidecar listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -9,6 +9,24 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_RECORD_QUERIES = True
+    # Apply pending schema migrations at startup; set false to run migrate_db.py as a deploy step
+    AUTO_MIGRATE = os.environ.get('AUTO_MIGRATE', 'true').lower() == 'true'
+    
+    # SQLite files: WAL, these pragmas on connect and separate read/write pools (see flask_app/database.py)
+    SQLITE_TUNING = os.environ.get('SQLITE_TUNING', 'true').lower() == 'true'
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',  # durable across crashes in WAL mode, fsync at checkpoints only
+        'cache_size': -64000,  # KiB per connection
+        'mmap_size': 256 * 1024 * 1024,
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', '15000')),  # ms to wait for another writer
+    }
+    SQLITE_WRITE_POOL_SIZE = int(os.environ.get('SQLITE_WRITE_POOL_SIZE', '1'))  # per worker process
+    SQLITE_READ_POOL_SIZE = int(os.environ.get('SQLITE_READ_POOL_SIZE', '4'))  # 0 reads on the write pool
+    # PostgreSQL (DATABASE_URL=postgresql://...): psycopg 3 connections pooled per worker process
+    POSTGRES_POOL_SIZE = int(os.environ.get('POSTGRES_POOL_SIZE', '5'))
+    POSTGRES_MAX_OVERFLOW = int(os.environ.get('POSTGRES_MAX_OVERFLOW', '10'))
+    POSTGRES_POOL_RECYCLE = 1800  # seconds
     
     # File upload settings
     UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'uploads')
@@ -20,12 +38,46 @@ class Config:
     SESSION_COOKIE_SECURE = True
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
+    # The JSON API is CSRF-exempt, so no auth cookie may ride along on cross-site POSTs
+    REMEMBER_COOKIE_SAMESITE = 'Lax'
     
     # WTForms
     WTF_CSRF_TIME_LIMIT = None
     
     # Admin registration
     ADMIN_SECRET_CODE = os.environ.get('ADMIN_SECRET_CODE') or 'admin2026'
+    
+    # Matching engine: 'tfidf' (fitted vocabulary) or 'hashing' (stateless, constant memory)
+    MATCHER_FEATURE_MODE = os.environ.get('MATCHER_FEATURE_MODE') or 'tfidf'
+    HASHING_IDF_PATH = os.path.join(os.path.dirname(__file__), '..', 'instance', 'hashing_idf.npz')
+    
+    # Semantic (LSA) similarity as a third hybrid score component; train with train_embeddings.py
+    SEMANTIC_MATCHING = os.environ.get('SEMANTIC_MATCHING', 'false').lower() == 'true'
+    LSA_MODEL_PATH = os.path.join(os.path.dirname(__file__), '..', 'instance', 'lsa_model.pkl')
+    
+    # Partial skill credit from corpus co-occurrence; build with build_skill_cooccurrence.py
+    SKILL_PARTIAL_CREDIT = os.environ.get('SKILL_PARTIAL_CREDIT', 'false').lower() == 'true'
+    SKILL_COOCCURRENCE_PATH = os.path.join(os.path.dirname(__file__), '..', 'instance', 'skill_cooccurrence')
+    
+    # Rendered PDF reports, cached per analysis version and rendered right after analysis
+    REPORT_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'instance', 'report_cache')
+    REPORT_EAGER_RENDER = True
+    REPORT_EXPORT_WORKERS = int(os.environ.get('REPORT_EXPORT_WORKERS', '0')) or None  # default: CPU count
+    
+    # Admin dashboard: site totals cached in a file shared by the workers, users listed per page
+    ADMIN_STATS_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', 'instance', 'admin_stats.json')
+    ADMIN_STATS_TTL = int(os.environ.get('ADMIN_STATS_TTL', '60'))  # seconds, 0 disables the cache
+    ADMIN_USERS_PER_PAGE = 50
+    
+    # Items accepted per /api/v1 bulk request
+    API_BULK_LIMIT = int(os.environ.get('API_BULK_LIMIT', '100'))
+    
+    # Engine sidecar (run_engine.py); workers delegate to it when AI_ENGINE_SOCKET is set
+    AI_ENGINE_MAX_BATCH = int(os.environ.get('AI_ENGINE_MAX_BATCH', '32'))
+    AI_ENGINE_MAX_WAIT = float(os.environ.get('AI_ENGINE_MAX_WAIT', '0.005'))  # seconds a batch waits to fill
+    
+    # Resumes whose estimated shingle Jaccard similarity reaches this are flagged as near-duplicates
+    RESUME_DUPLICATE_THRESHOLD = float(os.environ.get('RESUME_DUPLICATE_THRESHOLD', '0.8'))
 
 
 class DevelopmentConfig(Config):
@@ -44,6 +96,8 @@ class TestingConfig(Config):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    REPORT_EAGER_RENDER = False
+    ADMIN_STATS_TTL = 0
 
 
 class ProductionConfig(Config):
@@ -0,0 +1,124 @@
+"""
+Near-duplicate resume detection using MinHash signatures and an LSH band table
+"""
+
+import hashlib
+from flask import current_app
+from sqlalchemy.orm import undefer
+from flask_app import db
+from flask_app.models import Resume, ResumeLSHBand, Analysis
+from flask_app.ai_engine.core import ResumeMatcher
+from flask_app.ai_engine.minhash import MinHasher, LSHBands
+
+_hasher = MinHasher()
+_banding = LSHBands(_hasher.num_perm)
+
+
+def file_sha256(filepath):
+    """Hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def resume_signature(text):
+    """MinHash signature of resume text"""
+    return _hasher.signature(text)
+
+
+def find_exact_duplicate(user_id, content_hash):
+    """
+    Find an earlier upload of the same file by the same user.
+
+    Returns:
+        Resume or None
+    """
+    return Resume.query.filter_by(user_id=user_id, content_hash=content_hash) \
+        .filter(Resume.text_record.has()) \
+        .order_by(Resume.created_at).first()
+
+
+def find_near_duplicate(user_id, signature, exclude_id=None):
+    """
+    Find the user's most similar earlier resume via the LSH band table.
+    Only resumes sharing at least one band key are compared, so the cost
+    does not grow with the number of stored resumes.
+
+    Args:
+        user_id: Owner of the resumes to search
+        signature: MinHash signature of the new resume
+        exclude_id: Resume to leave out (e.g. the resume itself)
+
+    Returns:
+        tuple: (Resume, estimated Jaccard similarity) or (None, 0.0)
+    """
+    threshold = current_app.config.get('RESUME_DUPLICATE_THRESHOLD', 0.8)
+    query = db.session.query(ResumeLSHBand.resume_id).distinct().filter(
+        ResumeLSHBand.user_id == user_id,
+        ResumeLSHBand.band_key.in_(_banding.keys(signature))
+    )
+    if exclude_id:
+        query = query.filter(ResumeLSHBand.resume_id != exclude_id)
+    candidate_ids = [row.resume_id for row in query]
+    if not candidate_ids:
+        return None, 0.0
+
+    best, best_similarity = None, 0.0
+    candidates = Resume.query.filter(Resume.id.in_(candidate_ids), Resume.minhash.isnot(None)) \
+        .options(undefer(Resume.minhash)).order_by(Resume.created_at)
+    for candidate in candidates:
+        similarity = MinHasher.jaccard(signature, MinHasher.from_bytes(candidate.minhash))
+        if similarity > best_similarity:
+            best, best_similarity = candidate, similarity
+
+    if best is None or best_similarity < threshold:
+        return None, 0.0
+    return best, best_similarity
+
+
+def index_resume(resume, signature):
+    """Store a resume's signature and its band keys (call before commit)"""
+    resume.minhash = MinHasher.to_bytes(signature)
+    resume.lsh_bands = [ResumeLSHBand(user_id=resume.user_id, band_key=key)
+                        for key in set(_banding.keys(signature))]
+
+
+def reusable_analysis(resume, jd_text):
+    """
+    Find a stored analysis that would be identical to analyzing this resume
+    against jd_text: same job description, the same extracted resume text and
+    the current engine version.
+
+    Returns:
+        Analysis or None
+    """
+    return Analysis.query.filter(Analysis.resume_id.in_(_same_text_resume_ids(resume)),
+                                 Analysis.job_description == jd_text,
+                                 Analysis.engine_version == ResumeMatcher.ENGINE_VERSION) \
+        .order_by(Analysis.created_at.desc()).first()
+
+
+def reusable_analyses(resume, jd_texts):
+    """
+    reusable_analysis for many job descriptions with a single query.
+
+    Returns:
+        dict: {job description: latest matching Analysis}
+    """
+    if not jd_texts:
+        return {}
+    analyses = Analysis.query.filter(Analysis.resume_id.in_(_same_text_resume_ids(resume)),
+                                     Analysis.job_description.in_(set(jd_texts)),
+                                     Analysis.engine_version == ResumeMatcher.ENGINE_VERSION) \
+        .order_by(Analysis.created_at)
+    # Later rows overwrite earlier ones, leaving the latest per description
+    return {analysis.job_description: analysis for analysis in analyses}
+
+
+def _same_text_resume_ids(resume):
+    resume_ids = [resume.id]
+    if resume.duplicate_of and resume.duplicate_of.extracted_text == resume.extracted_text:
+        resume_ids.append(resume.duplicate_of_id)
+    return resume_ids
@@ -0,0 +1,72 @@
+"""
+Primary and foreign key type for the flask_app models
+
+Ids are UUIDs whose first 48 bits are a millisecond timestamp (UUIDv7 layout),
+so new rows land at the right edge of every primary key and foreign key index
+instead of at random pages. Python code and URLs always see the 36-character
+string; with DB_KEY_FORMAT=binary the database stores the 16 raw bytes instead,
+which more than halves the size of every key, index entry and join column.
+Convert an existing database with convert_keys.py before switching.
+"""
+
+import os
+import time
+import uuid
+import sqlalchemy as sa
+
+# 'string' (36-character text) or 'binary' (16 bytes)
+KEY_FORMAT = os.environ.get('DB_KEY_FORMAT', 'string').lower()
+
+
+def new_id():
+    """A time-ordered UUID string"""
+    timestamp = time.time_ns() // 1_000_000
+    value = (timestamp & 0xFFFFFFFFFFFF) << 80 | int.from_bytes(os.urandom(10), 'big')
+    # Version 7 and RFC 4122 variant bits
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return str(uuid.UUID(int=value))
+
+
+def key_bytes(value):
+    """16-byte form of an id string, or None if it is not a UUID"""
+    # Every bound key and loaded row goes through these two, so they avoid
+    # building uuid.UUID objects
+    if not isinstance(value, str) or len(value) != 36 or value[8:24:5] != '----':
+        return None
+    try:
+        return bytes.fromhex(value.replace('-', ''))
+    except ValueError:
+        return None
+
+
+def key_string(value):
+    """Id string of a stored key, which may be either form"""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        h = bytes(value).hex()
+        return f'{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}'
+    return value
+
+
+class UUIDKey(sa.types.TypeDecorator):
+    """UUID key stored as text or as 16 bytes, always a string in Python"""
+    impl = sa.String(36)
+    cache_ok = True
+
+    def __init__(self, binary=None):
+        super().__init__()
+        self.binary = KEY_FORMAT == 'binary' if binary is None else binary
+
+    def load_dialect_impl(self, dialect):
+        if self.binary:
+            return dialect.type_descriptor(sa.LargeBinary(16))
+        return dialect.type_descriptor(sa.String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not self.binary:
+            return value
+        # A malformed id becomes NULL, which matches no row
+        return key_bytes(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else key_string(value)
@@ -0,0 +1,347 @@
+"""
+Versioned schema migrations
+
+Migrations are functions of a SQLAlchemy connection registered in order with
+@migration; one may return a summary line, which is logged. upgrade() applies
+the ones newer than the highest version in the schema_migrations table, each in
+its own transaction together with its version row. Databases built by the old
+create_all()/migrate_db.py path are upgraded in place, so every step checks the
+schema before it changes it.
+
+The runner (migration, upgrade and the schema helpers) is repeated in
+flask_job_portal/app/migrations.py, which the separately deployed job portal
+uses for its own tables; fixes to it apply to both.
+"""
+
+import json
+import logging
+from datetime import datetime
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from flask_app import db
+from flask_app.models import User, Resume, ResumeText, Analysis, JobPosting, Skill, UserStats, resume_skill, job_skill
+from flask_app.ai_engine.core import NLPProcessor, ResumeMatcher
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS = []
+
+schema_migrations = sa.Table(
+    'schema_migrations', sa.MetaData(),
+    sa.Column('version', sa.Integer, primary_key=True),
+    sa.Column('name', sa.String(255), nullable=False),
+    sa.Column('applied_at', sa.DateTime, nullable=False)
+)
+
+
+class _AppliedElsewhere(Exception):
+    """The version row already exists: another process applied the migration"""
+    pass
+
+
+def migration(version, name):
+    """Register a migration; versions must be added in increasing order"""
+    def register(func):
+        assert not MIGRATIONS or MIGRATIONS[-1][0] < version, f'Migration {version} is out of order'
+        MIGRATIONS.append((version, name, func))
+        return func
+    return register
+
+
+def current_version(conn):
+    """Highest applied migration, 0 for an unversioned database"""
+    if not sa.inspect(conn).has_table(schema_migrations.name):
+        return 0
+    return conn.execute(sa.select(sa.func.max(schema_migrations.c.version))).scalar() or 0
+
+
+def latest_version():
+    """Version of the newest registered migration"""
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def upgrade(engine=None, target=None):
+    """
+    Apply pending migrations up to `target` (default: all).
+
+    Returns:
+        list: Versions applied by this call
+    """
+    engine = engine or db.engine
+    with engine.begin() as conn:
+        schema_migrations.create(conn, checkfirst=True)
+        version = current_version(conn)
+
+    applied = []
+    for number, name, apply in MIGRATIONS:
+        if number <= version or (target is not None and number > target):
+            continue
+        try:
+            with engine.begin() as conn:
+                summary = apply(conn)
+                try:
+                    conn.execute(schema_migrations.insert().values(
+                        version=number, name=name, applied_at=datetime.utcnow()))
+                except sa.exc.IntegrityError:
+                    raise _AppliedElsewhere()
+        except _AppliedElsewhere:
+            # Another worker started at the same time and recorded this version first
+            continue
+        applied.append(number)
+        logger.info('Applied migration %s (%s)%s', number, name, f': {summary}' if summary else '')
+    return applied
+
+
+def has_column(conn, table, column):
+    return column in {col['name'] for col in sa.inspect(conn).get_columns(table)}
+
+
+def add_column(conn, table, column, col_type):
+    """Add a column unless it exists. Returns True if it was added"""
+    if has_column(conn, table, column):
+        return False
+    conn.exec_driver_sql(f'ALTER TABLE {table} ADD COLUMN {column} {col_type}')
+    return True
+
+
+def create_indexes(conn, model, *names):
+    """Create indexes declared in a model's __table_args__ unless they exist"""
+    indexes = {index.name: index for index in model.__table__.indexes}
+    for name in names:
+        indexes[name].create(conn, checkfirst=True)
+
+
+@migration(1, 'baseline schema')
+def _baseline(conn):
+    db.metadata.create_all(conn)
+    # Columns migrate_db.py used to add to databases created before them
+    for table, column, col_type in [
+        ('analyses', 'interview_questions', 'TEXT'),
+        ('analyses', 'skill_resources', 'TEXT'),
+        ('resumes', 'embedding', 'BLOB'),
+        ('job_postings', 'embedding', 'BLOB'),
+        ('resumes', 'content_hash', 'VARCHAR(64)'),
+        ('resumes', 'minhash', 'BLOB'),
+        ('resumes', 'duplicate_of_id', 'VARCHAR(36) REFERENCES resumes(id)'),
+        ('resumes', 'duplicate_similarity', 'FLOAT'),
+    ]:
+        add_column(conn, table, column, col_type)
+    create_indexes(conn, Resume, 'ix_resumes_content_hash')
+
+
+@migration(2, 'composite indexes for route queries')
+def _route_indexes(conn):
+    create_indexes(conn, Resume, 'ix_resumes_user_id_created_at')
+    create_indexes(conn, Analysis, 'ix_analyses_user_id_created_at', 'ix_analyses_resume_id',
+                   'ix_analyses_job_id_match_score')
+    create_indexes(conn, JobPosting, 'ix_job_postings_posted_by_created_at')
+
+
+@migration(3, 'move resume text to compressed resume_texts')
+def _resume_texts(conn, batch_size=500):
+    ResumeText.__table__.create(conn, checkfirst=True)
+    if not has_column(conn, 'resumes', 'extracted_text'):
+        return
+    rows = conn.exec_driver_sql("""
+        SELECT id, extracted_text FROM resumes
+        WHERE extracted_text IS NOT NULL AND id NOT IN (SELECT resume_id FROM resume_texts)
+    """)
+    # Ids are copied as stored, whatever their format
+    insert = sa.text("INSERT INTO resume_texts (resume_id, body) VALUES (:resume_id, :body)")
+    for chunk in rows.partitions(batch_size):
+        conn.execute(insert, [{'resume_id': row[0], 'body': ResumeText.encode(row[1])} for row in chunk])
+    conn.exec_driver_sql('ALTER TABLE resumes DROP COLUMN extracted_text')
+
+
+@migration(4, 'compact derived analysis text')
+def _compact_analyses(conn, batch_size=500):
+    """
+    Replace stored suggestions, interview questions and resources with NULL where
+    they equal what ResumeMatcher.derived_text renders from missing_skills, and
+    ATS finding messages with their codes. Text that differs is kept as is.
+    Legacy rows were generated by the version 1 banks, so they are compared with
+    (and stamped as) version 1 whatever ENGINE_VERSION is now.
+    """
+    add_column(conn, 'analyses', 'ats_codes', 'JSON')
+    add_column(conn, 'analyses', 'engine_version', 'INTEGER')
+    codes = [f'missing_section:{section}' for section in NLPProcessor.ATS_SECTIONS]
+    codes += [code for code in NLPProcessor.ATS_FINDINGS if code != 'missing_section']
+    code_for_text = {NLPProcessor.ats_finding_text(code): code for code in codes}
+
+    compacted = kept = removed_bytes = 0
+    last_id = ''
+    while True:
+        rows = conn.execute(sa.text("""
+            SELECT id, missing_skills, suggestions, interview_questions, skill_resources, ats_details
+            FROM analyses WHERE engine_version IS NULL AND id > :last_id ORDER BY id LIMIT :limit
+        """), {'last_id': last_id, 'limit': batch_size}).fetchall()
+        if not rows:
+            break
+        updates = []
+        for analysis_id, missing, *stored, ats_details in rows:
+            derived = ResumeMatcher.derived_text(json.loads(missing or 'null') or [], Analysis.LEGACY_ENGINE_VERSION)
+            before = sum(len(text or '') for text in (*stored, ats_details))
+            remaining = []
+            for text, rendered in zip(stored, derived):
+                value = json.loads(text or 'null')
+                remaining.append(None if value is None or value == rendered else text)
+            findings = (json.loads(ats_details or 'null') or {}).get('findings') or []
+            ats_codes = json.dumps([code_for_text.get(finding, finding) for finding in findings])
+            removed_bytes += before - sum(len(text or '') for text in remaining) - len(ats_codes)
+            if any(remaining):
+                kept += 1
+            updates.append({
+                'id': analysis_id, 'suggestions': remaining[0], 'interview_questions': remaining[1],
+                'skill_resources': remaining[2], 'ats_codes': ats_codes,
+                'engine_version': None if any(remaining) else Analysis.LEGACY_ENGINE_VERSION
+            })
+        conn.execute(sa.text("""
+            UPDATE analyses SET suggestions = :suggestions, interview_questions = :interview_questions,
+                                skill_resources = :skill_resources, ats_details = NULL,
+                                ats_codes = :ats_codes, engine_version = :engine_version
+            WHERE id = :id
+        """), updates)
+        compacted += len(rows)
+        last_id = rows[-1][0]
+    return f'{compacted} analyses, {removed_bytes} bytes of derived text removed, {kept} kept custom text'
+
+
+@migration(5, 'JSONB skill columns with GIN indexes on PostgreSQL')
+def _jsonb_skills(conn):
+    if conn.dialect.name != 'postgresql':
+        return
+    for model, column in [(Resume, 'extracted_skills'), (JobPosting, 'required_skills')]:
+        table = model.__tablename__
+        column_type = {col['name']: col['type'] for col in sa.inspect(conn).get_columns(table)}[column]
+        if not isinstance(column_type, postgresql.JSONB):
+            conn.exec_driver_sql(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb')
+        create_indexes(conn, model, f'ix_{table}_{column}_gin')
+
+
+def backfill_skill_links(conn, table, column, link_table, link_column, batch_size=500):
+    """
+    Fill a skill link table from the JSON skill lists of existing rows, in id
+    order and in batches. Returns the number of links written.
+    """
+    if not has_column(conn, table, column):
+        return 0
+    skill_ids = dict(conn.execute(sa.select(Skill.name, Skill.id)).all())
+    written = 0
+    last_id = ''
+    while True:
+        rows = conn.execute(sa.text(f"""
+            SELECT id, {column} FROM {table} WHERE id > :last_id ORDER BY id LIMIT :limit
+        """), {'last_id': last_id, 'limit': batch_size}).fetchall()
+        if not rows:
+            return written
+        links = []
+        for row_id, skills in rows:
+            for name in Skill.normalize(json.loads(skills) if isinstance(skills, str) else skills):
+                if name not in skill_ids:
+                    skill_ids[name] = conn.execute(sa.insert(Skill).values(name=name)).inserted_primary_key[0]
+                links.append({'skill_id': skill_ids[name], 'owner_id': row_id})
+        if links:
+            # Ids are copied as stored, whatever their format
+            conn.execute(sa.text(f"INSERT INTO {link_table} (skill_id, {link_column}) VALUES (:skill_id, :owner_id)"),
+                         links)
+        written += len(links)
+        last_id = rows[-1][0]
+
+
+@migration(6, 'normalized skills with resume_skill and job_skill links')
+def _skill_links(conn):
+    for table in (Skill.__table__, resume_skill, job_skill):
+        table.create(conn, checkfirst=True)
+    resumes = backfill_skill_links(conn, 'resumes', 'extracted_skills', 'resume_skill', 'resume_id')
+    jobs = backfill_skill_links(conn, 'job_postings', 'required_skills', 'job_skill', 'job_id')
+    return f'{resumes} resume skill links, {jobs} job skill links'
+
+
+def rebuild_user_stats(conn):
+    """
+    Recompute every user_stats row from the resumes and analyses tables.
+    Returns the number of users.
+    """
+    conn.execute(UserStats.__table__.delete())
+    # Ids are copied as stored, whatever their format
+    return conn.execute(sa.text("""
+        INSERT INTO user_stats (user_id, resume_count, analysis_count, scored_count, score_sum, last_analysis_at)
+        SELECT users.id,
+               (SELECT count(*) FROM resumes WHERE resumes.user_id = users.id),
+               coalesce(a.analysis_count, 0), coalesce(a.scored_count, 0), coalesce(a.score_sum, 0),
+               a.last_analysis_at
+        FROM users LEFT JOIN (
+            SELECT user_id, count(*) AS analysis_count, count(match_score) AS scored_count,
+                   sum(match_score) AS score_sum, max(created_at) AS last_analysis_at
+            FROM analyses GROUP BY user_id
+        ) AS a ON a.user_id = users.id
+    """)).rowcount
+
+
+@migration(7, 'user_stats dashboard counters')
+def _user_stats(conn):
+    UserStats.__table__.create(conn, checkfirst=True)
+    return f'{rebuild_user_stats(conn)} users'
+
+
+@migration(8, 'users keyset index for the admin user list')
+def _users_keyset_index(conn):
+    # Databases from before created_at was tracked list those accounts as the oldest
+    add_column(conn, 'users', 'created_at', 'DATETIME')
+    conn.execute(sa.text('UPDATE users SET created_at = :epoch WHERE created_at IS NULL'),
+                 {'epoch': datetime(1970, 1, 1)})
+    create_indexes(conn, User, 'ix_users_created_at_id')
+
+
+def route_queries():
+    """The hot filters of the routes, as (label, statement) pairs for explain_queries()"""
+    some_id = '00000000-0000-0000-0000-000000000000'
+    return [
+        ('dashboard.index: user stats',
+         sa.select(UserStats.resume_count).where(UserStats.user_id == some_id)),
+        ('analysis.resume_list: resumes newest first',
+         sa.select(Resume.id).where(Resume.user_id == some_id).order_by(Resume.created_at.desc())),
+        ('dashboard.index: recent analyses',
+         sa.select(Analysis.id).where(Analysis.user_id == some_id)
+         .order_by(Analysis.created_at.desc()).limit(5)),
+        ('analysis.delete_resume: analyses of a resume',
+         sa.select(Analysis.id).where(Analysis.resume_id == some_id)),
+        ('hr.export_job_reports: analyses by score',
+         sa.select(Analysis.id).where(Analysis.job_id == some_id).order_by(Analysis.match_score.desc())),
+        ('admin.dashboard: users page',
+         sa.select(User.id).where(sa.or_(User.created_at < datetime(2000, 1, 1),
+                                         sa.and_(User.created_at == datetime(2000, 1, 1), User.id < some_id)))
+         .order_by(User.created_at.desc(), User.id.desc()).limit(50)),
+        ('hr.jobs: own job postings',
+         sa.select(JobPosting.id).where(JobPosting.posted_by == some_id)
+         .order_by(JobPosting.created_at.desc())),
+    ]
+
+
+def explain_queries(conn, queries):
+    """
+    Run EXPLAIN QUERY PLAN (SQLite) or EXPLAIN for each statement.
+
+    Returns:
+        list: (label, [plan lines]) pairs
+    """
+    prefix = 'EXPLAIN QUERY PLAN ' if conn.dialect.name == 'sqlite' else 'EXPLAIN '
+    report = []
+    for label, statement in queries:
+        compiled = statement.compile(dialect=conn.dialect)
+        if compiled.positiontup is not None:
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+        else:
+            params = compiled.params
+        rows = conn.exec_driver_sql(prefix + str(compiled), params).fetchall()
+        report.append((label, [str(row[-1]) for row in rows]))
+    return report
+
+
+def format_report(report):
+    """Render explain_queries() output as indented text"""
+    lines = []
+    for label, plan in report:
+        lines.append(label)
+        lines.extend(f'    {step}' for step in plan)
+    return '\n'.join(lines)
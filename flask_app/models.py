@@ -3,17 +3,24 @@ Database Models
 """
 
 from flask_app import db
+from flask_app.keys import UUIDKey, new_id
+from flask_app.database import JSONDocument, gin_index
+from flask_app.ai_engine.core import NLPProcessor, ResumeMatcher
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event, inspect, select, func, case, or_
 from datetime import datetime
-import uuid
+import zlib
 
 
 class User(UserMixin, db.Model):
     """User model for authentication"""
     __tablename__ = 'users'
+    __table_args__ = (
+        db.Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDKey(), primary_key=True, default=new_id)
     username = db.Column(db.String(80), unique=True, nullable=False, index=True)
     email = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
@@ -29,6 +36,7 @@ class User(UserMixin, db.Model):
     # Relationships
     resumes = db.relationship('Resume', backref='user', lazy=True, cascade='all, delete-orphan')
     analyses = db.relationship('Analysis', backref='user', lazy=True, cascade='all, delete-orphan')
+    stats = db.relationship('UserStats', uselist=False, lazy=True, cascade='all, delete-orphan')
     
     def set_password(self, password):
         """Hash and set password"""
@@ -45,42 +53,162 @@ class User(UserMixin, db.Model):
 class Resume(db.Model):
     """Resume model for stored resumes"""
     __tablename__ = 'resumes'
+    __table_args__ = (
+        db.Index('ix_resumes_user_id_created_at', 'user_id', 'created_at'),
+        gin_index('ix_resumes_extracted_skills_gin', 'extracted_skills'),
+    )
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    id = db.Column(UUIDKey(), primary_key=True, default=new_id)
+    user_id = db.Column(UUIDKey(), db.ForeignKey('users.id'), nullable=False)
     filename = db.Column(db.String(255), nullable=False)
     filepath = db.Column(db.String(500), nullable=False)
-    extracted_text = db.Column(db.Text)
-    extracted_skills = db.Column(db.JSON, default=list)
+    extracted_skills = db.Column(JSONDocument, default=list)
+    # Blobs only matching and duplicate detection read; loaded on first access
+    embedding = db.deferred(db.Column(db.LargeBinary))  # float32 LSA vector, see ai_engine.semantic
+    content_hash = db.Column(db.String(64), index=True)  # sha256 of the uploaded file
+    minhash = db.deferred(db.Column(db.LargeBinary))  # uint32 MinHash signature, see ai_engine.minhash
+    duplicate_of_id = db.Column(UUIDKey(), db.ForeignKey('resumes.id'), nullable=True)
+    duplicate_similarity = db.Column(db.Float)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     analyses = db.relationship('Analysis', backref='resume', lazy=True, cascade='all, delete-orphan')
+    duplicate_of = db.relationship('Resume', remote_side=[id], lazy=True)
+    lsh_bands = db.relationship('ResumeLSHBand', lazy=True, cascade='all, delete-orphan')
+    text_record = db.relationship('ResumeText', uselist=False, lazy=True, cascade='all, delete-orphan')
+    # Normalized copy of extracted_skills, kept in sync on flush
+    skills = db.relationship('Skill', secondary='resume_skill', lazy=True)
+    
+    @property
+    def extracted_text(self):
+        """Resume text, decompressed from resume_texts on first access"""
+        return self.text_record.text if self.text_record else None
+    
+    @extracted_text.setter
+    def extracted_text(self, text):
+        if text is None:
+            self.text_record = None
+        elif self.text_record:
+            self.text_record.text = text
+        else:
+            self.text_record = ResumeText(text=text)
     
     def __repr__(self):
         return f'<Resume {self.filename}>'
 
 
+class ResumeText(db.Model):
+    """zlib-compressed resume text, kept out of the resumes row so listings stay small"""
+    __tablename__ = 'resume_texts'
+    
+    resume_id = db.Column(UUIDKey(), db.ForeignKey('resumes.id'), primary_key=True)
+    body = db.Column(db.LargeBinary, nullable=False)
+    
+    @staticmethod
+    def encode(text):
+        return zlib.compress(text.encode('utf-8'))
+    
+    @staticmethod
+    def decode(body):
+        return zlib.decompress(body).decode('utf-8')
+    
+    @property
+    def text(self):
+        return self.decode(self.body)
+    
+    @text.setter
+    def text(self, text):
+        self.body = self.encode(text)
+    
+    def __repr__(self):
+        return f'<ResumeText {self.resume_id}>'
+
+
+class ResumeLSHBand(db.Model):
+    """LSH band keys of resume MinHash signatures, for near-duplicate lookup"""
+    __tablename__ = 'resume_lsh_bands'
+    
+    user_id = db.Column(UUIDKey(), primary_key=True)
+    band_key = db.Column(db.BigInteger, primary_key=True)
+    resume_id = db.Column(UUIDKey(), db.ForeignKey('resumes.id'), primary_key=True)
+    
+    def __repr__(self):
+        return f'<ResumeLSHBand {self.resume_id} {self.band_key}>'
+
+
+class Skill(db.Model):
+    """Normalized skill name; resume_skill and job_skill link it to resumes and jobs"""
+    __tablename__ = 'skills'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    
+    @staticmethod
+    def normalize(names):
+        """Sorted, de-duplicated lowercase skill names"""
+        return sorted({str(name).strip().lower()[:100] for name in names or [] if str(name).strip()})
+    
+    @classmethod
+    def for_names(cls, session, names):
+        """Skill rows for names, adding the ones that do not exist yet to the session"""
+        names = cls.normalize(names)
+        if not names:
+            return {}
+        with session.no_autoflush:
+            skills = {skill.name: skill for skill in session.query(cls).filter(cls.name.in_(names))}
+        for name in names:
+            if name not in skills:
+                skills[name] = cls(name=name)
+                session.add(skills[name])
+        return skills
+    
+    def __repr__(self):
+        return f'<Skill {self.name}>'
+
+
+# Skill links, keyed (skill_id, owner) so "who has skill X" is an index range scan
+resume_skill = db.Table(
+    'resume_skill',
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True),
+    db.Column('resume_id', UUIDKey(), db.ForeignKey('resumes.id'), primary_key=True),
+    db.Index('ix_resume_skill_resume_id', 'resume_id'),
+)
+
+job_skill = db.Table(
+    'job_skill',
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True),
+    db.Column('job_id', UUIDKey(), db.ForeignKey('job_postings.id'), primary_key=True),
+    db.Index('ix_job_skill_job_id', 'job_id'),
+)
+
+
 class JobPosting(db.Model):
     """Job posting model"""
     __tablename__ = 'job_postings'
+    __table_args__ = (
+        db.Index('ix_job_postings_posted_by_created_at', 'posted_by', 'created_at'),
+        gin_index('ix_job_postings_required_skills_gin', 'required_skills'),
+    )
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDKey(), primary_key=True, default=new_id)
     title = db.Column(db.String(255), nullable=False)
     company = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    required_skills = db.Column(db.JSON, default=list)
+    required_skills = db.Column(JSONDocument, default=list)
     salary_min = db.Column(db.Float)
     salary_max = db.Column(db.Float)
     location = db.Column(db.String(255))
     job_url = db.Column(db.String(500))
-    posted_by = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
+    posted_by = db.Column(UUIDKey(), db.ForeignKey('users.id'), nullable=True)
+    embedding = db.Column(db.LargeBinary)  # float32 LSA vector, see ai_engine.semantic
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     analyses = db.relationship('Analysis', backref='job', lazy=True, cascade='all, delete-orphan')
+    # Normalized copy of required_skills, kept in sync on flush
+    skills = db.relationship('Skill', secondary='job_skill', lazy=True)
     
     def __repr__(self):
         return f'<JobPosting {self.title} @ {self.company}>'
@@ -89,27 +217,38 @@ class JobPosting(db.Model):
 class Analysis(db.Model):
     """Analysis results model"""
     __tablename__ = 'analyses'
+    __table_args__ = (
+        db.Index('ix_analyses_user_id_created_at', 'user_id', 'created_at'),
+        db.Index('ix_analyses_resume_id', 'resume_id'),
+        db.Index('ix_analyses_job_id_match_score', 'job_id', 'match_score'),
+    )
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    resume_id = db.Column(db.String(36), db.ForeignKey('resumes.id'), nullable=False)
-    job_id = db.Column(db.String(36), db.ForeignKey('job_postings.id'), nullable=True)
+    id = db.Column(UUIDKey(), primary_key=True, default=new_id)
+    user_id = db.Column(UUIDKey(), db.ForeignKey('users.id'), nullable=False)
+    resume_id = db.Column(UUIDKey(), db.ForeignKey('resumes.id'), nullable=False)
+    job_id = db.Column(UUIDKey(), db.ForeignKey('job_postings.id'), nullable=True)
     
     # Analysis data
-    match_score = db.Column(db.Float, default=0.0)
+    # active_history keeps the old score for the user_stats update when it changes
+    match_score = db.column_property(db.Column(db.Float, default=0.0), active_history=True)
     matched_skills = db.Column(db.JSON, default=list)
     missing_skills = db.Column(db.JSON, default=list)
-    suggestions = db.Column(db.JSON, default=list)
     match_percentage = db.Column(db.Integer, default=0)
     
     # ATS Friendly data
     ats_score = db.Column(db.Float, default=0.0)
-    ats_details = db.Column(db.JSON, default=dict)
+    ats_codes = db.Column(db.JSON, default=list)  # finding codes, see NLPProcessor.ATS_FINDINGS
     
-    # New Features
-    interview_questions = db.Column(db.JSON, default=list)
-    skill_resources = db.Column(db.JSON, default=list)
-
+    # ResumeMatcher.ENGINE_VERSION that produced the analysis (NULL: legacy rows with edited text)
+    engine_version = db.Column(db.Integer)
+    
+    # Suggestions, interview questions and resources are expanded from missing_skills
+    # at render time with the banks of engine_version (see ResumeMatcher.DERIVED_TEXT);
+    # these columns only hold text that differs from that (older rows)
+    stored_suggestions = db.Column('suggestions', db.JSON)
+    stored_ats_details = db.Column('ats_details', db.JSON)
+    stored_interview_questions = db.Column('interview_questions', db.JSON)
+    stored_skill_resources = db.Column('skill_resources', db.JSON)
     
     # Job description input (if not from job posting)
     job_description = db.Column(db.Text)
@@ -117,6 +256,49 @@ class Analysis(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Legacy rows predate versioning; migration 4 compared their text with the version 1 banks
+    LEGACY_ENGINE_VERSION = 1
+    
+    def _derived_text(self):
+        return ResumeMatcher.derived_text(self.missing_skills, self.engine_version or self.LEGACY_ENGINE_VERSION)
+    
+    @property
+    def suggestions(self):
+        if self.stored_suggestions is not None:
+            return self.stored_suggestions
+        return self._derived_text()[0]
+    
+    @suggestions.setter
+    def suggestions(self, value):
+        self.stored_suggestions = value
+    
+    @property
+    def interview_questions(self):
+        if self.stored_interview_questions is not None:
+            return self.stored_interview_questions
+        return self._derived_text()[1]
+    
+    @interview_questions.setter
+    def interview_questions(self, value):
+        self.stored_interview_questions = value
+    
+    @property
+    def skill_resources(self):
+        if self.stored_skill_resources is not None:
+            return self.stored_skill_resources
+        return self._derived_text()[2]
+    
+    @skill_resources.setter
+    def skill_resources(self, value):
+        self.stored_skill_resources = value
+    
+    @property
+    def ats_findings(self):
+        """ATS finding messages"""
+        if self.stored_ats_details is not None:
+            return self.stored_ats_details.get('findings', [])
+        return [NLPProcessor.ats_finding_text(code) for code in self.ats_codes or []]
+    
     def __repr__(self):
         return f'<Analysis {self.id} - Score: {self.match_score}>'
 
@@ -125,8 +307,8 @@ class ResumeData(db.Model):
     """Model to store resume builder data"""
     __tablename__ = 'resume_data'
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    id = db.Column(UUIDKey(), primary_key=True, default=new_id)
+    user_id = db.Column(UUIDKey(), db.ForeignKey('users.id'), nullable=False)
     
     # Personal Info
     full_name = db.Column(db.String(100), nullable=False)
@@ -151,3 +333,113 @@ class ResumeData(db.Model):
     
     def __repr__(self):
         return f'<ResumeData {self.full_name}>'
+
+
+class UserStats(db.Model):
+    """
+    Per-user dashboard figures, kept current by the mapper events below so a
+    dashboard reads one row by primary key instead of aggregating analyses
+    """
+    __tablename__ = 'user_stats'
+    
+    user_id = db.Column(UUIDKey(), db.ForeignKey('users.id'), primary_key=True)
+    resume_count = db.Column(db.Integer, nullable=False, default=0)
+    analysis_count = db.Column(db.Integer, nullable=False, default=0)
+    scored_count = db.Column(db.Integer, nullable=False, default=0)  # analyses with a match_score
+    score_sum = db.Column(db.Float, nullable=False, default=0.0)
+    last_analysis_at = db.Column(db.DateTime)
+    
+    @property
+    def avg_score(self):
+        """Mean match_score of the user's analyses, 0 without any"""
+        return self.score_sum / self.scored_count if self.scored_count else 0
+    
+    @classmethod
+    def for_user(cls, user_id):
+        """The user's stats row, or an unsaved all-zero one if it is missing"""
+        return db.session.get(cls, user_id) or cls(
+            user_id=user_id, resume_count=0, analysis_count=0, scored_count=0, score_sum=0.0)
+    
+    def __repr__(self):
+        return f'<UserStats {self.user_id}>'
+
+
+# Skill list columns mirrored into resume_skill / job_skill
+SKILL_SOURCES = {Resume: 'extracted_skills', JobPosting: 'required_skills'}
+
+
+@event.listens_for(db.session, 'before_flush')
+def sync_skill_links(session, flush_context, instances):
+    """Point new and edited resumes and jobs at the Skill rows of their skill lists"""
+    changed = []
+    for obj in list(session.new) + list(session.dirty):
+        attr = SKILL_SOURCES.get(type(obj))
+        if attr and (obj in session.new or inspect(obj).attrs[attr].history.has_changes()):
+            changed.append((obj, getattr(obj, attr)))
+    if not changed:
+        return
+    skills = Skill.for_names(session, [name for _, names in changed for name in names or []])
+    for obj, names in changed:
+        obj.skills = [skills[name] for name in Skill.normalize(names)]
+
+
+def _change_user_stats(connection, user_id, **values):
+    """
+    Apply changes to a user's user_stats row in the flushing transaction.
+
+    Values are amounts added to the counter columns, or SQL expressions for
+    last_analysis_at; the update is relative, so concurrent writers add up.
+    """
+    table = UserStats.__table__
+    values = {name: value if name == 'last_analysis_at' else table.c[name] + value
+              for name, value in values.items()}
+    connection.execute(table.update().where(table.c.user_id == user_id).values(values))
+
+
+@event.listens_for(User, 'after_insert')
+def _user_stats_row(mapper, connection, target):
+    connection.execute(UserStats.__table__.insert().values(
+        user_id=target.id, resume_count=0, analysis_count=0, scored_count=0, score_sum=0.0))
+
+
+@event.listens_for(Resume, 'after_insert')
+def _resume_added(mapper, connection, target):
+    _change_user_stats(connection, target.user_id, resume_count=1)
+
+
+@event.listens_for(Resume, 'before_delete')
+def _resume_deleted(mapper, connection, target):
+    _change_user_stats(connection, target.user_id, resume_count=-1)
+
+
+@event.listens_for(Analysis, 'after_insert')
+def _analysis_added(mapper, connection, target):
+    last = UserStats.__table__.c.last_analysis_at
+    scored = target.match_score is not None
+    _change_user_stats(
+        connection, target.user_id, analysis_count=1, scored_count=int(scored),
+        score_sum=target.match_score if scored else 0.0,
+        last_analysis_at=case((or_(last.is_(None), last < target.created_at), target.created_at), else_=last))
+
+
+@event.listens_for(Analysis, 'after_update')
+def _analysis_rescored(mapper, connection, target):
+    history = inspect(target).attrs.match_score.history
+    if not history.has_changes():
+        return
+    old = history.deleted[0] if history.deleted else None
+    new = target.match_score
+    _change_user_stats(connection, target.user_id, scored_count=(new is not None) - (old is not None),
+                       score_sum=(new or 0.0) - (old or 0.0))
+
+
+@event.listens_for(Analysis, 'before_delete')
+def _analysis_deleted(mapper, connection, target):
+    # Before the DELETE, so an expired target can still load its columns
+    analyses = Analysis.__table__
+    scored = target.match_score is not None
+    _change_user_stats(
+        connection, target.user_id, analysis_count=-1, scored_count=-int(scored),
+        score_sum=-target.match_score if scored else 0.0,
+        last_analysis_at=select(func.max(analyses.c.created_at))
+        .where(analyses.c.user_id == target.user_id, analyses.c.id != target.id).scalar_subquery())
@@ -0,0 +1,282 @@
+"""
+On-disk cache of rendered PDF analysis reports
+"""
+
+import os
+import io
+import csv
+import json
+import glob
+import zipfile
+import tempfile
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from flask import current_app, render_template
+from werkzeug.utils import secure_filename
+from flask_app import db
+from flask_app.models import Analysis
+from flask_app.ai_engine.core import ResumeMatcher
+from flask_app.ai_engine.report_engine import ReportEngine, get_report_engine
+
+# Background renderer for reports of freshly saved analyses
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='report-render')
+
+# Renders of the same report in one process wait for each other; striped so the set stays bounded
+_render_locks = [threading.Lock() for _ in range(64)]
+
+
+def _render_lock(path):
+    return _render_locks[zlib.crc32(path.encode('utf-8')) % len(_render_locks)]
+
+
+def report_cache_path(analysis):
+    """
+    Cache file for an analysis report, keyed on (id, updated_at, template version,
+    engine version) so an edited analysis, a new report layout or new suggestion
+    banks never serve a stale file.
+    """
+    version = analysis.updated_at.strftime('%Y%m%d%H%M%S%f') if analysis.updated_at else '0'
+    filename = f'{analysis.id}-{version}-v{ReportEngine.TEMPLATE_VERSION}-e{ResumeMatcher.ENGINE_VERSION}.pdf'
+    return os.path.join(current_app.config['REPORT_CACHE_DIR'], filename)
+
+
+def report_payload(analysis):
+    """Plain keyword arguments for ReportEngine.render (picklable for worker processes)"""
+    return {
+        'resume_name': analysis.resume.filename,
+        'match_score': analysis.match_score,
+        'matched_skills': analysis.matched_skills,
+        'missing_skills': analysis.missing_skills,
+        'suggestions': analysis.suggestions,
+        'ats_score': analysis.ats_score,
+        'ats_findings': analysis.ats_findings
+    }
+
+
+def _render_payload(payload):
+    return get_report_engine().render(**payload).getvalue()
+
+
+def render_report(analysis):
+    """Render an analysis report to PDF bytes"""
+    return _render_payload(report_payload(analysis))
+
+
+def _write_cache(path, pdf_bytes):
+    """Atomically store a rendered report, through a temp file unique to this call"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(pdf_bytes)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def get_report(analysis):
+    """
+    Return the path of the analysis report, rendering it on a cache miss.
+
+    Args:
+        analysis: Analysis to report on
+
+    Returns:
+        str: Path of the cached PDF
+    """
+    path = report_cache_path(analysis)
+    if os.path.exists(path):
+        return path
+
+    # A request arriving while the background render runs waits for it instead of rendering again
+    with _render_lock(path):
+        if os.path.exists(path):
+            return path
+        _write_cache(path, render_report(analysis))
+
+    # Drop renders of earlier versions of this analysis
+    for stale in glob.glob(os.path.join(os.path.dirname(path), f'{analysis.id}-*.pdf')):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return path
+
+
+def discard_report(analysis_id):
+    """Remove every cached render of an analysis"""
+    for path in glob.glob(os.path.join(current_app.config['REPORT_CACHE_DIR'], f'{analysis_id}-*.pdf')):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _render_in_background(app, analysis_id):
+    with app.app_context():
+        try:
+            analysis = db.session.get(Analysis, analysis_id)
+            if analysis is not None:
+                get_report(analysis)
+        except Exception as e:
+            app.logger.warning(f'Background report render failed for {analysis_id}: {e}')
+        finally:
+            db.session.remove()
+
+
+def schedule_report(analysis):
+    """Render an analysis report in the background so the first download is served from cache"""
+    if not current_app.config.get('REPORT_EAGER_RENDER', True):
+        return None
+    return _executor.submit(_render_in_background, current_app._get_current_object(), analysis.id)
+
+
+class _ZipStream:
+    """Write-only sink for ZipFile that hands out written bytes chunk by chunk"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def _archive_name(analysis):
+    # The full id: its leading characters are only the (shared) creation timestamp
+    applicant = analysis.user.username if analysis.user else 'applicant'
+    resume_name = os.path.splitext(analysis.resume.filename)[0]
+    return secure_filename(f'{applicant}_{resume_name}_{analysis.id}.pdf')
+
+
+def export_reports_zip(analyses):
+    """
+    Stream a ZIP archive of the reports for many analyses.
+
+    Cached renders are added first; the rest are rendered in a process pool
+    and added as they complete (and cached for later downloads). At most a few
+    renders are in flight, and each member is yielded once written, so neither
+    the PDFs nor the archive are held in memory as a whole.
+
+    Args:
+        analyses: Analyses to include, with their user and resume loaded
+
+    Returns:
+        generator: ZIP bytes in chunks, for a streamed response
+    """
+    # Resolve everything that needs the database before streaming starts
+    entries = [(_archive_name(analysis), report_cache_path(analysis), analysis) for analysis in analyses]
+    cached = [(name, path) for name, path, _ in entries if os.path.exists(path)]
+    pending = [(name, path, report_payload(analysis)) for name, path, analysis in entries
+               if not os.path.exists(path)]
+    max_workers = current_app.config.get('REPORT_EXPORT_WORKERS') or os.cpu_count() or 1
+
+    def generate():
+        sink = _ZipStream()
+        with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for name, path in cached:
+                archive.write(path, name)
+                yield sink.drain()
+
+            if pending:
+                with ProcessPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+                    queue = iter(pending)
+                    in_flight = {}
+
+                    def submit_next():
+                        for name, path, payload in queue:
+                            in_flight[pool.submit(_render_payload, payload)] = (name, path)
+                            return
+
+                    for _ in range(2 * max_workers):
+                        submit_next()
+                    while in_flight:
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            name, path = in_flight.pop(future)
+                            pdf_bytes = future.result()
+                            _write_cache(path, pdf_bytes)
+                            archive.writestr(name, pdf_bytes)
+                            submit_next()
+                            yield sink.drain()
+        yield sink.drain()
+
+    return generate()
+
+
+# Lightweight (non-PDF) outputs built from the same Analysis data
+
+EXPORT_FIELDS = ['id', 'created_at', 'resume', 'job_id', 'match_score', 'match_percentage', 'ats_score',
+                 'matched_skills', 'missing_skills', 'suggestions', 'ats_findings']
+
+
+def analysis_record(analysis):
+    """Plain, JSON-serializable view of an analysis"""
+    return {
+        'id': analysis.id,
+        'created_at': analysis.created_at.isoformat() if analysis.created_at else None,
+        'resume': analysis.resume.filename if analysis.resume else None,
+        'job_id': analysis.job_id,
+        'match_score': analysis.match_score,
+        'match_percentage': analysis.match_percentage,
+        'ats_score': analysis.ats_score,
+        'matched_skills': analysis.matched_skills or [],
+        'missing_skills': analysis.missing_skills or [],
+        'suggestions': analysis.suggestions or [],
+        'ats_findings': analysis.ats_findings,
+    }
+
+
+def report_json(analysis):
+    """JSON report for one analysis"""
+    return json.dumps(analysis_record(analysis))
+
+
+def report_html(analysis):
+    """Standalone HTML report for one analysis"""
+    return render_template('analysis/report.html', report=analysis_record(analysis))
+
+
+def _csv_row(record):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow([
+        '; '.join(value) if isinstance(value, list) else ('' if value is None else value)
+        for value in (record[field] for field in EXPORT_FIELDS)
+    ])
+    return buffer.getvalue()
+
+
+def report_csv(analysis):
+    """CSV report (header plus one row) for one analysis"""
+    return ''.join(iter_csv([analysis]))
+
+
+def iter_csv(analyses):
+    """Yield a CSV export one row at a time"""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+    for analysis in analyses:
+        yield _csv_row(analysis_record(analysis))
+
+
+def iter_json(analyses):
+    """Yield a JSON array export one analysis at a time"""
+    yield '['
+    for position, analysis in enumerate(analyses):
+        yield (',' if position else '') + json.dumps(analysis_record(analysis))
+    yield ']'
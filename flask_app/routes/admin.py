@@ -1,8 +1,9 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, abort, send_file
+from flask import Blueprint, render_template, redirect, url_for, flash, abort, send_file, request, current_app
 
 from flask_login import login_required, current_user
 from functools import wraps
-from flask_app.models import User, Resume, Analysis, JobPosting
+from flask_app.models import User, Resume
+from flask_app.admin_stats import cached_site_stats, users_page
 import os
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
@@ -19,21 +20,21 @@ def admin_required(f):
 @login_required
 @admin_required
 def dashboard():
-    # Fetch statistics
-    total_users = User.query.count()
-    total_resumes = Resume.query.count()
-    total_analyses = Analysis.query.count()
-    total_jobs = JobPosting.query.count()
+    # Site totals, shared by all workers for ADMIN_STATS_TTL seconds
+    stats = cached_site_stats()
     
-    # User distribution
-    users = User.query.all()
+    # One page of users with their counts; ?after=<cursor of the previous page>
+    after = request.args.get('after', '').strip() or None
+    try:
+        users, next_after = users_page(after, current_app.config['ADMIN_USERS_PER_PAGE'])
+    except (ValueError, TypeError):
+        abort(400)
     
     return render_template('admin/dashboard.html',
-                         total_users=total_users,
-                         total_resumes=total_resumes,
-                         total_analyses=total_analyses,
-                         total_jobs=total_jobs,
-                         users=users)
+                         users=users,
+                         after=after,
+                         next_after=next_after,
+                         **stats)
 
 
 @admin_bp.route('/user_resumes/<string:user_id>')
@@ -48,7 +49,8 @@ def user_resumes(user_id):
     
     return render_template('admin/user_resumes.html',
                          user=user,
-                         resumes=resumes)
+                         resumes=resumes,
+                         duplicate_count=sum(1 for resume in resumes if resume.duplicate_of_id))
 
 
 @admin_bp.route('/download_resume/<string:resume_id>')
@@ -2,14 +2,20 @@
 Resume analysis and matching routes
 """
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, send_file
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, send_file, Response, \
+    stream_with_context
 from flask_login import login_required, current_user
+from sqlalchemy.orm import joinedload
 from werkzeug.utils import secure_filename
 from flask_app import db
 from flask_app.models import Resume, Analysis, JobPosting
 from flask_app.forms import ResumeUploadForm, JobMatchingForm, QuickAnalysisForm
-from flask_app.utils import save_uploaded_file, get_score_color, get_score_label, truncate_text
-from flask_app.ai_engine import ResumeParser, NLPProcessor, ResumeMatcher, ReportGenerator
+from flask_app.utils import get_score_color, get_score_label, truncate_text, get_matcher_options
+from flask_app.search import similar_jobs
+from flask_app.services import store_resume, build_analysis
+from flask_app.ai_engine import ResumeParser, NLPProcessor, ResumeMatcher
+from flask_app.reports import get_report, schedule_report, discard_report, report_json, report_csv, report_html, \
+    iter_csv, iter_json
 import os
 
 analysis_bp = Blueprint('analysis', __name__, url_prefix='/analysis')
@@ -22,38 +28,18 @@ def upload_resume():
     form = ResumeUploadForm()
     
     if form.validate_on_submit():
-        filename, filepath = save_uploaded_file(form.resume_file.data, current_user.id)
-        
-        if filename and filepath:
-            # Extract text from resume
-            try:
-                extracted_text = ResumeParser.extract_text_from_pdf(open(filepath, 'rb'))
-                
-                if not extracted_text:
-                    flash('Error extracting text from PDF. Please ensure it\'s a valid PDF.', 'danger')
-                    return redirect(url_for('analysis.upload_resume'))
-                
-                # Extract skills
-                extracted_skills = NLPProcessor.extract_skills(extracted_text)
-                
-                # Save resume to database
-                resume = Resume(
-                    user_id=current_user.id,
-                    filename=form.resume_file.data.filename,
-                    filepath=filepath,
-                    extracted_text=extracted_text,
-                    extracted_skills=extracted_skills
-                )
-                db.session.add(resume)
-                db.session.commit()
-                
-                flash(f'Resume "{form.resume_file.data.filename}" uploaded successfully!', 'success')
-                return redirect(url_for('analysis.resume_list'))
-            
-            except Exception as e:
-                flash(f'Error processing resume: {str(e)}', 'danger')
-                if os.path.exists(filepath):
-                    os.remove(filepath)
+        try:
+            resume, duplicate_of, similarity = store_resume(current_user.id, form.resume_file.data)
+        except ValueError as e:
+            flash(str(e), 'danger')
+            return redirect(url_for('analysis.upload_resume'))
+        except Exception as e:
+            flash(f'Error processing resume: {str(e)}', 'danger')
+        else:
+            flash(f'Resume "{resume.filename}" uploaded successfully!', 'success')
+            if duplicate_of:
+                flash(f'This resume is {similarity * 100:.0f}% similar to "{duplicate_of.filename}".', 'info')
+            return redirect(url_for('analysis.resume_list'))
     
     return render_template('analysis/upload.html', form=form)
 
@@ -81,8 +67,13 @@ def delete_resume(resume_id):
         if os.path.exists(resume.filepath):
             os.remove(resume.filepath)
         
-        # Delete analyses associated with this resume
-        Analysis.query.filter_by(resume_id=resume_id).delete()
+        # Analyses go with the resume through the cascade, which keeps user_stats current
+        for analysis in resume.analyses:
+            discard_report(analysis.id)
+        
+        # Later uploads flagged as duplicates of this one no longer have an original
+        Resume.query.filter_by(duplicate_of_id=resume_id).update(
+            {'duplicate_of_id': None, 'duplicate_similarity': None})
         
         # Delete resume
         db.session.delete(resume)
@@ -125,7 +116,8 @@ def quick_analysis():
                 extracted_text, 
                 jd_text, 
                 resume_skills, 
-                jd_skills
+                jd_skills,
+                **get_matcher_options()
             )
             
             return render_template('analysis/quick_results.html',
@@ -158,42 +150,19 @@ def analyze_resume(resume_id):
     
     form = JobMatchingForm()
     
+    # Analyzing against a stored posting links the analysis to that job
+    job = JobPosting.query.get(request.args['job_id']) if request.args.get('job_id') else None
+    if job and request.method == 'GET':
+        form.job_description.data = job.description
+    
     if form.validate_on_submit():
         try:
             jd_text = form.job_description.data
-            resume_text = resume.extracted_text
-            resume_skills = resume.extracted_skills
-            jd_skills = NLPProcessor.extract_skills(jd_text)
-            
-            # Perform analysis
-            analysis_data = ResumeMatcher.analyze_match(
-                resume_text,
-                jd_text,
-                resume_skills,
-                jd_skills
-            )
-            
-            # Generate suggestions
-            missing_skills = analysis_data['missing_skills']
-            suggestions = NLPProcessor.generate_suggestions(missing_skills)
-            
-            # Save analysis to database
-            analysis = Analysis(
-                user_id=current_user.id,
-                resume_id=resume_id,
-                job_description=jd_text,
-                match_score=analysis_data['score'],
-                matched_skills=analysis_data['matched_skills'],
-                missing_skills=analysis_data['missing_skills'],
-                suggestions=suggestions,
-                match_percentage=analysis_data['match_percentage'],
-                ats_score=analysis_data['ats_score'],
-                ats_details={'findings': analysis_data['ats_findings']},
-                interview_questions=analysis_data['interview_questions'],
-                skill_resources=analysis_data['skill_resources']
-            )
+            job_id = job.id if job and jd_text == job.description else None
+            analysis = build_analysis(current_user.id, resume, jd_text, job_id=job_id)
             db.session.add(analysis)
             db.session.commit()
+            schedule_report(analysis)
             
             flash('Analysis completed successfully!', 'success')
             return redirect(url_for('analysis.view_analysis', analysis_id=analysis.id))
@@ -202,7 +171,8 @@ def analyze_resume(resume_id):
             db.session.rollback()
             flash(f'Error during analysis: {str(e)}', 'danger')
     
-    return render_template('analysis/analyze.html', form=form, resume=resume)
+    return render_template('analysis/analyze.html', form=form, resume=resume,
+                         suggested_jobs=similar_jobs(resume))
 
 
 @analysis_bp.route('/result/<analysis_id>')
@@ -223,27 +193,30 @@ def view_analysis(analysis_id):
 @analysis_bp.route('/result/<analysis_id>/report')
 @login_required
 def download_report(analysis_id):
-    """Download PDF report"""
+    """Download the analysis report (?format=pdf|json|csv|html, default pdf)"""
     analysis = Analysis.query.get(analysis_id)
     
     if not analysis or analysis.user_id != current_user.id:
         flash('Analysis not found', 'danger')
         return redirect(url_for('analysis.resume_list'))
     
+    report_format = request.args.get('format', 'pdf').lower()
+    
+    # Data-only formats are rendered directly from the analysis row
+    if report_format == 'json':
+        return Response(report_json(analysis), mimetype='application/json')
+    if report_format == 'html':
+        return Response(report_html(analysis), mimetype='text/html')
+    if report_format == 'csv':
+        return Response(report_csv(analysis), mimetype='text/csv',
+                        headers={'Content-Disposition': f'attachment; filename=resume_analysis_{analysis.id}.csv'})
+    if report_format != 'pdf':
+        flash(f'Unsupported report format: {report_format}', 'danger')
+        return redirect(url_for('analysis.view_analysis', analysis_id=analysis_id))
+    
     try:
-        resume_name = analysis.resume.filename
-        report_buffer = ReportGenerator.generate_report(
-            resume_name,
-            analysis.match_score,
-            analysis.matched_skills,
-            analysis.missing_skills,
-            analysis.suggestions,
-            ats_score=analysis.ats_score,
-            ats_findings=analysis.ats_details.get('findings') if analysis.ats_details else None
-        )
-        
         return send_file(
-            report_buffer,
+            get_report(analysis),
             mimetype='application/pdf',
             as_attachment=True,
             download_name=f'resume_analysis_{analysis.id}.pdf'
@@ -263,3 +236,24 @@ def history():
                          score_label_fn=get_score_label,
                          score_color_fn=get_score_color,
                          truncate_fn=truncate_text)
+
+
+@analysis_bp.route('/history/export')
+@login_required
+def export_history():
+    """Stream every analysis of the current user as CSV or JSON (?format=csv|json)"""
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in ('csv', 'json'):
+        flash(f'Unsupported export format: {export_format}', 'danger')
+        return redirect(url_for('analysis.history'))
+    
+    # Rows are fetched in batches, with their resume filenames, and written out as they arrive
+    analyses = Analysis.query.filter_by(user_id=current_user.id) \
+        .options(joinedload(Analysis.resume).load_only(Resume.id, Resume.filename)) \
+        .order_by(Analysis.created_at.desc()).yield_per(200)
+    if export_format == 'json':
+        body, mimetype = iter_json(analyses), 'application/json'
+    else:
+        body, mimetype = iter_csv(analyses), 'text/csv'
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename=analysis_history.{export_format}'})
@@ -0,0 +1,372 @@
+"""
+Versioned JSON API for integrations: resumes, analyses and jobs
+Responses are serialized directly from the models (no templates) and carry
+ETags so clients can revalidate with If-None-Match.
+"""
+
+import hashlib
+from functools import wraps
+from flask import Blueprint, request, jsonify, current_app
+from flask_login import current_user
+from sqlalchemy import or_, and_
+from sqlalchemy.orm import joinedload, defer
+from flask_app import db
+from flask_app.models import Resume, Analysis, JobPosting
+from flask_app.services import store_resume, build_analysis, build_job_analyses
+from flask_app.reports import analysis_record, schedule_report
+from flask_app.skills import resumes_with_skills, jobs_with_skills
+from flask_app.utils import allowed_file, embed_texts, encode_cursor, decode_cursor
+
+api_bp = Blueprint('api', __name__, url_prefix='/api/v1')
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def api_login_required(f):
+    """Session login required, answered with a JSON 401 instead of a redirect"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated:
+            return error_response('Authentication required', 401)
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def error_response(message, status, **extra):
+    response = jsonify(error=message, **extra)
+    response.status_code = status
+    return response
+
+
+def _json_body():
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else None
+
+
+def _etag(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def conditional_response(etag, build):
+    """
+    304 when the client already holds this version, otherwise the JSON built
+    by build(); the body is only serialized when it is actually sent.
+    """
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def _version(row):
+    return row.updated_at.isoformat() if row.updated_at else ''
+
+
+# Serialization
+
+def resume_json(resume):
+    return {
+        'id': resume.id,
+        'filename': resume.filename,
+        'skills': resume.extracted_skills or [],
+        'duplicate_of_id': resume.duplicate_of_id,
+        'duplicate_similarity': resume.duplicate_similarity,
+        'created_at': resume.created_at.isoformat() if resume.created_at else None,
+    }
+
+
+def analysis_json(analysis):
+    return dict(
+        analysis_record(analysis),
+        resume_id=analysis.resume_id,
+        updated_at=analysis.updated_at.isoformat() if analysis.updated_at else None,
+        interview_questions=analysis.interview_questions or [],
+        skill_resources=analysis.skill_resources or [],
+    )
+
+
+def job_json(job):
+    return {
+        'id': job.id,
+        'title': job.title,
+        'company': job.company,
+        'description': job.description,
+        'required_skills': job.required_skills or [],
+        'salary_min': job.salary_min,
+        'salary_max': job.salary_max,
+        'location': job.location,
+        'job_url': job.job_url,
+        'posted_by': job.posted_by,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+    }
+
+
+# Cursor pagination over (created_at, id), newest first
+
+def requested_skills():
+    """The ?skill= values (repeatable); matched case-insensitively through the skill link tables"""
+    return [skill.strip() for skill in request.args.getlist('skill') if skill.strip()]
+
+
+def paginate(query, model, serialize):
+    """
+    One page of query as {'items', 'next_cursor'}, with an ETag over the
+    version of every row on the page.
+    """
+    try:
+        limit = min(max(int(request.args.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        return error_response('limit must be an integer', 400)
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            created_at, row_id = decode_cursor(cursor)
+        except (ValueError, TypeError):
+            return error_response('Invalid cursor', 400)
+        query = query.filter(or_(model.created_at < created_at,
+                                 and_(model.created_at == created_at, model.id < row_id)))
+
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    rows = rows[:limit]
+
+    etag = _etag(next_cursor, *(f'{row.id}:{_version(row)}' for row in rows))
+    return conditional_response(etag, lambda: {'items': [serialize(row) for row in rows],
+                                               'next_cursor': next_cursor})
+
+
+# Resumes
+
+@api_bp.route('/resumes', methods=['POST'])
+@api_login_required
+def upload_resume():
+    """Upload a PDF resume (multipart field 'file')"""
+    file = request.files.get('file')
+    if not file or not file.filename:
+        return error_response("Missing file field 'file'", 400)
+    if not allowed_file(file.filename):
+        return error_response('Only PDF files are allowed', 400)
+
+    try:
+        resume, _, _ = store_resume(current_user.id, file)
+    except ValueError as e:
+        return error_response(str(e), 422)
+
+    response = jsonify(resume_json(resume))
+    response.status_code = 201
+    return response
+
+
+@api_bp.route('/resumes')
+@api_login_required
+def list_resumes():
+    """The current user's resumes, newest first (?skill= to require skills)"""
+    query = resumes_with_skills(requested_skills()).filter(Resume.user_id == current_user.id)
+    return paginate(query, Resume, resume_json)
+
+
+@api_bp.route('/resumes/<resume_id>')
+@api_login_required
+def get_resume(resume_id):
+    resume = db.session.get(Resume, resume_id)
+    if not resume or resume.user_id != current_user.id:
+        return error_response('Resume not found', 404)
+    return conditional_response(_etag(resume.id, _version(resume)), lambda: resume_json(resume))
+
+
+# Analyses
+
+@api_bp.route('/analyses', methods=['POST'])
+@api_login_required
+def create_analysis():
+    """Analyze a resume against {'job_description': ...} or a stored {'job_id': ...}"""
+    data = _json_body()
+    if data is None:
+        return error_response('Expected a JSON object', 400)
+
+    if not all(isinstance(data.get(name) or '', str) for name in ('resume_id', 'job_id', 'job_description')):
+        return error_response('resume_id, job_id and job_description must be strings', 400)
+
+    resume = db.session.get(Resume, data.get('resume_id') or '')
+    if not resume or resume.user_id != current_user.id:
+        return error_response('Resume not found', 404)
+
+    job = None
+    if data.get('job_id'):
+        job = db.session.get(JobPosting, data['job_id'])
+        if not job:
+            return error_response('Job not found', 404)
+    jd_text = (data.get('job_description') or '').strip() or (job.description if job else '')
+    if len(jd_text.strip()) < 50:
+        return error_response('job_description must be at least 50 characters', 400)
+
+    analysis = build_analysis(current_user.id, resume, jd_text,
+                              job_id=job.id if job and jd_text == job.description else None)
+    db.session.add(analysis)
+    db.session.commit()
+    schedule_report(analysis)
+
+    response = jsonify(analysis_json(analysis))
+    response.status_code = 201
+    response.set_etag(_etag(analysis.id, _version(analysis)))
+    return response
+
+
+@api_bp.route('/analyses/bulk', methods=['POST'])
+@api_login_required
+def bulk_analyze():
+    """Analyze one resume against many stored jobs: {'resume_id': ..., 'job_ids': [...]}"""
+    data = _json_body()
+    if data is None:
+        return error_response('Expected a JSON object', 400)
+
+    job_ids = data.get('job_ids')
+    if not isinstance(job_ids, list) or not job_ids or not all(isinstance(i, str) for i in job_ids):
+        return error_response('job_ids must be a non-empty list of job ids', 400)
+    limit = current_app.config['API_BULK_LIMIT']
+    if len(job_ids) > limit:
+        return error_response(f'At most {limit} job_ids per request', 400)
+
+    resume_id = data.get('resume_id')
+    resume = db.session.get(Resume, resume_id) if isinstance(resume_id, str) else None
+    if not resume or resume.user_id != current_user.id:
+        return error_response('Resume not found', 404)
+
+    job_ids = list(dict.fromkeys(job_ids))
+    jobs_by_id = {job.id: job for job in JobPosting.query.filter(JobPosting.id.in_(job_ids))}
+    jobs = [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
+
+    # Reports of bulk analyses are rendered on first download rather than eagerly
+    analyses = build_job_analyses(current_user.id, resume, jobs) if jobs else []
+    db.session.add_all(analyses)
+    db.session.commit()
+
+    response = jsonify(items=[analysis_json(analysis) for analysis in analyses],
+                       missing_job_ids=[job_id for job_id in job_ids if job_id not in jobs_by_id])
+    response.status_code = 201
+    return response
+
+
+@api_bp.route('/analyses')
+@api_login_required
+def list_analyses():
+    """The current user's analysis history, newest first (?cursor=&limit=)"""
+    query = Analysis.query.filter_by(user_id=current_user.id).options(
+        defer(Analysis.job_description),
+        joinedload(Analysis.resume).load_only(Resume.id, Resume.filename)
+    )
+    return paginate(query, Analysis, analysis_json)
+
+
+@api_bp.route('/analyses/<analysis_id>')
+@api_login_required
+def get_analysis(analysis_id):
+    analysis = db.session.get(Analysis, analysis_id)
+    if not analysis or analysis.user_id != current_user.id:
+        return error_response('Analysis not found', 404)
+    return conditional_response(_etag(analysis.id, _version(analysis)), lambda: analysis_json(analysis))
+
+
+# Jobs
+
+JOB_TEXT_FIELDS = {'title': 255, 'company': 255, 'location': 255, 'job_url': 500}
+
+
+def _job_from_payload(data):
+    """
+    Validate one job payload.
+
+    Returns:
+        tuple: (JobPosting kwargs, list of error messages)
+    """
+    if not isinstance(data, dict):
+        return None, ['must be an object']
+
+    errors = []
+    fields = {}
+    for name, max_length in JOB_TEXT_FIELDS.items():
+        value = data.get(name)
+        if value is not None and not isinstance(value, str):
+            errors.append(f'{name} must be a string')
+        elif value and len(value) > max_length:
+            errors.append(f'{name} must be at most {max_length} characters')
+        else:
+            fields[name] = value.strip() if value else None
+    for name in ('title', 'company'):
+        if name in fields and not fields[name]:
+            errors.append(f'{name} is required')
+
+    description = data.get('description')
+    if not isinstance(description, str) or len(description.strip()) < 50:
+        errors.append('description must be at least 50 characters')
+    else:
+        fields['description'] = description.strip()
+
+    skills = data.get('required_skills') or []
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(',')]
+    if not isinstance(skills, list) or not all(isinstance(s, str) for s in skills):
+        errors.append('required_skills must be a list or a comma-separated string')
+    else:
+        fields['required_skills'] = [s.strip() for s in skills if s.strip()]
+
+    for name in ('salary_min', 'salary_max'):
+        value = data.get(name)
+        if value is None or value == '':
+            fields[name] = None
+        elif isinstance(value, bool) or not isinstance(value, (int, float)):
+            errors.append(f'{name} must be a number')
+        else:
+            fields[name] = float(value)
+    return fields, errors
+
+
+@api_bp.route('/jobs', methods=['GET'])
+@api_login_required
+def list_jobs():
+    """All job postings, newest first (?cursor=&limit=, ?skill= to require skills)"""
+    query = jobs_with_skills(requested_skills()).options(defer(JobPosting.embedding))
+    return paginate(query, JobPosting, job_json)
+
+
+@api_bp.route('/jobs/bulk', methods=['POST'])
+@api_login_required
+def bulk_create_jobs():
+    """
+    Create many job postings at once: {'jobs': [{title, company, description, ...}]}.
+    All or nothing: any invalid job rejects the request with per-index errors.
+    """
+    if not current_user.is_admin and current_user.role != 'hr':
+        return error_response('HR or admin role required', 403)
+
+    data = _json_body()
+    payloads = data.get('jobs') if data else None
+    if not isinstance(payloads, list) or not payloads:
+        return error_response('jobs must be a non-empty list', 400)
+    limit = current_app.config['API_BULK_LIMIT']
+    if len(payloads) > limit:
+        return error_response(f'At most {limit} jobs per request', 400)
+
+    validated, errors = [], {}
+    for index, payload in enumerate(payloads):
+        fields, job_errors = _job_from_payload(payload)
+        if job_errors:
+            errors[str(index)] = job_errors
+        validated.append(fields)
+    if errors:
+        return error_response('Invalid jobs', 400, errors=errors)
+
+    embeddings = embed_texts([fields['description'] for fields in validated])
+    jobs = [JobPosting(posted_by=current_user.id, embedding=embedding, **fields)
+            for fields, embedding in zip(validated, embeddings)]
+    db.session.add_all(jobs)
+    db.session.commit()
+
+    response = jsonify(items=[job_json(job) for job in jobs])
+    response.status_code = 201
+    return response
@@ -1,11 +1,17 @@
 """HR routes for job posting management"""
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request, abort
+from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, Response
 from flask_login import login_required, current_user
 from functools import wraps
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 from flask_app import db
 from flask_app.models import JobPosting, User, Resume, Analysis
 from flask_app.forms import JobPostingForm
+from flask_app.utils import embed_text
+from flask_app.reports import export_reports_zip
+from flask_app.skills import count_candidates, jobs_with_skills, top_skills
+from werkzeug.utils import secure_filename
 
 hr_bp = Blueprint('hr', __name__, url_prefix='/hr')
 
@@ -22,23 +28,40 @@ def hr_required(f):
 @login_required
 @hr_required
 def dashboard():
-    """HR dashboard"""
+    """HR dashboard (?skill=docker,aws counts the candidates who list all of them)"""
     jobs_count = JobPosting.query.filter_by(posted_by=current_user.id).count()
     total_users = User.query.filter_by(role='user').count()
     total_resumes = Resume.query.count()
     
+    skill_query = request.args.get('skill', '').strip()
+    skills = [s.strip() for s in skill_query.split(',') if s.strip()]
+    candidate_count = count_candidates(skills) if skills else None
+    
     return render_template('hr/dashboard.html',
                          jobs_count=jobs_count,
                          total_users=total_users,
-                         total_resumes=total_resumes)
+                         total_resumes=total_resumes,
+                         skill_query=skill_query,
+                         candidate_count=candidate_count,
+                         top_skills=top_skills())
 
 @hr_bp.route('/jobs')
 @login_required
 @hr_required
 def jobs():
-    """List all jobs posted by this HR user"""
-    job_listings = JobPosting.query.filter_by(posted_by=current_user.id).order_by(JobPosting.created_at.desc()).all()
-    return render_template('hr/jobs.html', jobs=job_listings)
+    """List all jobs posted by this HR user (?skill=react&location=berlin to filter)"""
+    skill_query = request.args.get('skill', '').strip()
+    location = request.args.get('location', '').strip()
+    skills = [s.strip() for s in skill_query.split(',') if s.strip()]
+    job_listings = jobs_with_skills(skills, location or None).filter(JobPosting.posted_by == current_user.id) \
+        .order_by(JobPosting.created_at.desc()).all()
+    
+    # One grouped count for the listed jobs instead of loading each job's analyses
+    analysis_counts = dict(db.session.query(Analysis.job_id, func.count(Analysis.id))
+                           .filter(Analysis.job_id.in_([job.id for job in job_listings]))
+                           .group_by(Analysis.job_id).all()) if job_listings else {}
+    return render_template('hr/jobs.html', jobs=job_listings, analysis_counts=analysis_counts,
+                           skill_query=skill_query, location=location)
 
 @hr_bp.route('/jobs/add', methods=['GET', 'POST'])
 @login_required
@@ -67,7 +90,8 @@ def add_job():
             salary_max=salary_max,
             location=form.location.data,
             job_url=form.job_url.data,
-            posted_by=current_user.id
+            posted_by=current_user.id,
+            embedding=embed_text(form.description.data)
         )
         db.session.add(job)
         db.session.commit()
@@ -107,6 +131,7 @@ def edit_job(job_id):
         job.salary_max = salary_max
         job.location = form.location.data
         job.job_url = form.job_url.data
+        job.embedding = embed_text(job.description)
         
         db.session.commit()
         flash(f'Job "{job.title}" updated successfully!', 'success')
@@ -141,3 +166,24 @@ def delete_job(job_id):
     
     flash(f'Job "{job_title}" deleted successfully!', 'success')
     return redirect(url_for('hr.jobs'))
+
+@hr_bp.route('/jobs/<job_id>/reports.zip')
+@login_required
+def export_job_reports(job_id):
+    """Download the analysis reports of every applicant to a job as one ZIP"""
+    job = JobPosting.query.get_or_404(job_id)
+    
+    # The posting HR user or any admin
+    if not current_user.is_admin and (current_user.role != 'hr' or job.posted_by != current_user.id):
+        abort(403)
+    
+    analyses = Analysis.query.filter_by(job_id=job.id) \
+        .options(joinedload(Analysis.user), joinedload(Analysis.resume)) \
+        .order_by(Analysis.match_score.desc()).all()
+    if not analyses:
+        flash(f'No applicant analyses for "{job.title}" yet.', 'info')
+        return redirect(url_for('hr.jobs') if current_user.role == 'hr' else url_for('admin.dashboard'))
+    
+    filename = secure_filename(f'{job.title}_reports.zip') or 'reports.zip'
+    return Response(export_reports_zip(analyses), mimetype='application/zip',
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
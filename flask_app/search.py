@@ -0,0 +1,66 @@
+"""
+Semantic search over stored job postings using LSA embeddings
+"""
+
+import numpy as np
+from sqlalchemy import func
+from flask_app import db
+from flask_app.models import JobPosting
+from flask_app.ai_engine.semantic import LSAEmbedder, RandomProjectionLSH
+from flask_app.utils import get_embedder
+
+# Per-process index, rebuilt only when the embedded job set or the model changes
+_job_index = {'key': None, 'index': None}
+
+
+def get_job_index():
+    """
+    Return an approximate nearest-neighbour index over job posting embeddings.
+    
+    Returns:
+        RandomProjectionLSH or None if no embedding model has been trained
+    """
+    embedder = get_embedder()
+    if embedder is None:
+        return None
+    
+    embedded = JobPosting.embedding.isnot(None)
+    count, last_update = db.session.query(func.count(JobPosting.id), func.max(JobPosting.updated_at)) \
+        .filter(embedded).one()
+    key = (id(embedder), count, last_update)
+    
+    if _job_index['key'] != key:
+        index = RandomProjectionLSH(embedder.dim)
+        rows = db.session.query(JobPosting.id, JobPosting.embedding).filter(embedded).all()
+        # Skip vectors left over from a previous model with a different dimension
+        entries = [(row.id, LSAEmbedder.from_bytes(row.embedding)) for row in rows]
+        entries = [(job_id, vector) for job_id, vector in entries if len(vector) == embedder.dim]
+        if entries:
+            index.add([job_id for job_id, _ in entries], np.vstack([vector for _, vector in entries]))
+        _job_index.update(key=key, index=index)
+    
+    return _job_index['index']
+
+
+def similar_jobs(resume, k=5):
+    """
+    Find the job postings closest to a resume in embedding space.
+    
+    Args:
+        resume: Resume with a stored embedding
+        k: Maximum number of jobs
+        
+    Returns:
+        list: (JobPosting, similarity percentage) tuples, best first
+    """
+    if not resume.embedding:
+        return []
+    index = get_job_index()
+    if index is None:
+        return []
+    
+    hits = index.query(LSAEmbedder.from_bytes(resume.embedding), k=k)
+    if not hits:
+        return []
+    jobs = {job.id: job for job in JobPosting.query.filter(JobPosting.id.in_([job_id for job_id, _ in hits]))}
+    return [(jobs[job_id], round(max(score, 0.0) * 100, 1)) for job_id, score in hits if job_id in jobs]
@@ -0,0 +1,162 @@
+"""
+Resume upload and analysis workflows shared by the HTML routes and the JSON API
+"""
+
+import os
+from flask_app import db
+from flask_app.models import Resume, Analysis
+from flask_app.utils import save_uploaded_file, get_matcher_options, embed_text
+from flask_app.duplicates import file_sha256, resume_signature, find_exact_duplicate, find_near_duplicate, \
+    index_resume, reusable_analysis, reusable_analyses
+from flask_app.ai_engine import ResumeParser, NLPProcessor, ResumeMatcher
+
+
+def store_resume(user_id, file):
+    """
+    Save, parse and index an uploaded resume.
+
+    Args:
+        user_id: Owner of the resume
+        file: Uploaded FileStorage
+
+    Returns:
+        tuple: (Resume, resume it duplicates or None, similarity)
+
+    Raises:
+        ValueError: The file is not an allowed type or has no extractable text
+    """
+    filename, filepath = save_uploaded_file(file, user_id)
+    if not filepath:
+        raise ValueError('Only PDF files are allowed')
+
+    try:
+        content_hash = file_sha256(filepath)
+        original = find_exact_duplicate(user_id, content_hash)
+
+        if original:
+            # Same file uploaded before: reuse its extraction instead of re-parsing
+            extracted_text = original.extracted_text
+            extracted_skills = list(original.extracted_skills or [])
+            embedding = original.embedding
+        else:
+            with open(filepath, 'rb') as f:
+                extracted_text = ResumeParser.extract_text_from_pdf(f)
+            if not extracted_text:
+                raise ValueError('Error extracting text from PDF. Please ensure it\'s a valid PDF.')
+            extracted_skills = NLPProcessor.extract_skills(extracted_text)
+            embedding = embed_text(extracted_text)
+
+        signature = resume_signature(extracted_text)
+        if original:
+            duplicate_of, similarity = original, 1.0
+        else:
+            duplicate_of, similarity = find_near_duplicate(user_id, signature)
+
+        resume = Resume(
+            user_id=user_id,
+            filename=file.filename,
+            filepath=filepath,
+            extracted_text=extracted_text,
+            extracted_skills=extracted_skills,
+            embedding=embedding,
+            content_hash=content_hash,
+            duplicate_of_id=duplicate_of.id if duplicate_of else None,
+            duplicate_similarity=similarity if duplicate_of else None
+        )
+        index_resume(resume, signature)
+        db.session.add(resume)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        if os.path.exists(filepath):
+            os.remove(filepath)
+        raise
+    return resume, duplicate_of, similarity
+
+
+def _copy_analysis(user_id, resume_id, job_id, jd_text, previous):
+    return Analysis(
+        user_id=user_id,
+        resume_id=resume_id,
+        job_id=job_id,
+        job_description=jd_text,
+        match_score=previous.match_score,
+        matched_skills=previous.matched_skills,
+        missing_skills=previous.missing_skills,
+        match_percentage=previous.match_percentage,
+        ats_score=previous.ats_score,
+        ats_codes=previous.ats_codes,
+        engine_version=previous.engine_version
+    )
+
+
+def _analysis_from_data(user_id, resume_id, job_id, jd_text, analysis_data):
+    return Analysis(
+        user_id=user_id,
+        resume_id=resume_id,
+        job_id=job_id,
+        job_description=jd_text,
+        match_score=analysis_data['score'],
+        matched_skills=analysis_data['matched_skills'],
+        missing_skills=analysis_data['missing_skills'],
+        match_percentage=analysis_data['match_percentage'],
+        ats_score=analysis_data['ats_score'],
+        ats_codes=analysis_data['ats_finding_codes'],
+        engine_version=ResumeMatcher.ENGINE_VERSION
+    )
+
+
+def build_analysis(user_id, resume, jd_text, job_id=None):
+    """
+    Analyze a resume against a job description, reusing an identical earlier
+    analysis when there is one. The caller adds and commits the result.
+
+    Returns:
+        Analysis
+    """
+    previous = reusable_analysis(resume, jd_text)
+    if previous:
+        return _copy_analysis(user_id, resume.id, job_id, jd_text, previous)
+
+    analysis_data = ResumeMatcher.analyze_match(
+        resume.extracted_text,
+        jd_text,
+        resume.extracted_skills,
+        NLPProcessor.extract_skills(jd_text),
+        **get_matcher_options()
+    )
+    return _analysis_from_data(user_id, resume.id, job_id, jd_text, analysis_data)
+
+
+def build_job_analyses(user_id, resume, jobs):
+    """
+    Analyze one resume against many job postings. Reusable analyses are found
+    with one query and the rest are scored in a single ResumeMatcher.analyze_batch
+    pass. The caller adds and commits the results.
+
+    Returns:
+        list: Analysis per job, in input order
+    """
+    previous = reusable_analyses(resume, [job.description for job in jobs])
+    pending = [job for job in jobs if job.description not in previous]
+
+    scored = {}
+    if pending:
+        jd_texts = [job.description for job in pending]
+        results = ResumeMatcher.analyze_batch(
+            [resume.extracted_text], jd_texts,
+            resume_skills=[resume.extracted_skills or []],
+            jd_skills=[NLPProcessor.extract_skills(text) for text in jd_texts],
+            cross_product=True,
+            **get_matcher_options()
+        )
+        for result in results:
+            scored[pending[result['jd_index']].id] = result
+
+    analyses = []
+    for job in jobs:
+        if job.id in scored:
+            analyses.append(_analysis_from_data(user_id, resume.id, job.id, job.description, scored[job.id]))
+        else:
+            analyses.append(_copy_analysis(user_id, resume.id, job.id, job.description, previous[job.description]))
+    return analyses
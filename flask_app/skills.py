@@ -0,0 +1,79 @@
+"""
+Skill queries over the normalized resume_skill / job_skill link tables
+
+Every filter resolves skill names to ids once and then reads the link tables
+through their (skill_id, owner) primary keys, so "who has Docker" does not
+parse any JSON.
+"""
+
+from sqlalchemy import func
+from flask_app import db
+from flask_app.models import Skill, Resume, JobPosting, resume_skill, job_skill
+
+
+def skill_ids(names):
+    """Ids of the known skills among names, or None if any of them is unknown"""
+    names = Skill.normalize(names)
+    ids = dict(db.session.query(Skill.name, Skill.id).filter(Skill.name.in_(names)).all()) if names else {}
+    return list(ids.values()) if len(ids) == len(names) else None
+
+
+def _having_all(link_table, owner_column, ids):
+    """Subquery of owner ids linked to every one of ids"""
+    owner = link_table.c[owner_column]
+    return db.session.query(owner).filter(link_table.c.skill_id.in_(ids)) \
+        .group_by(owner).having(func.count() == len(ids))
+
+
+def resumes_with_skills(names):
+    """
+    Resumes that list every one of the skills.
+
+    Returns:
+        Query of Resume (no rows if a skill is unknown)
+    """
+    ids = skill_ids(names)
+    if ids is None:
+        return Resume.query.filter(db.false())
+    if not ids:
+        return Resume.query
+    return Resume.query.filter(Resume.id.in_(_having_all(resume_skill, 'resume_id', ids)))
+
+
+def count_candidates(names):
+    """Number of users with at least one resume listing every one of the skills"""
+    return resumes_with_skills(names).with_entities(func.count(func.distinct(Resume.user_id))).scalar()
+
+
+def jobs_with_skills(names, location=None):
+    """
+    Job postings requiring every one of the skills, optionally in a location.
+
+    Args:
+        names: Skill names
+        location: Case-insensitive substring of JobPosting.location
+
+    Returns:
+        Query of JobPosting (no rows if a skill is unknown)
+    """
+    ids = skill_ids(names)
+    if ids is None:
+        return JobPosting.query.filter(db.false())
+    query = JobPosting.query
+    if ids:
+        query = query.filter(JobPosting.id.in_(_having_all(job_skill, 'job_id', ids)))
+    if location:
+        query = query.filter(JobPosting.location.ilike(f'%{location}%'))
+    return query
+
+
+def top_skills(link_table=resume_skill, limit=10):
+    """
+    Most linked skills.
+
+    Returns:
+        list: (skill name, number of resumes or jobs) tuples, most common first
+    """
+    count = func.count().label('count')
+    return db.session.query(Skill.name, count).join(link_table, link_table.c.skill_id == Skill.id) \
+        .group_by(Skill.id, Skill.name).order_by(count.desc(), Skill.name).limit(limit).all()
@@ -3,11 +3,58 @@ Utility functions for the application
 """
 
 import os
+import json
 import uuid
+import base64
+from datetime import datetime
 from werkzeug.utils import secure_filename
 from flask import current_app
 
 
+def get_matcher_options():
+    """
+    Build keyword options for ResumeMatcher from the app configuration.
+    
+    Returns:
+        dict: kwargs accepted by ResumeMatcher.analyze_match
+    """
+    from flask_app.ai_engine.features import load_shared_idf
+    from flask_app.ai_engine.cooccurrence import load_shared_cooccurrence
+    
+    feature_mode = current_app.config.get('MATCHER_FEATURE_MODE', 'tfidf')
+    options = {'feature_mode': feature_mode}
+    if feature_mode == 'hashing':
+        options['idf'] = load_shared_idf(current_app.config.get('HASHING_IDF_PATH'))
+    if current_app.config.get('SEMANTIC_MATCHING'):
+        options['embedder'] = get_embedder()
+    if current_app.config.get('SKILL_PARTIAL_CREDIT'):
+        options['cooccurrence'] = load_shared_cooccurrence(current_app.config.get('SKILL_COOCCURRENCE_PATH'))
+    return options
+
+
+def get_embedder():
+    """Return the trained LSA embedder, or None if none has been trained yet"""
+    from flask_app.ai_engine.semantic import load_shared_embedder
+    return load_shared_embedder(current_app.config.get('LSA_MODEL_PATH'))
+
+
+def embed_text(text):
+    """Embed text for storage in an `embedding` column (None without a trained model)"""
+    embedder = get_embedder()
+    if embedder is None or not text:
+        return None
+    return embedder.to_bytes(embedder.embed(text))
+
+
+def embed_texts(texts):
+    """embed_text for many texts with one embedder pass"""
+    embedder = get_embedder()
+    if embedder is None:
+        return [None] * len(texts)
+    vectors = embedder.transform([text or "" for text in texts])
+    return [embedder.to_bytes(vector) if text else None for text, vector in zip(texts, vectors)]
+
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
@@ -84,3 +131,20 @@ def truncate_text(text, max_length=100):
     if len(text) > max_length:
         return text[:max_length] + '...'
     return text
+
+
+def encode_cursor(row):
+    """Opaque keyset cursor for a row ordered by (created_at, id)"""
+    raw = json.dumps([row.created_at.isoformat(), row.id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    (created_at, id) of an encode_cursor() value.
+
+    Raises:
+        ValueError or TypeError: The cursor is malformed
+    """
+    created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    return datetime.fromisoformat(created_at), row_id
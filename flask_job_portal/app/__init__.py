@@ -7,6 +7,7 @@ from flask import Flask
 from flask_login import LoginManager
 from app.config import config
 from app.models import db, User
+from app.database import init_database
 
 
 def create_app(config_name='development'):
@@ -26,8 +27,8 @@ def create_app(config_name='development'):
     # Load configuration
     app.config.from_object(config[config_name])
     
-    # Initialize database
-    db.init_app(app)
+    # Initialize database (WAL and read/write pools for SQLite files)
+    init_database(app, db)
     
     # Initialize login manager
     login_manager = LoginManager()
@@ -53,9 +54,11 @@ def create_app(config_name='development'):
     app.register_blueprint(job_seeker_bp, url_prefix='/seeker')
     app.register_blueprint(admin_bp, url_prefix='/admin')
     
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+    # Bring the schema up to date (see app/migrations.py)
+    if app.config.get('AUTO_MIGRATE', True):
+        from app.migrations import upgrade
+        with app.app_context():
+            upgrade()
     
     # Create uploads folder
     import os
@@ -0,0 +1,115 @@
+"""
+Admin Dashboard Queries
+Site counts come from one grouped query and are cached in a JSON file for
+ADMIN_STATS_TTL seconds, so every worker process on the host shares one result.
+The user listing is keyset-paginated on the user id, with resume and
+application counts aggregated for the page's users in the same statement.
+"""
+
+import os
+import json
+import time
+import tempfile
+from flask import current_app
+from sqlalchemy import func, select, literal, case, union_all
+from sqlalchemy.orm import aliased
+from app.models import db, User, Job, Resume, Application
+
+
+def cached_json(path, ttl, compute):
+    """
+    compute() memoized in a JSON file for ttl seconds; ttl <= 0 disables the cache
+
+    Workers that miss at the same time each compute and the last write wins,
+    which is harmless for a cheap query. (The portal ships separately from
+    flask_app, so this mirrors flask_app.admin_stats.cached_json.)
+    """
+    if ttl > 0:
+        try:
+            if time.time() - os.path.getmtime(path) < ttl:
+                with open(path) as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+    value = compute()
+    if ttl > 0:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(value, f)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError:
+            current_app.logger.warning('Could not write admin stats cache %s', path)
+    return value
+
+
+def site_stats():
+    """
+    Site counts for the admin dashboard
+
+    Returns:
+        Dict of total_users, total_job_seekers, total_recruiters, total_jobs,
+        active_jobs and total_applications
+    """
+    job_state = case((Job.is_active == True, 'active'), else_='inactive')
+    counts = union_all(
+        select(literal('users').label('kind'), User.role.label('grp'), func.count().label('n'))
+        .group_by(User.role),
+        select(literal('jobs'), job_state, func.count()).group_by(job_state),
+        select(literal('applications'), literal(''), func.count()).select_from(Application),
+    ).subquery()
+    totals = {}
+    for kind, group, n in db.session.execute(select(counts)):
+        totals[(kind, group)] = n
+        totals[kind] = totals.get(kind, 0) + n
+    return {
+        'total_users': totals.get('users', 0),
+        'total_job_seekers': totals.get(('users', 'job_seeker'), 0),
+        'total_recruiters': totals.get(('users', 'recruiter'), 0),
+        'total_jobs': totals.get('jobs', 0),
+        'active_jobs': totals.get(('jobs', 'active'), 0),
+        'total_applications': totals.get('applications', 0),
+    }
+
+
+def cached_site_stats():
+    """site_stats(), at most ADMIN_STATS_TTL seconds old"""
+    config = current_app.config
+    return cached_json(config['ADMIN_STATS_CACHE_PATH'], config['ADMIN_STATS_TTL'], site_stats)
+
+
+def users_page(query, after=None, per_page=20):
+    """
+    One page of users, newest first, with their resume and application counts
+
+    Args:
+        query: Query of User to page through, e.g. users_with_skills()
+        after: Id of the last user of the previous page
+        per_page: Users per page
+
+    Returns:
+        ([(User, resume_count, application_count)], id to pass as after for
+        the next page or None on the last page)
+    """
+    if after:
+        query = query.filter(User.id < after)
+    page = query.order_by(User.id.desc()).limit(per_page + 1).cte('page')
+    user = aliased(User, page)
+    page_ids = select(page.c.id)
+    resumes = select(Resume.user_id, func.count().label('n')) \
+        .where(Resume.user_id.in_(page_ids)).group_by(Resume.user_id).subquery()
+    applications = select(Application.user_id, func.count().label('n')) \
+        .where(Application.user_id.in_(page_ids)).group_by(Application.user_id).subquery()
+    rows = db.session.query(user, func.coalesce(resumes.c.n, 0), func.coalesce(applications.c.n, 0)) \
+        .outerjoin(resumes, resumes.c.user_id == user.id) \
+        .outerjoin(applications, applications.c.user_id == user.id) \
+        .order_by(user.id.desc()).all()
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        return rows, rows[-1][0].id
+    return rows, None
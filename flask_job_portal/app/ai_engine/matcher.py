@@ -4,11 +4,32 @@ Uses TF-IDF and skill matching to calculate resume-to-job match scores
 """
 
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import json
 
 
+def pairwise_tfidf_cosine(left_counts, right_counts):
+    """
+    Row-wise cosine similarity of sparse term counts, weighted with the IDF each
+    (left, right) row pair gets when a TfidfVectorizer is fitted on the two alone
+    
+    With two documents, shared terms get IDF 1 and unshared terms ln(3/2) + 1,
+    so the similarity follows from the shared term mass of each row.
+    """
+    unshared_idf_sq = (np.log(1.5) + 1.0) ** 2
+    dot = np.asarray(left_counts.multiply(right_counts).sum(axis=1)).ravel()
+    left_sq, right_sq = left_counts.multiply(left_counts), right_counts.multiply(right_counts)
+    left_shared = np.asarray(left_sq.multiply(right_counts > 0).sum(axis=1)).ravel()
+    right_shared = np.asarray(right_sq.multiply(left_counts > 0).sum(axis=1)).ravel()
+    left_norm = unshared_idf_sq * (np.asarray(left_sq.sum(axis=1)).ravel() - left_shared) + left_shared
+    right_norm = unshared_idf_sq * (np.asarray(right_sq.sum(axis=1)).ravel() - right_shared) + right_shared
+    denominator = np.sqrt(left_norm * right_norm)
+    return np.divide(dot, denominator, out=np.zeros_like(dot), where=denominator > 0)
+
+
 class SkillMatcher:
     """
     AI Engine for matching resumes to job postings
@@ -31,6 +52,9 @@ class SkillMatcher:
         'communication', 'teamwork', 'leadership', 'problem solving'
     }
     
+    # Vocabulary cap used by calculate_tfidf_score
+    TFIDF_MAX_FEATURES = 100
+    
     @staticmethod
     def extract_skills(text):
         """
@@ -79,7 +103,7 @@ class SkillMatcher:
         
         try:
             # Create TF-IDF vectors
-            vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
+            vectorizer = TfidfVectorizer(max_features=SkillMatcher.TFIDF_MAX_FEATURES, stop_words='english')
             tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
             
             # Calculate cosine similarity
@@ -148,6 +172,14 @@ class SkillMatcher:
         
         # Calculate scores
         tfidf_score = SkillMatcher.calculate_tfidf_score(resume_text, job_description)
+        
+        return SkillMatcher._build_match_result(resume_skills, job_skills, tfidf_score)
+    
+    @staticmethod
+    def _build_match_result(resume_skills, job_skills, tfidf_score):
+        """
+        Combine TF-IDF and skill scores into the match analysis dictionary
+        """
         skill_score = SkillMatcher.calculate_skill_match_score(resume_skills, job_skills)
         
         # Weighted overall score: 40% TF-IDF, 60% Skill Match
@@ -177,3 +209,106 @@ class SkillMatcher:
             'resume_skills_count': len(resume_skills),
             'job_skills_count': len(job_skills)
         }
+    
+    @staticmethod
+    def analyze_batch(resume_texts, job_descriptions, job_requirements=None, cross_product=False, batch_size=256):
+        """
+        Perform match analysis for many resume/job pairs at once
+        
+        Identical inputs are deduplicated, every chunk of pairs is vectorized into
+        one term matrix and TF-IDF similarities are computed with sparse operations,
+        so per-call overhead is paid once per chunk instead of once per pair.
+        
+        Args:
+            resume_texts: List of resume texts
+            job_descriptions: List of job description texts
+            job_requirements: Optional list of requirement texts aligned with job_descriptions
+            cross_product: Match every resume against every job instead of pairing by position
+            batch_size: Number of pairs vectorized together (bounds memory)
+        
+        Yields:
+            analyze_match dictionaries with added 'resume_index' and 'job_index'
+        """
+        if cross_product:
+            pairs = ((r, j) for r in range(len(resume_texts)) for j in range(len(job_descriptions)))
+        else:
+            if len(resume_texts) != len(job_descriptions):
+                raise ValueError('resume_texts and job_descriptions must have the same length')
+            pairs = ((i, i) for i in range(len(resume_texts)))
+        
+        # Skills are extracted once per distinct text
+        skill_cache = {}
+        
+        def skills_for(text):
+            if text not in skill_cache:
+                skill_cache[text] = SkillMatcher.extract_skills(text)
+            return skill_cache[text]
+        
+        def job_text(j):
+            full_job_text = job_descriptions[j]
+            if job_requirements and job_requirements[j]:
+                full_job_text += ' ' + job_requirements[j]
+            return full_job_text
+        
+        chunk = []
+        for pair in pairs:
+            chunk.append(pair)
+            if len(chunk) == batch_size:
+                yield from SkillMatcher._analyze_chunk(chunk, resume_texts, job_descriptions, skills_for, job_text)
+                chunk = []
+        if chunk:
+            yield from SkillMatcher._analyze_chunk(chunk, resume_texts, job_descriptions, skills_for, job_text)
+    
+    @staticmethod
+    def _analyze_chunk(chunk, resume_texts, job_descriptions, skills_for, job_text):
+        """
+        Score a chunk of (resume_index, job_index) pairs from a single term matrix
+        """
+        rows = {}
+        for r, j in chunk:
+            rows.setdefault(resume_texts[r] or '', len(rows))
+            rows.setdefault(job_descriptions[j] or '', len(rows))
+        left = [rows[resume_texts[r] or ''] for r, _ in chunk]
+        right = [rows[job_descriptions[j] or ''] for _, j in chunk]
+        
+        try:
+            counts = CountVectorizer(stop_words='english').fit_transform(list(rows)).tocsr()
+        except ValueError:
+            counts = sparse.csr_matrix((len(rows), 1))
+        similarities = SkillMatcher._pairwise_tfidf_similarity(counts[left], counts[right])
+        
+        for position, (r, j) in enumerate(chunk):
+            if not resume_texts[r] or not job_descriptions[j]:
+                tfidf_score = 0
+            else:
+                tfidf_score = round(float(similarities[position]) * 100, 2)
+            
+            result = SkillMatcher._build_match_result(skills_for(resume_texts[r]), skills_for(job_text(j)),
+                                                      tfidf_score)
+            result['resume_index'] = r
+            result['job_index'] = j
+            yield result
+    
+    @staticmethod
+    def _pairwise_tfidf_similarity(resume_counts, job_counts):
+        """
+        Row-wise TF-IDF cosine similarity, equal to fitting a TfidfVectorizer on each
+        (resume, job) pair alone as calculate_tfidf_score does
+        
+        Pairs whose combined vocabulary exceeds TFIDF_MAX_FEATURES are re-scored on their most
+        frequent terms, mirroring the max_features cap.
+        """
+        resume_counts = sparse.csr_matrix(resume_counts, dtype=np.float64)
+        job_counts = sparse.csr_matrix(job_counts, dtype=np.float64)
+        similarities = pairwise_tfidf_cosine(resume_counts, job_counts)
+        
+        # Columns follow the alphabetical vocabulary order, so argsort over the pair's
+        # term frequencies selects the same terms as TfidfVectorizer's own pruning
+        combined = (resume_counts + job_counts).tocsr()
+        combined.sort_indices()
+        for i in np.flatnonzero(combined.getnnz(axis=1) > SkillMatcher.TFIDF_MAX_FEATURES):
+            row = combined[i]
+            keep = row.indices[(-row.data).argsort()[:SkillMatcher.TFIDF_MAX_FEATURES]]
+            similarities[i] = pairwise_tfidf_cosine(resume_counts[i][:, keep], job_counts[i][:, keep])[0]
+        
+        return similarities
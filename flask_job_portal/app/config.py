@@ -12,6 +12,28 @@ class Config:
     # Database
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
+    # Apply pending schema migrations at startup; set false to run migrate.py as a deploy step
+    AUTO_MIGRATE = os.environ.get('AUTO_MIGRATE', 'true').lower() == 'true'
+    # SQLite files: WAL, these pragmas on connect and separate read/write pools (see app/database.py)
+    SQLITE_TUNING = os.environ.get('SQLITE_TUNING', 'true').lower() == 'true'
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',  # durable across crashes in WAL mode, fsync at checkpoints only
+        'cache_size': -64000,  # KiB per connection
+        'mmap_size': 256 * 1024 * 1024,
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', '15000')),  # ms to wait for another writer
+    }
+    SQLITE_WRITE_POOL_SIZE = int(os.environ.get('SQLITE_WRITE_POOL_SIZE', '1'))  # per worker process
+    SQLITE_READ_POOL_SIZE = int(os.environ.get('SQLITE_READ_POOL_SIZE', '4'))  # 0 reads on the write pool
+    # PostgreSQL (DATABASE_URL=postgresql://...): psycopg 3 connections pooled per worker process
+    POSTGRES_POOL_SIZE = int(os.environ.get('POSTGRES_POOL_SIZE', '5'))
+    POSTGRES_MAX_OVERFLOW = int(os.environ.get('POSTGRES_MAX_OVERFLOW', '10'))
+    POSTGRES_POOL_RECYCLE = 1800  # seconds
+    
+    # Admin dashboard: site counts cached in a file shared by the workers, users listed per page
+    ADMIN_STATS_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', 'instance', 'admin_stats.json')
+    ADMIN_STATS_TTL = int(os.environ.get('ADMIN_STATS_TTL', '60'))  # seconds, 0 disables the cache
+    ADMIN_USERS_PER_PAGE = 20
     
     # Session
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
@@ -44,6 +66,7 @@ class TestingConfig(Config):
     # In-memory SQLite for testing
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     WTF_CSRF_ENABLED = False
+    ADMIN_STATS_TTL = 0
 
 
 class ProductionConfig(Config):
@@ -0,0 +1,202 @@
+"""
+SQLite Engine Tuning
+Read/write connection routing for SQLite databases
+
+For a file-backed SQLite database init_database() sets the journal to WAL, so
+readers never block the writer, and applies the SQLITE_PRAGMAS on every new
+connection. Each worker process then holds two pools:
+
+- the write engine (db.engine): SQLITE_WRITE_POOL_SIZE connections, 1 by
+  default, since SQLite runs one writer at a time. Its transactions start with
+  BEGIN IMMEDIATE, so a worker takes the write lock before reading instead of
+  failing with "database is locked" when a read transaction tries to upgrade.
+  busy_timeout makes workers wait for each other's locks rather than fail.
+- a read engine: SQLITE_READ_POOL_SIZE query_only connections. RoutingSession
+  sends ORM SELECTs there until the session's transaction first writes; from
+  then on everything uses the write connection, so a request reads its own
+  uncommitted changes.
+
+For PostgreSQL the URL is pointed at the psycopg 3 driver and the engine pool
+is sized from POSTGRES_POOL_SIZE / POSTGRES_MAX_OVERFLOW, with connections
+checked before use. JSONDocument columns are JSONB there, and json_contains()
+compiles a "has all these values" filter to a JSONB @> test that a GIN index on
+the column answers; on SQLite it compiles to json_each() lookups.
+
+In-memory SQLite and other databases are left as Flask-SQLAlchemy builds them.
+
+This mirrors flask_app/database.py: the portal runs from flask_job_portal/ with
+its own requirements and cannot import the main app's package, so keep the two
+copies in step.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
+from flask import current_app
+from flask_sqlalchemy.session import Session
+
+READ_ENGINE_KEY = 'sqlalchemy_read_engine'
+_WRITING = 'routing_session_writing'
+
+
+# JSON column type: JSONB on PostgreSQL, so it can be GIN-indexed and queried with @>
+JSONDocument = sa.JSON().with_variant(postgresql.JSONB(), 'postgresql')
+
+
+def gin_index(name, column):
+    """
+    GIN index for json_contains() on a JSONDocument column, created on
+    PostgreSQL only
+
+    Args:
+        name: Index name
+        column: Column name
+    """
+    return sa.Index(name, column, postgresql_using='gin',
+                    postgresql_ops={column: 'jsonb_path_ops'}).ddl_if(dialect='postgresql')
+
+
+class json_contains(sa.sql.functions.FunctionElement):
+    """
+    SQL condition: the JSON list in a column contains every one of values
+
+    Args:
+        column: JSONDocument column holding a list
+        values: Values that must all be in the list
+    """
+    type = sa.Boolean()
+    inherit_cache = True
+
+    def __init__(self, column, values):
+        super().__init__(column, sa.literal(list(values), JSONDocument))
+
+
+@compiles(json_contains, 'postgresql')
+def _json_contains_postgresql(element, compiler, **kw):
+    column, values = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f'{column} @> {values}'
+
+
+@compiles(json_contains)
+def _json_contains(element, compiler, **kw):
+    column, values = (compiler.process(clause, **kw) for clause in element.clauses)
+    return (f"json_type({column}) = 'array' AND NOT EXISTS (SELECT 1 FROM json_each({values}) AS wanted "
+            f"WHERE NOT EXISTS (SELECT 1 FROM json_each({column}) AS item WHERE item.value = wanted.value))")
+
+
+def postgres_url(url):
+    """
+    Point a postgres:// or postgresql:// URL without a driver at psycopg 3
+
+    Args:
+        url: Database URL string
+
+    Returns:
+        The URL, with the postgresql+psycopg scheme for PostgreSQL
+    """
+    for prefix in ('postgres://', 'postgresql://'):
+        if url.startswith(prefix):
+            return 'postgresql+psycopg://' + url[len(prefix):]
+    return url
+
+
+def is_sqlite_file(url):
+    """
+    Check whether a database URL points at an on-disk SQLite database
+
+    Args:
+        url: Database URL string or sqlalchemy URL
+
+    Returns:
+        True for a SQLite file, False for in-memory SQLite and other databases
+    """
+    url = sa.engine.make_url(url)
+    database = url.database or ''
+    return url.get_backend_name() == 'sqlite' and database not in ('', ':memory:') \
+        and not database.startswith('file::memory:') and url.query.get('mode') != 'memory'
+
+
+def tune_sqlite(engine, pragmas, immediate=False):
+    """
+    Apply PRAGMAs to every new connection of an engine
+
+    Args:
+        engine: SQLite engine
+        pragmas: Dict of PRAGMA name to value
+        immediate: Start every transaction with BEGIN IMMEDIATE (write engines)
+    """
+    @sa.event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        if immediate:
+            # Let the begin hook below issue BEGIN instead of the sqlite3 module
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+
+    if immediate:
+        @sa.event.listens_for(engine, 'begin')
+        def begin_immediate(conn):
+            if conn.get_execution_options().get('isolation_level') != 'AUTOCOMMIT':
+                conn.exec_driver_sql('BEGIN IMMEDIATE')
+
+
+def init_database(app, db):
+    """
+    Initialize the database extension, with the SQLite tuning and read engine
+    or the PostgreSQL pool settings
+
+    Args:
+        app: Flask application
+        db: SQLAlchemy extension (created with RoutingSession)
+    """
+    app.config['SQLALCHEMY_DATABASE_URI'] = postgres_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if sa.engine.make_url(app.config['SQLALCHEMY_DATABASE_URI']).get_backend_name() == 'postgresql':
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {}).update(
+            pool_size=app.config.get('POSTGRES_POOL_SIZE', 5),
+            max_overflow=app.config.get('POSTGRES_MAX_OVERFLOW', 10),
+            pool_pre_ping=True, pool_recycle=app.config.get('POSTGRES_POOL_RECYCLE', 1800))
+    tuned = app.config.get('SQLITE_TUNING', True) and is_sqlite_file(app.config['SQLALCHEMY_DATABASE_URI'])
+    if tuned:
+        timeout = app.config['SQLITE_PRAGMAS'].get('busy_timeout', 5000) / 1000
+        app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {}).update(
+            pool_size=app.config.get('SQLITE_WRITE_POOL_SIZE', 1), max_overflow=0, pool_timeout=timeout)
+    db.init_app(app)
+    if not tuned:
+        return
+
+    pragmas = app.config['SQLITE_PRAGMAS']
+    with app.app_context():
+        engine = db.engine
+    tune_sqlite(engine, pragmas, immediate=True)
+    read_pool_size = app.config.get('SQLITE_READ_POOL_SIZE', 0)
+    if read_pool_size:
+        reader = sa.create_engine(engine.url, pool_size=read_pool_size, max_overflow=0,
+                                  pool_timeout=timeout, echo=engine.echo)
+        tune_sqlite(reader, {**pragmas, 'query_only': 1})
+        app.extensions[READ_ENGINE_KEY] = reader
+
+
+class RoutingSession(Session):
+    """Session that reads from the read engine until its transaction writes"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or engine is not self._db.engine:
+            return engine
+        reader = current_app.extensions.get(READ_ENGINE_KEY)
+        if reader is None:
+            return engine
+        if self.info.get(_WRITING) or self._flushing or not isinstance(clause, sa.Select) \
+                or clause._for_update_arg is not None:
+            # Writes, raw SQL and everything after them stay on the write connection
+            self.info[_WRITING] = True
+            return engine
+        return reader
+
+
+@sa.event.listens_for(RoutingSession, 'after_transaction_end')
+def _end_writing(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_WRITING, None)
@@ -0,0 +1,256 @@
+"""
+Versioned Schema Migrations
+Migrations are functions of a SQLAlchemy connection, registered in order with
+@migration. upgrade() applies the ones newer than the highest version recorded
+in the schema_migrations table, each in its own transaction together with its
+version row. Databases created by the old db.create_all() startup are upgraded
+in place, so every step checks the schema before changing it.
+
+The runner mirrors flask_app/migrations.py (the portal ships on its own and
+cannot import it); only the registered migrations differ.
+"""
+
+import json
+from datetime import datetime
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from app.models import db, Job, Resume, ResumeText, Application, Skill, resume_skill, job_skill, job_skill_names
+
+MIGRATIONS = []
+
+schema_migrations = sa.Table(
+    'schema_migrations', sa.MetaData(),
+    sa.Column('version', sa.Integer, primary_key=True),
+    sa.Column('name', sa.String(255), nullable=False),
+    sa.Column('applied_at', sa.DateTime, nullable=False)
+)
+
+
+class _AppliedElsewhere(Exception):
+    """The version row already exists: another process applied the migration"""
+    pass
+
+
+def migration(version, name):
+    """Register a migration; versions must be added in increasing order"""
+    def register(func):
+        assert not MIGRATIONS or MIGRATIONS[-1][0] < version, f'Migration {version} is out of order'
+        MIGRATIONS.append((version, name, func))
+        return func
+    return register
+
+
+def current_version(conn):
+    """Highest applied migration, 0 for an unversioned database"""
+    if not sa.inspect(conn).has_table(schema_migrations.name):
+        return 0
+    return conn.execute(sa.select(sa.func.max(schema_migrations.c.version))).scalar() or 0
+
+
+def latest_version():
+    """Version of the newest registered migration"""
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def upgrade(engine=None, target=None):
+    """
+    Apply pending migrations
+
+    Args:
+        engine: Engine to migrate (default: the app's db.engine)
+        target: Last version to apply (default: all)
+
+    Returns:
+        List of versions applied by this call
+    """
+    engine = engine or db.engine
+    with engine.begin() as conn:
+        schema_migrations.create(conn, checkfirst=True)
+        version = current_version(conn)
+
+    applied = []
+    for number, name, apply in MIGRATIONS:
+        if number <= version or (target is not None and number > target):
+            continue
+        try:
+            with engine.begin() as conn:
+                apply(conn)
+                try:
+                    conn.execute(schema_migrations.insert().values(
+                        version=number, name=name, applied_at=datetime.utcnow()))
+                except sa.exc.IntegrityError:
+                    raise _AppliedElsewhere()
+        except _AppliedElsewhere:
+            # Another worker started at the same time and recorded this version first
+            continue
+        applied.append(number)
+    return applied
+
+
+def has_column(conn, table, column):
+    """Check whether a table has a column"""
+    return column in {col['name'] for col in sa.inspect(conn).get_columns(table)}
+
+
+def add_column(conn, table, column, col_type):
+    """Add a column unless it exists. Returns True if it was added"""
+    if has_column(conn, table, column):
+        return False
+    conn.exec_driver_sql(f'ALTER TABLE {table} ADD COLUMN {column} {col_type}')
+    return True
+
+
+def create_indexes(conn, model, *names):
+    """Create indexes declared in a model's __table_args__ unless they exist"""
+    indexes = {index.name: index for index in model.__table__.indexes}
+    for name in names:
+        indexes[name].create(conn, checkfirst=True)
+
+
+@migration(1, 'baseline schema')
+def _baseline(conn):
+    db.metadata.create_all(conn)
+
+
+@migration(2, 'composite indexes for route queries')
+def _route_indexes(conn):
+    create_indexes(conn, Job, 'ix_jobs_is_active_created_at', 'ix_jobs_recruiter_id')
+    create_indexes(conn, Resume, 'ix_resumes_user_id')
+    create_indexes(conn, Application, 'ix_applications_job_id_status', 'ix_applications_user_id_job_id')
+
+
+@migration(3, 'move resume text to compressed resume_texts')
+def _resume_texts(conn, batch_size=500):
+    ResumeText.__table__.create(conn, checkfirst=True)
+    if not has_column(conn, 'resumes', 'extracted_text'):
+        return
+    rows = conn.exec_driver_sql("""
+        SELECT id, extracted_text FROM resumes
+        WHERE extracted_text IS NOT NULL AND id NOT IN (SELECT resume_id FROM resume_texts)
+    """)
+    for chunk in rows.partitions(batch_size):
+        conn.execute(ResumeText.__table__.insert(),
+                     [{'resume_id': row[0], 'body': ResumeText.encode(row[1])} for row in chunk])
+    conn.exec_driver_sql('ALTER TABLE resumes DROP COLUMN extracted_text')
+
+
+@migration(4, 'JSONB skill columns with GIN indexes on PostgreSQL')
+def _jsonb_skills(conn):
+    if conn.dialect.name != 'postgresql':
+        return
+    for model, column in [(Resume, 'extracted_skills'), (Application, 'matched_skills')]:
+        table = model.__tablename__
+        column_type = {col['name']: col['type'] for col in sa.inspect(conn).get_columns(table)}[column]
+        if not isinstance(column_type, postgresql.JSONB):
+            conn.exec_driver_sql(f'ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb')
+        create_indexes(conn, model, f'ix_{table}_{column}_gin')
+
+
+def backfill_skill_links(conn, table, column, link_table, link_column, names_of, batch_size=500):
+    """
+    Fill a skill link table from existing rows, in id order and in batches
+
+    Args:
+        conn: Connection
+        table: Table holding the skills source column
+        column: Skills source column
+        link_table: resume_skill or job_skill
+        link_column: Owner column of the link table
+        names_of: Function from a column value to skill names
+
+    Returns:
+        Number of links written
+    """
+    skill_ids = dict(conn.execute(sa.select(Skill.name, Skill.id)).all())
+    written = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(sa.text(f"""
+            SELECT id, {column} FROM {table} WHERE id > :last_id ORDER BY id LIMIT :limit
+        """), {'last_id': last_id, 'limit': batch_size}).fetchall()
+        if not rows:
+            return written
+        links = []
+        for row_id, value in rows:
+            for name in Skill.normalize(names_of(value)):
+                if name not in skill_ids:
+                    skill_ids[name] = conn.execute(sa.insert(Skill).values(name=name)).inserted_primary_key[0]
+                links.append({'skill_id': skill_ids[name], link_column: row_id})
+        if links:
+            conn.execute(link_table.insert(), links)
+        written += len(links)
+        last_id = rows[-1][0]
+
+
+@migration(5, 'normalized skills with resume_skill and job_skill links')
+def _skill_links(conn):
+    for table in (Skill.__table__, resume_skill, job_skill):
+        table.create(conn, checkfirst=True)
+    backfill_skill_links(conn, 'resumes', 'extracted_skills', resume_skill, 'resume_id',
+                         lambda value: json.loads(value) if isinstance(value, str) else value)
+    backfill_skill_links(conn, 'jobs', 'requirements', job_skill, 'job_id', job_skill_names)
+
+
+@migration(6, 'denormalized jobs.application_count')
+def _application_counts(conn):
+    add_column(conn, 'jobs', 'application_count', 'INTEGER NOT NULL DEFAULT 0')
+    conn.exec_driver_sql("""
+        UPDATE jobs SET application_count =
+            (SELECT count(*) FROM applications WHERE applications.job_id = jobs.id)
+    """)
+
+
+def route_queries():
+    """
+    The hot filters of the routes, for explain_queries()
+
+    Returns:
+        List of (label, statement) pairs
+    """
+    some_id = 1
+    return [
+        ('main.browse_jobs: active jobs newest first',
+         sa.select(Job.id).where(Job.is_active == True).order_by(Job.created_at.desc()).limit(10)),
+        ('main.index: active job count',
+         sa.select(sa.func.count()).select_from(Job).where(Job.is_active == True)),
+        ('main.view_job: already applied',
+         sa.select(Application.id).where(Application.user_id == some_id, Application.job_id == some_id)),
+        ('recruiter.dashboard: own jobs',
+         sa.select(Job.id).where(Job.recruiter_id == some_id)),
+        ('recruiter.dashboard: pending applications',
+         sa.select(sa.func.count()).select_from(Application).join(Job)
+         .where(Job.recruiter_id == some_id, Application.status == 'pending')),
+        ('job_seeker.dashboard: own applications',
+         sa.select(Application.id).where(Application.user_id == some_id)),
+        ('job_seeker.dashboard: own resumes',
+         sa.select(Resume.id).where(Resume.user_id == some_id)),
+    ]
+
+
+def explain_queries(conn, queries):
+    """
+    Run EXPLAIN QUERY PLAN (SQLite) or EXPLAIN for each statement
+
+    Returns:
+        List of (label, [plan lines]) pairs
+    """
+    prefix = 'EXPLAIN QUERY PLAN ' if conn.dialect.name == 'sqlite' else 'EXPLAIN '
+    report = []
+    for label, statement in queries:
+        compiled = statement.compile(dialect=conn.dialect)
+        if compiled.positiontup is not None:
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+        else:
+            params = compiled.params
+        rows = conn.exec_driver_sql(prefix + str(compiled), params).fetchall()
+        report.append((label, [str(row[-1]) for row in rows]))
+    return report
+
+
+def format_report(report):
+    """Render explain_queries() output as indented text"""
+    lines = []
+    for label, plan in report:
+        lines.append(label)
+        lines.extend(f'    {step}' for step in plan)
+    return '\n'.join(lines)
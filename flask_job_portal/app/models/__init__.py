@@ -4,14 +4,22 @@ Contains all SQLAlchemy ORM models for the Job Portal
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from flask_login import UserMixin
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 from datetime import datetime
+import zlib
 from werkzeug.security import generate_password_hash, check_password_hash
+from app.database import RoutingSession, JSONDocument, gin_index
+from app.ai_engine.matcher import SkillMatcher
 
 # Initialize SQLAlchemy - will be configured in app factory
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 
-class User(db.Model):
+class User(UserMixin, db.Model):
     """
     User Model - Represents registered users
     Roles: job_seeker, recruiter, admin
@@ -60,6 +68,10 @@ class Job(db.Model):
     Job Model - Represents job postings created by recruiters
     """
     __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_is_active_created_at', 'is_active', 'created_at'),
+        db.Index('ix_jobs_recruiter_id', 'recruiter_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -72,15 +84,19 @@ class Job(db.Model):
     company = db.Column(db.String(255))
     recruiter_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     is_active = db.Column(db.Boolean, default=True)
+    # Number of applications, kept in sync by the Application events below
+    application_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Relationships
     applications = db.relationship('Application', backref='job', lazy=True, cascade='all, delete-orphan')
+    # Skills found in requirements, kept in sync on flush
+    skills = db.relationship('Skill', secondary='job_skill', lazy=True)
     
     def get_application_count(self):
         """Get total applications for this job"""
-        return len(self.applications)
+        return self.application_count
     
     def __repr__(self):
         return f'<Job {self.title}>'
@@ -91,26 +107,151 @@ class Resume(db.Model):
     Resume Model - Stores uploaded resumes for job seekers
     """
     __tablename__ = 'resumes'
+    __table_args__ = (
+        db.Index('ix_resumes_user_id', 'user_id'),
+        gin_index('ix_resumes_extracted_skills_gin', 'extracted_skills'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     filename = db.Column(db.String(255), nullable=False)
     filepath = db.Column(db.String(500), nullable=False)
-    extracted_text = db.Column(db.Text)  # Text extracted from PDF
-    extracted_skills = db.Column(db.JSON)  # Skills extracted from resume
+    extracted_skills = db.Column(JSONDocument)  # Skills extracted from resume
     is_primary = db.Column(db.Boolean, default=False)  # Primary resume for matching
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Text extracted from PDF, stored compressed in resume_texts and loaded on demand
+    text_record = db.relationship('ResumeText', uselist=False, lazy=True, cascade='all, delete-orphan')
+    # Normalized copy of extracted_skills, kept in sync on flush
+    skills = db.relationship('Skill', secondary='resume_skill', lazy=True)
+    
+    @property
+    def extracted_text(self):
+        """Get the resume text, decompressed on first access"""
+        return self.text_record.text if self.text_record else None
+    
+    @extracted_text.setter
+    def extracted_text(self, text):
+        if text is None:
+            self.text_record = None
+        elif self.text_record:
+            self.text_record.text = text
+        else:
+            self.text_record = ResumeText(text=text)
+    
     def __repr__(self):
         return f'<Resume {self.filename}>'
 
 
+class ResumeText(db.Model):
+    """
+    ResumeText Model - zlib-compressed resume text, kept out of the resumes
+    row so resume listings do not load it
+    """
+    __tablename__ = 'resume_texts'
+    
+    resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'), primary_key=True)
+    body = db.Column(db.LargeBinary, nullable=False)
+    
+    @staticmethod
+    def encode(text):
+        """Compress text for the body column"""
+        return zlib.compress(text.encode('utf-8'))
+    
+    @staticmethod
+    def decode(body):
+        """Decompress a body column value"""
+        return zlib.decompress(body).decode('utf-8')
+    
+    @property
+    def text(self):
+        return self.decode(self.body)
+    
+    @text.setter
+    def text(self, text):
+        self.body = self.encode(text)
+    
+    def __repr__(self):
+        return f'<ResumeText {self.resume_id}>'
+
+
+class Skill(db.Model):
+    """
+    Skill Model - Normalized skill name, linked to resumes and jobs through
+    resume_skill and job_skill
+    """
+    __tablename__ = 'skills'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    
+    @staticmethod
+    def normalize(names):
+        """
+        Normalize skill names
+        
+        Args:
+            names: Iterable of skill names (or None)
+        
+        Returns:
+            Sorted list of distinct lowercase names
+        """
+        return sorted({str(name).strip().lower()[:100] for name in names or [] if str(name).strip()})
+    
+    @classmethod
+    def for_names(cls, session, names):
+        """
+        Get Skill rows by name, adding missing ones to the session
+        
+        Args:
+            session: SQLAlchemy session
+            names: Skill names
+        
+        Returns:
+            Dict of normalized name to Skill
+        """
+        names = cls.normalize(names)
+        if not names:
+            return {}
+        with session.no_autoflush:
+            skills = {skill.name: skill for skill in session.query(cls).filter(cls.name.in_(names))}
+        for name in names:
+            if name not in skills:
+                skills[name] = cls(name=name)
+                session.add(skills[name])
+        return skills
+    
+    def __repr__(self):
+        return f'<Skill {self.name}>'
+
+
+# Skill links, keyed (skill_id, owner) so "who has skill X" is an index range scan
+resume_skill = db.Table(
+    'resume_skill',
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True),
+    db.Column('resume_id', db.Integer, db.ForeignKey('resumes.id'), primary_key=True),
+    db.Index('ix_resume_skill_resume_id', 'resume_id'),
+)
+
+job_skill = db.Table(
+    'job_skill',
+    db.Column('skill_id', db.Integer, db.ForeignKey('skills.id'), primary_key=True),
+    db.Column('job_id', db.Integer, db.ForeignKey('jobs.id'), primary_key=True),
+    db.Index('ix_job_skill_job_id', 'job_id'),
+)
+
+
 class Application(db.Model):
     """
     Application Model - Tracks job applications by job seekers
     """
     __tablename__ = 'applications'
+    __table_args__ = (
+        db.Index('ix_applications_job_id_status', 'job_id', 'status'),
+        db.Index('ix_applications_user_id_job_id', 'user_id', 'job_id'),
+        gin_index('ix_applications_matched_skills_gin', 'matched_skills'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     job_id = db.Column(db.Integer, db.ForeignKey('jobs.id'), nullable=False)
@@ -118,7 +259,7 @@ class Application(db.Model):
     resume_id = db.Column(db.Integer, db.ForeignKey('resumes.id'))
     status = db.Column(db.String(50), default='pending')  # pending, reviewed, shortlisted, rejected, accepted
     match_score = db.Column(db.Float)  # AI-calculated match score (0-100)
-    matched_skills = db.Column(db.JSON)  # Skills that matched
+    matched_skills = db.Column(JSONDocument)  # Skills that matched
     missing_skills = db.Column(db.JSON)  # Skills that didn't match
     cover_letter = db.Column(db.Text)
     applied_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -129,3 +270,65 @@ class Application(db.Model):
     
     def __repr__(self):
         return f'<Application {self.id}>'
+
+
+def job_skill_names(requirements):
+    """Skills a job requires, as found in its requirements text"""
+    return SkillMatcher.extract_skills(requirements)
+
+
+@event.listens_for(db.session, 'before_flush')
+def sync_skill_links(session, flush_context, instances):
+    """
+    Point new and edited resumes and jobs at the Skill rows of their skills:
+    Resume.extracted_skills, and the skills found in Job.requirements
+    """
+    changed = []
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Resume):
+            attr, names_of = 'extracted_skills', list
+        elif isinstance(obj, Job):
+            attr, names_of = 'requirements', job_skill_names
+        else:
+            continue
+        if obj in session.new or inspect(obj).attrs[attr].history.has_changes():
+            changed.append((obj, names_of(getattr(obj, attr) or [])))
+    if not changed:
+        return
+    skills = Skill.for_names(session, [name for _, names in changed for name in names])
+    for obj, names in changed:
+        obj.skills = [skills[name] for name in Skill.normalize(names)]
+
+
+def _count_applications(connection, target, job_id, delta):
+    """
+    Add delta to a job's application_count in the flushing transaction, and to
+    the loaded Job of the session so it reads the new count before a commit
+    """
+    if job_id is None:
+        return
+    jobs = Job.__table__
+    connection.execute(jobs.update().where(jobs.c.id == job_id).values(
+        application_count=jobs.c.application_count + delta, updated_at=jobs.c.updated_at))
+    session = object_session(target)
+    job = session.identity_map.get(identity_key(Job, job_id)) if session is not None else None
+    if job is not None and 'application_count' in job.__dict__:
+        set_committed_value(job, 'application_count', job.__dict__['application_count'] + delta)
+
+
+@event.listens_for(Application, 'after_insert')
+def _application_added(mapper, connection, target):
+    _count_applications(connection, target, target.job_id, 1)
+
+
+@event.listens_for(Application, 'after_update')
+def _application_moved(mapper, connection, target):
+    history = inspect(target).attrs.job_id.history
+    if history.deleted and history.added:
+        _count_applications(connection, target, history.deleted[0], -1)
+        _count_applications(connection, target, history.added[0], 1)
+
+
+@event.listens_for(Application, 'before_delete')
+def _application_deleted(mapper, connection, target):
+    _count_applications(connection, target, target.job_id, -1)
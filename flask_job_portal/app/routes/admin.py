@@ -3,10 +3,12 @@ Admin Routes
 Site administration, user management, analytics
 """
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, current_app
 from flask_login import login_required, current_user
 from functools import wraps
-from app.models import db, User, Job, Application
+from app.models import db, User, Job, Application, job_skill
+from app.skills import users_with_skills, jobs_with_skills, top_skills
+from app.admin_stats import cached_site_stats, users_page
 
 # Create blueprint
 admin_bp = Blueprint('admin', __name__)
@@ -32,13 +34,8 @@ def dashboard():
     """
     Admin dashboard with site statistics
     """
-    # Get statistics
-    total_users = User.query.count()
-    total_job_seekers = User.query.filter_by(role='job_seeker').count()
-    total_recruiters = User.query.filter_by(role='recruiter').count()
-    total_jobs = Job.query.count()
-    active_jobs = Job.query.filter_by(is_active=True).count()
-    total_applications = Application.query.count()
+    # Site counts, shared by all workers for ADMIN_STATS_TTL seconds
+    stats = cached_site_stats()
     
     # Get recent users
     recent_users = User.query.order_by(User.created_at.desc()).limit(10).all()
@@ -47,14 +44,9 @@ def dashboard():
     recent_jobs = Job.query.order_by(Job.created_at.desc()).limit(10).all()
     
     return render_template('admin/dashboard.html',
-                         total_users=total_users,
-                         total_job_seekers=total_job_seekers,
-                         total_recruiters=total_recruiters,
-                         total_jobs=total_jobs,
-                         active_jobs=active_jobs,
-                         total_applications=total_applications,
                          recent_users=recent_users,
-                         recent_jobs=recent_jobs)
+                         recent_jobs=recent_jobs,
+                         **stats)
 
 
 @admin_bp.route('/users')
@@ -62,11 +54,16 @@ def dashboard():
 @admin_required
 def manage_users():
     """
-    Manage all users
+    Manage all users, newest first, with their resume and application counts
+    ?skill=docker,aws keeps users with a resume listing all of the skills
+    ?after=<id> continues after the last user of the previous page
     """
-    page = request.args.get('page', 1, type=int)
-    users = User.query.paginate(page=page, per_page=20)
-    return render_template('admin/manage_users.html', users=users)
+    after = request.args.get('after', type=int)
+    skill_query = request.args.get('skill', '').strip()
+    skills = [s.strip() for s in skill_query.split(',') if s.strip()]
+    users, next_after = users_page(users_with_skills(skills), after, current_app.config['ADMIN_USERS_PER_PAGE'])
+    return render_template('admin/manage_users.html', users=users, after=after, next_after=next_after,
+                           skill_query=skill_query)
 
 
 @admin_bp.route('/user/<int:user_id>/deactivate', methods=['POST'])
@@ -108,10 +105,14 @@ def activate_user(user_id):
 def manage_jobs():
     """
     Manage all job listings
+    ?skill=react&location=berlin keeps jobs requiring all of the skills in a location
     """
     page = request.args.get('page', 1, type=int)
-    jobs = Job.query.paginate(page=page, per_page=20)
-    return render_template('admin/manage_jobs.html', jobs=jobs)
+    skill_query = request.args.get('skill', '').strip()
+    location = request.args.get('location', '').strip()
+    skills = [s.strip() for s in skill_query.split(',') if s.strip()]
+    jobs = jobs_with_skills(skills, location or None).paginate(page=page, per_page=20)
+    return render_template('admin/manage_jobs.html', jobs=jobs, skill_query=skill_query, location=location)
 
 
 @admin_bp.route('/job/<int:job_id>/deactivate', methods=['POST'])
@@ -157,4 +158,6 @@ def analytics():
                          total_applications=total_applications,
                          avg_match_score=round(avg_match_score, 2),
                          status_breakdown=status_breakdown,
-                         top_jobs=top_jobs)
+                         top_jobs=top_jobs,
+                         top_candidate_skills=top_skills(),
+                         top_job_skills=top_skills(job_skill))
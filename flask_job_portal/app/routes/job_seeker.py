@@ -8,6 +8,7 @@ from flask_login import login_required, current_user
 from functools import wraps
 from werkzeug.utils import secure_filename
 import os
+from sqlalchemy.orm import joinedload
 from app.models import db, Resume, Job, Application, User
 from app.ai_engine import ResumeParser, SkillMatcher
 
@@ -43,9 +44,9 @@ def dashboard():
     Shows applications, matched jobs, and resume status
     """
     # Get user's applications
-    applications = Application.query.filter_by(user_id=current_user.id).order_by(
-        Application.applied_at.desc()
-    ).all()
+    applications = Application.query.filter_by(user_id=current_user.id).options(
+        joinedload(Application.job)
+    ).order_by(Application.applied_at.desc()).all()
     
     # Get user's resumes
     resumes = Resume.query.filter_by(user_id=current_user.id).all()
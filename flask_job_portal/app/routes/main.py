@@ -109,7 +109,7 @@ def view_job(job_id):
         ).first() is not None
     
     # Get applications count
-    applications_count = Application.query.filter_by(job_id=job_id).count()
+    applications_count = job.application_count
     
     return render_template('jobs/detail.html', job=job, has_applied=has_applied,
                          applications_count=applications_count)
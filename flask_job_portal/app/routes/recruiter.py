@@ -6,11 +6,15 @@ Job posting, application management, dashboard
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 from functools import wraps
+from sqlalchemy.orm import contains_eager, joinedload
 from app.models import db, Job, Application, User
+from app.database import json_contains
 
 # Create blueprint
 recruiter_bp = Blueprint('recruiter', __name__)
 
+APPLICATION_STATUSES = ['pending', 'reviewed', 'shortlisted', 'rejected', 'accepted']
+
 
 def recruiter_required(f):
     """
@@ -36,17 +40,19 @@ def dashboard():
     # Get recruiter's jobs
     jobs = Job.query.filter_by(recruiter_id=current_user.id).all()
     
-    # Calculate statistics
+    # Calculate statistics from the denormalized counts
     total_jobs = len(jobs)
-    total_applications = sum(len(job.applications) for job in jobs)
+    total_applications = sum(job.application_count for job in jobs)
     pending_applications = Application.query.join(Job).filter(
         Job.recruiter_id == current_user.id,
         Application.status == 'pending'
     ).count()
     
-    # Get recent applications
+    # Get recent applications, with their job and applicant in the same query
     recent_apps = Application.query.join(Job).filter(
         Job.recruiter_id == current_user.id
+    ).options(
+        contains_eager(Application.job), joinedload(Application.user)
     ).order_by(Application.applied_at.desc()).limit(10).all()
     
     return render_template('recruiter/dashboard.html',
@@ -159,23 +165,35 @@ def delete_job(job_id):
 def manage_applications():
     """
     Manage applications for recruiter's jobs
+    ?skill= (repeatable) keeps applications whose matched skills include all of them
+    ?status= shows one status; the counts per status come from one grouped query
     """
     # Get applications for recruiter's jobs
-    applications = Application.query.join(Job).filter(
-        Job.recruiter_id == current_user.id
-    ).order_by(Application.applied_at.desc()).all()
+    query = Application.query.join(Job).filter(Job.recruiter_id == current_user.id)
+    # Matched skills are stored as the matcher's lowercase names
+    skills = [skill.strip().lower() for skill in request.args.getlist('skill') if skill.strip()]
+    if skills:
+        query = query.filter(json_contains(Application.matched_skills, skills))
+    
+    # Count by status
+    status_counts = {status: 0 for status in APPLICATION_STATUSES}
+    status_counts.update(query.with_entities(Application.status, db.func.count())
+                         .group_by(Application.status).all())
     
-    # Group by status
-    by_status = {
-        'pending': [a for a in applications if a.status == 'pending'],
-        'reviewed': [a for a in applications if a.status == 'reviewed'],
-        'shortlisted': [a for a in applications if a.status == 'shortlisted'],
-        'rejected': [a for a in applications if a.status == 'rejected']
-    }
+    status = request.args.get('status', '')
+    if status in APPLICATION_STATUSES:
+        query = query.filter(Application.status == status)
+    page = request.args.get('page', 1, type=int)
+    # Job, applicant and resume of every row are loaded by the same query
+    applications = query.options(
+        contains_eager(Application.job), joinedload(Application.user), joinedload(Application.resume)
+    ).order_by(Application.applied_at.desc()).paginate(page=page, per_page=50)
     
     return render_template('recruiter/manage_applications.html', 
                          applications=applications,
-                         by_status=by_status)
+                         status_counts=status_counts,
+                         status=status,
+                         skills=skills)
 
 
 @recruiter_bp.route('/application/<int:app_id>/update', methods=['POST'])
@@ -194,7 +212,7 @@ def update_application_status(app_id):
         return redirect(url_for('recruiter.manage_applications'))
     
     new_status = request.form.get('status')
-    if new_status in ['pending', 'reviewed', 'shortlisted', 'rejected', 'accepted']:
+    if new_status in APPLICATION_STATUSES:
         app.status = new_status
         db.session.commit()
         flash(f'Application status updated to {new_status}', 'success')
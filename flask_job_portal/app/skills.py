@@ -0,0 +1,88 @@
+"""
+Skill Queries
+Filters over the normalized resume_skill / job_skill link tables. Skill names
+are resolved to ids once, then the link tables are read through their
+(skill_id, owner) primary keys.
+"""
+
+from sqlalchemy import func
+from app.models import db, Skill, User, Resume, Job, resume_skill, job_skill
+
+
+def skill_ids(names):
+    """
+    Resolve skill names to ids
+
+    Args:
+        names: Skill names
+
+    Returns:
+        List of ids, or None if any name is not a known skill
+    """
+    names = Skill.normalize(names)
+    ids = dict(db.session.query(Skill.name, Skill.id).filter(Skill.name.in_(names)).all()) if names else {}
+    return list(ids.values()) if len(ids) == len(names) else None
+
+
+def _having_all(link_table, owner_column, ids):
+    """Subquery of owner ids linked to every one of ids"""
+    owner = link_table.c[owner_column]
+    return db.session.query(owner).filter(link_table.c.skill_id.in_(ids)) \
+        .group_by(owner).having(func.count() == len(ids))
+
+
+def users_with_skills(names):
+    """
+    Users with a resume listing every one of the skills
+
+    Args:
+        names: Skill names
+
+    Returns:
+        Query of User (no rows if a skill is unknown)
+    """
+    ids = skill_ids(names)
+    if ids is None:
+        return User.query.filter(db.false())
+    if not ids:
+        return User.query
+    resumes = db.session.query(Resume.user_id).filter(Resume.id.in_(_having_all(resume_skill, 'resume_id', ids)))
+    return User.query.filter(User.id.in_(resumes))
+
+
+def jobs_with_skills(names, location=None):
+    """
+    Jobs whose requirements name every one of the skills
+
+    Args:
+        names: Skill names
+        location: Case-insensitive substring of Job.location
+
+    Returns:
+        Query of Job (no rows if a skill is unknown)
+    """
+    ids = skill_ids(names)
+    if ids is None:
+        return Job.query.filter(db.false())
+    query = Job.query
+    if ids:
+        query = query.filter(Job.id.in_(_having_all(job_skill, 'job_id', ids)))
+    if location:
+        query = query.filter(Job.location.ilike(f'%{location}%'))
+    return query
+
+
+def top_skills(link_table=resume_skill, limit=10):
+    """
+    Most linked skills
+
+    Args:
+        link_table: resume_skill (candidates) or job_skill (jobs)
+        limit: Number of skills
+
+    Returns:
+        List of (skill name, count) tuples, most common first
+    """
+    count = func.count().label('count')
+    return db.session.query(Skill.name, count).join(link_table, link_table.c.skill_id == Skill.id) \
+        .group_by(Skill.id, Skill.name).order_by(count.desc(), Skill.name).limit(limit).all()
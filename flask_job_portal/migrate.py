@@ -0,0 +1,45 @@
+"""
+Flask Job Portal - Schema Migrations
+Applies pending migrations (app/migrations.py) and prints the query plans of
+the hot route queries, to check they use their indexes
+
+Usage:
+    python migrate.py              # upgrade to the latest version
+    python migrate.py --target 1   # upgrade up to a given version
+    python migrate.py --explain    # upgrade, then print EXPLAIN QUERY PLAN
+"""
+
+import os
+import argparse
+
+
+def migrate(target=None, explain=False):
+    """Upgrade the configured database and optionally print the query plan report"""
+    from app import create_app, db
+    from app.migrations import upgrade, current_version, route_queries, explain_queries, format_report
+
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+    with app.app_context():
+        with db.engine.connect() as conn:
+            print(f"Connected to database: {db.engine.url}")
+            print(f"Schema version: {current_version(conn)}")
+        applied = upgrade(target=target)
+        if applied:
+            print(f"Applied migrations: {', '.join(str(version) for version in applied)}")
+        else:
+            print("No changes needed.")
+        with db.engine.connect() as conn:
+            print(f"Schema version: {current_version(conn)}")
+            if explain:
+                print()
+                print(format_report(explain_queries(conn, route_queries())))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Apply pending schema migrations')
+    parser.add_argument('--target', type=int, help='Stop at this migration version')
+    parser.add_argument('--explain', action='store_true', help='Print query plans of the route queries')
+    args = parser.parse_args()
+    # The script owns the upgrade, so a target version is not overshot at startup
+    os.environ['AUTO_MIGRATE'] = 'false'
+    migrate(args.target, args.explain)
@@ -0,0 +1,32 @@
+import os
+import sys
+
+# The portal's package is `app`, which the repository root's Streamlit app.py would
+# shadow when pytest runs both test trees from the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+if 'app' in sys.modules and not hasattr(sys.modules['app'], '__path__'):
+    del sys.modules['app']
+
+import pytest
+from app import create_app
+
+
+@pytest.fixture
+def app():
+    """Testing app over an in-memory database"""
+    return create_app('testing')
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login():
+    """login(client, user_id) marks the client's session as logged in"""
+    def login(client, user_id):
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user_id)
+            session['_fresh'] = True
+    return login
@@ -0,0 +1,66 @@
+import os
+import sys
+
+# Add parent directory to path to import app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+from app.models import db, User, Job, Resume, Application
+from app.admin_stats import cached_json, site_stats, users_page
+from app.skills import users_with_skills
+
+
+def test_cached_json(tmp_path):
+    path = str(tmp_path / 'stats.json')
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'calls': len(calls)}
+
+    assert cached_json(path, 60, compute) == {'calls': 1}
+    assert cached_json(path, 60, compute) == {'calls': 1}
+    os.utime(path, (0, 0))
+    assert cached_json(path, 60, compute) == {'calls': 2}
+    assert cached_json(path, 0, compute) == {'calls': 3}
+    assert os.listdir(tmp_path) == ['stats.json']
+
+
+def test_site_stats_and_users_page(app):
+    with app.app_context():
+        recruiter = User(username='recruiter', email='recruiter@example.com', password_hash='x', role='recruiter')
+        db.session.add(recruiter)
+        db.session.flush()
+        jobs = [Job(title='Backend', description='APIs', requirements='Python', recruiter_id=recruiter.id),
+                Job(title='Old', description='Gone', requirements='Java', recruiter_id=recruiter.id, is_active=False)]
+        db.session.add_all(jobs)
+        seekers = [User(username=f'seeker{i}', email=f'seeker{i}@example.com', password_hash='x') for i in range(4)]
+        db.session.add_all(seekers)
+        resume = Resume(user=seekers[0], filename='cv.pdf', filepath='/cv.pdf', extracted_skills=['python'])
+        db.session.add_all([resume, Resume(user=seekers[0], filename='cv2.pdf', filepath='/cv2.pdf'),
+                            Application(user=seekers[0], job=jobs[0], resume=resume),
+                            Application(user=seekers[1], job=jobs[0])])
+        db.session.commit()
+
+        assert site_stats() == {'total_users': 5, 'total_job_seekers': 4, 'total_recruiters': 1, 'total_jobs': 2,
+                                'active_jobs': 1, 'total_applications': 2}
+
+        # Pages follow the autoincrement id, newest first, in one statement each
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            first, after = users_page(User.query, per_page=3)
+            rest, last = users_page(User.query, after, per_page=3)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+        assert len(statements) == 2
+        assert [user.username for user, _, _ in first + rest] == \
+            ['seeker3', 'seeker2', 'seeker1', 'seeker0', 'recruiter']
+        assert last is None and after == first[-1][0].id
+        assert [(resumes, applications) for _, resumes, applications in first + rest] == \
+            [(0, 0), (0, 0), (0, 1), (2, 1), (0, 0)]
+
+        # A filtered query pages the same way
+        rows, after = users_page(users_with_skills(['Python']), per_page=3)
+        assert [(user.username, resumes) for user, resumes, _ in rows] == [('seeker0', 2)] and after is None
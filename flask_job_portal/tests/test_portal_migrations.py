@@ -0,0 +1,90 @@
+import os
+import sys
+import sqlite3
+
+# Add parent directory to path to import app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sqlalchemy as sa
+from app import db
+from app.models import ResumeText
+from app.migrations import upgrade, current_version, latest_version, route_queries, explain_queries
+
+
+def make_legacy_db(db_path):
+    # Schema of a database created by the old db.create_all() startup, before version tracking
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(80) NOT NULL UNIQUE,
+                            email VARCHAR(120) NOT NULL UNIQUE, password_hash VARCHAR(255) NOT NULL,
+                            role VARCHAR(20) NOT NULL, first_name VARCHAR(100), last_name VARCHAR(100),
+                            phone VARCHAR(20), bio TEXT, company VARCHAR(255), created_at DATETIME,
+                            updated_at DATETIME, is_active BOOLEAN);
+        CREATE TABLE jobs (id INTEGER PRIMARY KEY, title VARCHAR(255) NOT NULL, description TEXT NOT NULL,
+                           requirements TEXT NOT NULL, location VARCHAR(255), salary_min FLOAT, salary_max FLOAT,
+                           job_type VARCHAR(50), company VARCHAR(255), recruiter_id INTEGER NOT NULL,
+                           is_active BOOLEAN, created_at DATETIME, updated_at DATETIME);
+        CREATE TABLE resumes (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, filename VARCHAR(255) NOT NULL,
+                              filepath VARCHAR(500) NOT NULL, extracted_text TEXT, extracted_skills JSON,
+                              is_primary BOOLEAN, created_at DATETIME, updated_at DATETIME);
+        CREATE TABLE applications (id INTEGER PRIMARY KEY, job_id INTEGER NOT NULL, user_id INTEGER NOT NULL,
+                                   resume_id INTEGER, status VARCHAR(50), match_score FLOAT, matched_skills JSON,
+                                   missing_skills JSON, cover_letter TEXT, applied_at DATETIME,
+                                   updated_at DATETIME);
+        INSERT INTO users (id, username, email, password_hash, role) VALUES
+            (1, 'recruiter', 'recruiter@example.com', 'x', 'recruiter'),
+            (2, 'seeker', 'seeker@example.com', 'x', 'job_seeker');
+        INSERT INTO jobs (id, title, description, requirements, recruiter_id, is_active) VALUES
+            (1, 'Backend', 'Build APIs', 'Python, SQL and Docker', 1, 1),
+            (2, 'Frontend', 'Build pages', 'React', 1, 1);
+        INSERT INTO resumes (id, user_id, filename, filepath, extracted_text, extracted_skills) VALUES
+            (1, 2, 'cv.pdf', '/cv.pdf', 'Python developer', '["Python", "sql", "python"]');
+        INSERT INTO applications (job_id, user_id, resume_id, status) VALUES (1, 2, 1, 'pending'), (2, 2, 1, 'pending');
+        INSERT INTO applications (job_id, user_id, resume_id, status) VALUES (1, 1, NULL, 'reviewed');
+    """)
+    conn.commit()
+    conn.close()
+
+
+def test_upgrade_legacy_database(tmp_path):
+    db_path = str(tmp_path / 'job_portal.db')
+    make_legacy_db(db_path)
+    engine = sa.create_engine(f'sqlite:///{db_path}')
+
+    with engine.connect() as conn:
+        assert current_version(conn) == 0
+    assert upgrade(engine, target=1) == [1]
+    assert upgrade(engine) == list(range(2, latest_version() + 1))
+    assert upgrade(engine) == []
+
+    inspector = sa.inspect(engine)
+    assert 'extracted_text' not in {col['name'] for col in inspector.get_columns('resumes')}
+    assert {'ix_applications_job_id_status', 'ix_applications_user_id_job_id'} <= \
+        {index['name'] for index in inspector.get_indexes('applications')}
+    with engine.connect() as conn:
+        assert current_version(conn) == latest_version()
+        # Resume text moved to the compressed side table
+        body = conn.exec_driver_sql("SELECT body FROM resume_texts WHERE resume_id = 1").scalar()
+        assert ResumeText.decode(body) == 'Python developer'
+        # Skill lists and job requirements are backfilled into the link tables
+        resume_skills = conn.exec_driver_sql("SELECT s.name FROM resume_skill rs JOIN skills s ON s.id = rs.skill_id "
+                                             "WHERE rs.resume_id = 1 ORDER BY s.name").scalars().all()
+        assert resume_skills == ['python', 'sql']
+        job_skills = conn.exec_driver_sql("SELECT s.name FROM job_skill js JOIN skills s ON s.id = js.skill_id "
+                                          "WHERE js.job_id = 1 ORDER BY s.name").scalars().all()
+        assert job_skills == ['docker', 'python', 'sql']
+        # Application counts are backfilled
+        counts = conn.exec_driver_sql("SELECT application_count FROM jobs ORDER BY id").scalars().all()
+        assert counts == [2, 1]
+    engine.dispose()
+
+
+def test_route_queries_use_indexes(app):
+    # The factory migrates the in-memory test database at startup
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert current_version(conn) == latest_version()
+            report = explain_queries(conn, route_queries())
+    assert len(report) == len(route_queries())
+    for label, plan in report:
+        assert not any(step.startswith('SCAN') and 'INDEX' not in step for step in plan), (label, plan)
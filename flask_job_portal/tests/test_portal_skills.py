@@ -0,0 +1,53 @@
+import os
+import sys
+
+# Add parent directory to path to import app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models import db, User, Job, Resume, Skill, job_skill
+from app.skills import skill_ids, users_with_skills, jobs_with_skills, top_skills
+
+
+def add_people_and_jobs():
+    """A recruiter with two jobs and three seekers with one resume each; returns the recruiter id"""
+    recruiter = User(username='recruiter', email='recruiter@example.com', password_hash='x', role='recruiter')
+    db.session.add(recruiter)
+    db.session.flush()
+    db.session.add_all([
+        Job(title='Backend', description='APIs', requirements='Python, SQL and Docker', company='Acme',
+            location='Berlin', recruiter_id=recruiter.id),
+        Job(title='Data', description='Models', requirements='Python and pandas', company='Acme',
+            location='Remote', recruiter_id=recruiter.id),
+    ])
+    for name, skills in [('ann', ['Python', 'Docker']), ('ben', ['python', 'sql']), ('cat', [])]:
+        seeker = User(username=name, email=f'{name}@example.com', password_hash='x')
+        db.session.add_all([seeker, Resume(user=seeker, filename=f'{name}.pdf', filepath=f'/{name}.pdf',
+                                           extracted_skills=skills)])
+    db.session.commit()
+    return recruiter.id
+
+
+def test_skill_queries(app):
+    with app.app_context():
+        add_people_and_jobs()
+        assert Skill.normalize([' Docker', 'python', 'PYTHON', '']) == ['docker', 'python']
+        assert skill_ids(['kubernetes', 'python']) is None and skill_ids([]) == []
+
+        # Names match whatever their case, and every skill is required
+        assert {user.username for user in users_with_skills(['PYTHON'])} == {'ann', 'ben'}
+        assert [user.username for user in users_with_skills(['python', 'docker'])] == ['ann']
+        assert users_with_skills(['kubernetes']).count() == 0
+        assert users_with_skills([]).count() == 4
+
+        assert [job.title for job in jobs_with_skills(['Docker'])] == ['Backend']
+        assert [job.title for job in jobs_with_skills(['python'], location='remote')] == ['Data']
+        assert top_skills(limit=1) == [('python', 2)]
+
+        # Edited resumes and requirements move their links
+        Resume.query.filter_by(filename='cat.pdf').one().extracted_skills = ['Docker']
+        Job.query.filter_by(title='Data').one().requirements = 'Docker and Kubernetes'
+        db.session.commit()
+        assert {user.username for user in users_with_skills(['docker'])} == {'ann', 'cat'}
+        assert {job.title for job in jobs_with_skills(['docker'])} == {'Backend', 'Data'}
+        assert ('pandas', 1) not in top_skills(job_skill)
+
@@ -0,0 +1,131 @@
+import os
+import sys
+
+# Add parent directory to path to import app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+from app import create_app
+from app.models import db, User, Job, Resume, Application
+from app.migrations import MIGRATIONS
+
+REQUIREMENTS = 'Python, SQL and Docker experience'
+
+
+def add_applications(recruiter_id, jobs, seekers):
+    """Post jobs for the recruiter and have seekers apply to each with a resume"""
+    posted = [Job(title=f'Job {i}', description='Build things', requirements=REQUIREMENTS,
+                  company='Acme', recruiter_id=recruiter_id) for i in range(jobs)]
+    db.session.add_all(posted)
+    for i in range(seekers):
+        seeker = User(username=f'seeker{User.query.count()}', email=f'seeker{User.query.count()}@example.com',
+                      password_hash='x', first_name='Job', last_name=f'Seeker {i}')
+        resume = Resume(user=seeker, filename=f'cv{i}.pdf', filepath=f'/cv{i}.pdf')
+        db.session.add_all([seeker, resume])
+        for job in posted:
+            db.session.add(Application(user=seeker, job=job, resume=resume, match_score=70.0))
+    db.session.commit()
+
+
+def count_queries(client, url):
+    """Number of statements a GET runs"""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    with client.application.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', listener)
+    assert response.status_code == 200, url
+    return len(statements)
+
+
+def test_application_count_stays_in_sync():
+    app = create_app('testing')
+    with app.app_context():
+        recruiter = User(username='recruiter', email='recruiter@example.com', password_hash='x', role='recruiter')
+        db.session.add(recruiter)
+        db.session.commit()
+        add_applications(recruiter.id, jobs=2, seekers=3)
+        job = Job.query.first()
+        assert job.application_count == job.get_application_count() == 3
+
+        # The loaded Job follows before the commit, the row after it
+        db.session.delete(Application.query.filter_by(job_id=job.id).first())
+        db.session.flush()
+        assert job.application_count == 2
+        db.session.commit()
+        assert db.session.get(Job, job.id).application_count == 2
+
+        # Deleting a seeker takes their applications and counts with them
+        db.session.delete(User.query.filter_by(username='seeker1').one())
+        db.session.commit()
+        assert [job.application_count for job in Job.query.order_by(Job.id)] == [2, 2]
+
+        # The migration backfill recounts from the applications table
+        db.session.execute(Job.__table__.update().values(application_count=0))
+        db.session.commit()
+        backfill = dict((number, apply) for number, _, apply in MIGRATIONS)[6]
+        with db.engine.begin() as conn:
+            backfill(conn)
+        db.session.expire_all()
+        assert [job.application_count for job in Job.query.order_by(Job.id)] == [2, 2]
+
+
+def test_recruiter_pages_query_count():
+    app = create_app('testing')
+    with app.app_context():
+        recruiter = User(username='recruiter', email='recruiter@example.com', password_hash='x', role='recruiter')
+        db.session.add(recruiter)
+        db.session.commit()
+        recruiter_id = recruiter.id
+        add_applications(recruiter_id, jobs=1, seekers=1)
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(recruiter_id)
+        session['_fresh'] = True
+
+    pages = ['/recruiter/dashboard', '/recruiter/applications', '/recruiter/applications?status=pending']
+    small = {url: count_queries(client, url) for url in pages}
+    with app.app_context():
+        add_applications(recruiter_id, jobs=3, seekers=4)
+    large = {url: count_queries(client, url) for url in pages}
+
+    # The number of statements does not grow with jobs or applications
+    assert small == large, (small, large)
+    assert large['/recruiter/dashboard'] <= 4
+    assert large['/recruiter/applications'] <= 4
+    page = client.get('/recruiter/dashboard')
+    assert b'<h3>13</h3>' in page.data and b'1 applications' in page.data and b'4 applications' in page.data
+
+
+def test_application_filters_keep_skill(app, client, login):
+    with app.app_context():
+        recruiter = User(username='recruiter', email='recruiter@example.com', password_hash='x', role='recruiter')
+        db.session.add(recruiter)
+        db.session.commit()
+        recruiter_id = recruiter.id
+        add_applications(recruiter_id, jobs=1, seekers=2)
+        # matched_skills are the matcher's lowercase names
+        Application.query.first().matched_skills = ['python', 'sql']
+        db.session.commit()
+
+    login(client, recruiter_id)
+    page = client.get('/recruiter/applications?skill=Python&skill=SQL')
+    assert page.status_code == 200 and page.data.count(b'Job Seeker') == 1
+    # Status tabs link back with the skill filter
+    assert b'status=pending&amp;skill=python&amp;skill=sql' in page.data
+    assert b'href="/recruiter/applications?skill=python&amp;skill=sql"' in page.data
+
+
+if __name__ == "__main__":
+    try:
+        test_application_count_stays_in_sync()
+        test_recruiter_pages_query_count()
+        print("ALL RECRUITER QUERY TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        sys.exit(1)
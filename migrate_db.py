@@ -1,59 +1,61 @@
+"""
+Applies pending schema migrations (flask_app/migrations.py) and prints the
+query plans of the hot route queries, to check they use their indexes.
+
+Usage:
+    python migrate_db.py              # upgrade to the latest version
+    python migrate_db.py --target 1   # upgrade up to a given version
+    python migrate_db.py --explain    # upgrade, then print EXPLAIN QUERY PLAN
+    python migrate_db.py --vacuum     # upgrade, then VACUUM to return freed pages (SQLite)
+"""
 
-import sqlite3
 import os
+import argparse
+import logging
+from flask_app import create_app, db
+from flask_app.migrations import upgrade, current_version, route_queries, explain_queries, format_report
+
 
-# Path to database
-db_path = os.path.join('instance', 'app.db')
-
-def check_and_add_column(cursor, table, column, col_type):
-    """Check if a column exists, if not add it."""
-    print(f"Checking {table}.{column}...")
-    cursor.execute(f"PRAGMA table_info({table})")
-    columns = [info[1] for info in cursor.fetchall()]
-    
-    if column not in columns:
-        print(f"  Adding column {column}...")
-        try:
-            # SQLite doesn't support adding JSON type directly in older versions, usually TEXT or just default
-            # But Flask-SQLAlchemy usually maps it. JSON in SQLite is just TEXT.
-            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
-            print("  Done.")
-            return True
-        except Exception as e:
-            print(f"  Error adding column: {e}")
-            return False
-    else:
-        print("  Column already exists.")
-        return False
-
-def migrate():
-    if not os.path.exists(db_path):
-        print(f"Database not found at {db_path}. No migration needed (run reset_db.py instead).")
+def print_size(conn):
+    if conn.dialect.name != 'sqlite':
         return
+    page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+    pages = conn.exec_driver_sql("PRAGMA page_count").scalar()
+    free = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+    print(f"Database size: {pages * page_size / 1024:.0f} KiB ({free * page_size / 1024:.0f} KiB free pages)")
+
+
+def migrate(target=None, explain=False, vacuum=False):
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+    with app.app_context():
+        with db.engine.connect() as conn:
+            print(f"Connected to database: {db.engine.url}")
+            print(f"Schema version: {current_version(conn)}")
+            print_size(conn)
+        applied = upgrade(target=target)
+        if applied:
+            print(f"Applied migrations: {', '.join(str(version) for version in applied)}")
+        else:
+            print("No changes needed.")
+        if vacuum and db.engine.dialect.name == 'sqlite':
+            with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+                conn.exec_driver_sql("VACUUM")
+        with db.engine.connect() as conn:
+            print(f"Schema version: {current_version(conn)}")
+            print_size(conn)
+            if explain:
+                print()
+                print(format_report(explain_queries(conn, route_queries())))
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    print(f"Connected to database: {db_path}")
-    
-    changes = False
-    
-    # 1. Add interview_questions
-    # We use TEXT because SQLite stores JSON as TEXT
-    if check_and_add_column(cursor, 'analyses', 'interview_questions', 'TEXT'):
-        changes = True
-        
-    # 2. Add skill_resources
-    if check_and_add_column(cursor, 'analyses', 'skill_resources', 'TEXT'):
-        changes = True
-
-    if changes:
-        conn.commit()
-        print("\nMigration completed successfully.")
-    else:
-        print("\nNo changes needed.")
-        
-    conn.close()
 
 if __name__ == "__main__":
-    migrate()
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--target', type=int, help='Stop at this migration version')
+    parser.add_argument('--explain', action='store_true', help='Print query plans of the route queries')
+    parser.add_argument('--vacuum', action='store_true', help='Rebuild the SQLite file to reclaim free pages')
+    args = parser.parse_args()
+    # Migrations log a summary line, e.g. the space a compaction reclaimed
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    # The script owns the upgrade, so a target version is not overshot at startup
+    os.environ['AUTO_MIGRATE'] = 'false'
+    migrate(args.target, args.explain, args.vacuum)
@@ -1,5 +1,6 @@
 from flask_app import create_app, db
 from flask_app.models import User, Resume, JobPosting, Analysis
+from flask_app.migrations import upgrade, schema_migrations
 import os
 import traceback
 
@@ -18,9 +19,10 @@ def seed_database():
                 print(f"Warning: Could not remove database file: {e}")
                 # Try dropping all instead
                 db.drop_all()
+                schema_migrations.drop(db.engine, checkfirst=True)
         
         # 2. Create tables
-        db.create_all()
+        upgrade()
         print("Created all tables.")
 
         try:
@@ -117,13 +119,12 @@ def seed_database():
                 ],
                 match_percentage=85,
                 ats_score=92.0,
-                ats_details={
-                    'findings': [
-                        "Contact information is well-formatted.",
-                        "Standard section headers detected correctly.",
-                        "Clear focus on backend technologies."
-                    ]
-                }
+                # Codes without a message in NLPProcessor.ATS_FINDINGS are shown as written
+                ats_codes=[
+                    "Contact information is well-formatted.",
+                    "Standard section headers detected correctly.",
+                    "Clear focus on backend technologies."
+                ]
             )
             db.session.add(demo_analysis)
             
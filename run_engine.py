@@ -0,0 +1,33 @@
+"""
+Runs the engine sidecar: one process per host serving resume parsing, NLP and
+matching to every web worker over a Unix socket, so spaCy and the matcher
+state are loaded once per machine instead of once per worker.
+
+Start it with the same environment as the web app, then point the workers at
+it with AI_ENGINE_SOCKET. Workers fall back to in-process work whenever the
+sidecar is unreachable. The sidecar only opens resume paths under the app's
+UPLOAD_FOLDER; workers send any other file as its bytes.
+
+Usage:
+    AI_ENGINE_SOCKET=/tmp/resume-engine.sock python run_engine.py
+    AI_ENGINE_SOCKET=/tmp/resume-engine.sock gunicorn -w 4 -b 0.0.0.0:5000 run:app
+"""
+
+import os
+from flask_app import create_app
+from flask_app.ai_engine.sidecar import serve, ENV_VAR, DEFAULT_SOCKET_PATH
+
+app = create_app(os.environ.get('FLASK_ENV', 'development'))
+
+
+if __name__ == '__main__':
+    with app.app_context():
+        serve(
+            os.environ.get(ENV_VAR) or DEFAULT_SOCKET_PATH,
+            idf_path=app.config.get('HASHING_IDF_PATH'),
+            lsa_model_path=app.config.get('LSA_MODEL_PATH'),
+            cooccurrence_path=app.config.get('SKILL_COOCCURRENCE_PATH'),
+            max_batch=app.config.get('AI_ENGINE_MAX_BATCH', 32),
+            max_wait=app.config.get('AI_ENGINE_MAX_WAIT', 0.005),
+            upload_root=app.config.get('UPLOAD_FOLDER'),
+        )
@@ -0,0 +1,42 @@
+import os
+import sys
+
+# Add parent directory to path to import flask_app
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from flask_app import create_app, db, login_manager
+from flask_app.models import User
+
+
+# run.py registers the loader for the served app; the tests build their own apps
+@login_manager.user_loader
+def load_user(user_id):
+    return db.session.get(User, user_id)
+
+
+@pytest.fixture
+def app(tmp_path):
+    """Testing app with uploads and the report cache in a temporary directory"""
+    app = create_app('testing')
+    app.config['UPLOAD_FOLDER'] = str(tmp_path / 'uploads')
+    app.config['REPORT_CACHE_DIR'] = str(tmp_path / 'report_cache')
+    # The test client talks plain HTTP
+    app.config['SESSION_COOKIE_SECURE'] = False
+    return app
+
+
+@pytest.fixture
+def client(app):
+    """Test client; its requests run outside a held app context, so each one gets its own `g` (and user)"""
+    return app.test_client()
+
+
+@pytest.fixture
+def login():
+    """login(client, user_id) marks the client's session as logged in"""
+    def login(client, user_id):
+        with client.session_transaction() as session:
+            session['_user_id'] = user_id
+            session['_fresh'] = True
+    return login
@@ -0,0 +1,82 @@
+import os
+import sys
+
+# Add parent directory to path to import flask_app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from datetime import datetime
+from flask_sqlalchemy.record_queries import get_recorded_queries
+from flask_app import db
+from flask_app.models import User, Resume, Analysis, JobPosting
+from flask_app.admin_stats import site_stats, users_page, cached_json
+
+
+def test_cached_json(tmp_path):
+    path = str(tmp_path / 'stats.json')
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'calls': len(calls)}
+
+    assert cached_json(path, 60, compute) == {'calls': 1}
+    assert cached_json(path, 60, compute) == {'calls': 1}
+    os.utime(path, (0, 0))
+    assert cached_json(path, 60, compute) == {'calls': 2}
+    assert cached_json(path, 0, compute) == {'calls': 3}
+    assert os.listdir(tmp_path) == ['stats.json']
+
+
+def test_admin_dashboard(app, client, login):
+    app.config['ADMIN_USERS_PER_PAGE'] = 2
+    with app.app_context():
+        admin = User(username='admin', email='admin@example.com', password_hash='x', is_admin=True)
+        db.session.add(admin)
+        db.session.flush()
+        users = []
+        for name in ('alice', 'bob', 'carol'):
+            users.append(User(username=name, email=f'{name}@example.com', password_hash='x'))
+            db.session.add(users[-1])
+            db.session.flush()
+        # An account from before time-ordered ids: its random id sorts ahead of the newer ones
+        db.session.add(User(id='ffffffff-ffff-4fff-bfff-ffffffffffff', username='legacy',
+                            email='legacy@example.com', password_hash='x', created_at=datetime(2020, 1, 1)))
+        resume = Resume(user_id=users[0].id, filename='a.pdf', filepath='/a')
+        db.session.add_all([resume, JobPosting(title='Dev', company='Acme', description='Build things')])
+        db.session.flush()
+        db.session.add(Analysis(user_id=users[0].id, resume_id=resume.id, match_score=50.0))
+        db.session.commit()
+
+        assert site_stats() == {'total_users': 5, 'total_resumes': 1, 'total_analyses': 1, 'total_jobs': 1}
+        first, after = users_page(per_page=3)
+        rest, last = users_page(after, per_page=3)
+        assert len(first) == 3 and len(rest) == 2 and last is None
+        keys = [(user.created_at, user.id) for user, _, _ in first + rest]
+        assert keys == sorted(keys, reverse=True) and rest[-1][0].username == 'legacy'
+        assert sorted((user.username, resumes, analyses) for user, resumes, analyses in first + rest) == \
+            [('admin', 0, 0), ('alice', 1, 1), ('bob', 0, 0), ('carol', 0, 0), ('legacy', 0, 0)]
+        with pytest.raises(ValueError):
+            users_page('not-a-cursor')
+        admin_id = admin.id
+
+    login(client, admin_id)
+    with app.app_context():
+        page = client.get('/admin/')
+        assert page.status_code == 200
+        # Stats, the page of users and the logged-in user, no per-user loads
+        assert 0 < len(get_recorded_queries()) <= 3
+    # Follow the Older links to the last page
+    pages = [page.data]
+    while b'Older' in pages[-1]:
+        next_page = pages[-1].split(b'after=')[1].split(b'"')[0].decode()
+        pages.append(client.get(f'/admin/?after={next_page}').data)
+    assert len(pages) == 3
+    assert client.get('/admin/?after=not-a-cursor').status_code == 400
+    for name in (b'alice@', b'bob@', b'carol@', b'admin@', b'legacy@'):
+        assert sum(name in data for data in pages) == 1
+    assert b'legacy@' in pages[-1]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
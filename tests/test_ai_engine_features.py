@@ -0,0 +1,302 @@
+import os
+import sys
+import tempfile
+
+# Add parent directory to path to import flask_app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from flask_app.ai_engine import ResumeMatcher, NLPProcessor, HashingFeatureExtractor, IncrementalIDF, LSAEmbedder, RandomProjectionLSH, MinHasher, LSHIndex, SkillCooccurrence, ReportGenerator, EngineClient, EngineServer
+
+RESUME = "Python developer with Flask, Docker and AWS experience. Built machine learning pipelines in pandas."
+JD = "Looking for a Python engineer who knows Flask, SQL and Docker. AWS is a plus."
+
+
+def test_hashing_score_tracks_fitted_tfidf():
+    fitted = ResumeMatcher.calculate_tfidf_score(RESUME, JD)
+    hashed = ResumeMatcher.calculate_hashing_score(RESUME, JD)
+    print(f"Fitted: {fitted:.4f}  Hashed: {hashed:.4f}")
+    assert abs(fitted - hashed) < 1e-3
+
+
+def test_incremental_idf_matches_single_pass():
+    extractor = HashingFeatureExtractor(n_bits=12)
+    docs = [RESUME, JD, "Java and Spring Boot backend developer", "React and TypeScript frontend"]
+
+    streamed = IncrementalIDF(extractor.n_features)
+    for counts in extractor.iter_transform(iter(docs), batch_size=3):
+        streamed.partial_fit(counts)
+
+    single = IncrementalIDF(extractor.n_features).partial_fit(extractor.transform(docs))
+
+    assert streamed.n_documents == 4
+    assert (streamed.document_frequency == single.document_frequency).all()
+    vectors = streamed.transform(extractor.transform(docs))
+    assert vectors.dtype.name == 'float32'
+    assert vectors.shape == (4, 2 ** 12)
+
+
+def test_hybrid_score_hashing_mode():
+    score = ResumeMatcher.calculate_hybrid_score(RESUME, JD, ["python", "flask", "docker", "aws"],
+                                                 ["python", "flask", "sql", "docker", "aws"],
+                                                 feature_mode='hashing')
+    print(f"Hybrid (hashing): {score}%")
+    assert 0 < score <= 100
+
+
+def test_lsa_embeddings_and_lsh_index():
+    corpus = [RESUME, JD,
+              "Machine learning engineer training deep learning models with pytorch",
+              "ML engineer: deep learning, model training and pytorch deployment",
+              "Frontend developer building React and TypeScript interfaces",
+              "UI engineer for React, CSS and TypeScript web apps"]
+    embedder = LSAEmbedder(n_components=4).fit(corpus)
+    vectors = embedder.transform(corpus)
+    assert vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+    blob = embedder.to_bytes(vectors[0])
+    assert np.array_equal(LSAEmbedder.from_bytes(blob), vectors[0])
+
+    index = RandomProjectionLSH(embedder.dim, n_tables=4, n_bits=4)
+    index.add(list(range(len(corpus))), vectors)
+    hits = index.query(vectors[2], k=2)
+    print(f"LSH hits for doc 2: {hits}")
+    assert hits[0][0] == 2
+
+    score = ResumeMatcher.calculate_hybrid_score(corpus[2], corpus[3], ["pytorch"], ["pytorch"],
+                                                 embedder=embedder)
+    assert 0 < score <= 100
+
+
+def test_analyze_batch_matches_single_pair():
+    resumes = [RESUME, "Java Spring Boot developer with SQL and Kubernetes", RESUME]
+    jds = [JD, "Frontend role: React, TypeScript and CSS"]
+
+    results = list(ResumeMatcher.analyze_batch(resumes, jds, cross_product=True, batch_size=4))
+    assert len(results) == 6
+
+    for result in results:
+        resume_text, jd_text = resumes[result['resume_index']], jds[result['jd_index']]
+        single = ResumeMatcher.analyze_match(resume_text, jd_text,
+                                             NLPProcessor.extract_skills(resume_text),
+                                             NLPProcessor.extract_skills(jd_text))
+        assert single['score'] == result['score']
+        assert single['missing_skills'] == result['missing_skills']
+        assert single['interview_questions'] == result['interview_questions']
+
+
+def test_minhash_lsh_finds_near_duplicates():
+    hasher = MinHasher()
+    base = " ".join(f"{RESUME} Project {i}: built service number {i} with Flask." for i in range(10))
+    revised = base.replace("Project 9: built service number 9", "Project 9: shipped service number 9")
+    other = "Java Spring Boot developer with SQL and Kubernetes. " * 5
+
+    index = LSHIndex()
+    index.add('base', hasher.signature(base))
+    index.add('other', hasher.signature(other))
+
+    matches = index.query(hasher.signature(revised), threshold=0.8)
+    print(f"Matches: {matches}")
+    assert [item_id for item_id, _ in matches] == ['base']
+    assert MinHasher.jaccard(hasher.signature(base), hasher.signature(base)) == 1.0
+    signature = hasher.signature(base)
+    assert np.array_equal(MinHasher.from_bytes(MinHasher.to_bytes(signature)), signature)
+
+
+def test_skill_cooccurrence_partial_credit():
+    corpus = [["pytorch", "deep learning", "python"]] * 4 + [["react", "css", "javascript"]] * 4 + [["python", "sql"]] * 2
+    matrix = SkillCooccurrence.build(corpus)
+
+    with tempfile.TemporaryDirectory() as directory:
+        matrix.save(directory)
+        mapped = SkillCooccurrence.load(directory)
+        assert isinstance(mapped.data, np.memmap)
+        print(f"Related to pytorch: {mapped.related('pytorch')}")
+        assert 'deep learning' in mapped.related('pytorch')
+        assert 'react' not in mapped.related('pytorch')
+
+        strict = ResumeMatcher._skill_match_ratio(["pytorch"], ["deep learning", "react"])
+        partial = ResumeMatcher._skill_match_ratio(["pytorch"], ["deep learning", "react"], mapped)
+        print(f"Strict: {strict}  Partial: {partial}")
+        assert strict == 0.0
+        assert 0.0 < partial <= SkillCooccurrence.PARTIAL_CREDIT_WEIGHT / 2
+        assert ResumeMatcher._skill_match_ratio(["react"], ["react"], mapped) == 1.0
+        del mapped
+
+
+def test_batch_report_generation():
+    reports = [{'resume_name': f'resume_{i}.pdf', 'match_score': 50 + i, 'matched_skills': ['python'],
+                'missing_skills': ['aws'] * i, 'suggestions': ['Learn AWS'], 'ats_score': 80,
+                'ats_findings': ['Contact information found.']} for i in range(3)]
+    pdfs = list(ReportGenerator.generate_reports(reports))
+    assert len(pdfs) == 3
+    assert all(pdf.startswith(b'%PDF') for pdf in pdfs)
+    single = ReportGenerator.generate_report(**reports[0]).getvalue()
+    assert single.startswith(b'%PDF')
+
+
+def test_engine_sidecar_matches_in_process():
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    
+    socket_path = os.path.join(tempfile.mkdtemp(), 'engine.sock')
+    server = EngineServer(socket_path, max_batch=8, max_wait=0.01)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = EngineClient(socket_path)
+        assert client.call('ping') == 'pong'
+        assert client.call('preprocess_text', RESUME) == NLPProcessor.preprocess_text(RESUME)
+        
+        resume_skills = NLPProcessor.extract_skills(RESUME)
+        jds = [JD, "Java developer with Spring Boot", "React and TypeScript frontend", ""]
+        expected = [ResumeMatcher.analyze_match(RESUME, jd, resume_skills, NLPProcessor.extract_skills(jd))
+                    for jd in jds]
+        
+        # Concurrent requests from several threads are batched together on the server
+        def remote(jd):
+            return client.call('analyze_match', RESUME, jd, resume_skills, NLPProcessor.extract_skills(jd))
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(remote, jds))
+        assert results == expected
+        client.close()
+        
+        # The Streamlit app and the FastAPI workers lemmatize through the sidecar too
+        import utils.nlp_processing as nlp_processing
+        from flask_app.ai_engine.sidecar import reset_engine_client
+        expected = NLPProcessor.preprocess_texts([RESUME, JD])
+        loaded, nlp_processing._nlp = nlp_processing._nlp, None
+        os.environ[nlp_processing.ENGINE_SOCKET_ENV] = socket_path
+        try:
+            assert nlp_processing.warm_up() is None
+            assert nlp_processing.preprocess_text(RESUME) == expected[0]
+            assert nlp_processing.preprocess_texts([RESUME, JD]) == expected
+            assert nlp_processing._nlp is None
+        finally:
+            del os.environ[nlp_processing.ENGINE_SOCKET_ENV]
+            reset_engine_client()
+            nlp_processing._nlp = loaded
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not os.path.exists(socket_path)
+
+
+def test_engine_sidecar_file_access():
+    import threading
+    from flask_app.ai_engine import ResumeParser
+    from flask_app.ai_engine.sidecar import EngineError, ENV_VAR, reset_engine_client
+    
+    upload_root, outside = tempfile.mkdtemp(), tempfile.mkdtemp()
+    pdf = ReportGenerator.generate_report(resume_name='cv.pdf', match_score=50, matched_skills=['python'],
+                                          missing_skills=[], suggestions=[], ats_score=80,
+                                          ats_findings=[]).getvalue()
+    for directory in (upload_root, outside):
+        with open(os.path.join(directory, 'cv.pdf'), 'wb') as f:
+            f.write(pdf)
+    os.symlink(os.path.join(outside, 'cv.pdf'), os.path.join(upload_root, 'link.pdf'))
+    expected = ResumeParser.extract_text_from_pdf(os.path.join(outside, 'cv.pdf'))
+    
+    socket_path = os.path.join(tempfile.mkdtemp(), 'engine.sock')
+    server = EngineServer(socket_path, upload_root=upload_root)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = EngineClient(socket_path)
+        assert client.call('extract_text_from_pdf', os.path.join(upload_root, 'cv.pdf')) == expected
+        assert client.call('extract_text_from_pdf', pdf) == expected
+        # Only files under the upload root are opened, whatever the path or symlink says
+        for path in (os.path.join(outside, 'cv.pdf'), os.path.join(upload_root, '..', os.path.basename(outside),
+                                                                    'cv.pdf'), os.path.join(upload_root, 'link.pdf')):
+            try:
+                client.call('extract_text_from_pdf', path)
+                assert False, path
+            except EngineError as e:
+                assert e.error_type == 'PermissionError'
+        client.close()
+        
+        # Workers send files the sidecar cannot open as bytes
+        os.environ[ENV_VAR] = socket_path
+        try:
+            assert ResumeParser.extract_text_from_pdf(os.path.join(outside, 'cv.pdf')) == expected
+            assert ResumeParser.extract_text_from_pdf(os.path.join(outside, 'missing.pdf')) is None
+        finally:
+            del os.environ[ENV_VAR]
+            reset_engine_client()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_engine_client_retries_only_stale_connections():
+    import socket
+    import threading
+    from flask_app.ai_engine.sidecar import EngineUnavailable, read_message, encode_message
+    
+    socket_path = os.path.join(tempfile.mkdtemp(), 'engine.sock')
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen()
+    received, connections = [], []
+    
+    # Answers ping, answers close and then closes the connection, never answers anything else
+    def serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            connections.append(conn)
+            try:
+                while True:
+                    request, codec = read_message(conn)
+                    received.append(request['method'])
+                    if request['method'] in ('ping', 'close'):
+                        conn.sendall(encode_message({'id': request['id'], 'result': 'pong'}, codec))
+                    if request['method'] == 'close':
+                        conn.close()
+                        break
+            except (EOFError, OSError):
+                pass
+    
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    try:
+        client = EngineClient(socket_path, timeout=0.3, retry_after=0)
+        assert client.call('ping') == 'pong'
+        # A slow request is sent once and then left to the caller, not run again on the sidecar
+        try:
+            client.call('analyze_batch', [RESUME], [JD])
+            assert False, 'expected EngineUnavailable'
+        except EngineUnavailable:
+            pass
+        assert received == ['ping', 'analyze_batch']
+        # A pooled connection closed by the sidecar is retried once on a fresh one
+        assert client.call('close') == 'pong'
+        assert client.call('ping') == 'pong'
+        assert received == ['ping', 'analyze_batch', 'close', 'ping']
+        client.close()
+    finally:
+        listener.close()
+        for conn in connections:
+            conn.close()
+
+
+if __name__ == "__main__":
+    try:
+        test_hashing_score_tracks_fitted_tfidf()
+        test_incremental_idf_matches_single_pass()
+        test_hybrid_score_hashing_mode()
+        test_lsa_embeddings_and_lsh_index()
+        test_analyze_batch_matches_single_pair()
+        test_minhash_lsh_finds_near_duplicates()
+        test_skill_cooccurrence_partial_credit()
+        test_batch_report_generation()
+        test_engine_sidecar_matches_in_process()
+        test_engine_sidecar_file_access()
+        test_engine_client_retries_only_stale_connections()
+        print("ALL FEATURE TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+
+# Add parent directory to path to import flask_app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from reportlab.pdfgen import canvas
+from flask_app import db
+from flask_app.models import User, JobPosting
+
+JD = "Looking for a Python engineer who knows Flask, SQL and Docker. AWS experience is a plus for this role."
+
+
+def make_resume_pdf():
+    path = os.path.join(tempfile.mkdtemp(), 'resume.pdf')
+    c = canvas.Canvas(path)
+    c.drawString(100, 750, "John Smith - Python Developer")
+    c.drawString(100, 730, "Skills: Python, Flask, Docker, AWS, Git")
+    c.save()
+    return path
+
+
+def test_api_resume_analysis_and_jobs(app, client, login):
+    with app.app_context():
+        hr = User(username='hr', email='hr@example.com', role='hr')
+        hr.set_password('pw')
+        seeker = User(username='seeker', email='seeker@example.com')
+        seeker.set_password('pw')
+        db.session.add_all([hr, seeker])
+        db.session.commit()
+        hr_id, seeker_id = hr.id, seeker.id
+
+    assert client.get('/api/v1/analyses').status_code == 401
+
+    # Bulk job creation is HR-only and all-or-nothing
+    login(client, hr_id)
+    invalid = client.post('/api/v1/jobs/bulk', json={'jobs': [{'title': 'x'}]})
+    assert invalid.status_code == 400 and '0' in invalid.get_json()['errors']
+    jobs = [{'title': f'Engineer {i}', 'company': 'Acme', 'description': JD + f' Team {i}.',
+             'required_skills': 'Python, SQL'} for i in range(3)]
+    created = client.post('/api/v1/jobs/bulk', json={'jobs': jobs})
+    assert created.status_code == 201
+    job_ids = [job['id'] for job in created.get_json()['items']]
+    with app.app_context():
+        assert JobPosting.query.count() == 3
+
+    login(client, seeker_id)
+    assert client.post('/api/v1/jobs/bulk', json={'jobs': jobs}).status_code == 403
+
+    with open(make_resume_pdf(), 'rb') as f:
+        uploaded = client.post('/api/v1/resumes', data={'file': (f, 'resume.pdf')},
+                               content_type='multipart/form-data')
+    assert uploaded.status_code == 201
+    resume_id = uploaded.get_json()['id']
+    assert 'python' in uploaded.get_json()['skills']
+
+    # Skill filters run in the database, through the normalized skill links
+    assert [r['id'] for r in client.get('/api/v1/resumes?skill=python&skill=docker').get_json()['items']] == [resume_id]
+    assert client.get('/api/v1/resumes?skill=kubernetes').get_json()['items'] == []
+    # Skills match whatever their case in the request or the stored list
+    assert [r['id'] for r in client.get('/api/v1/resumes?skill=Python&skill=DOCKER').get_json()['items']] == [resume_id]
+    assert len(client.get('/api/v1/jobs?skill=sql').get_json()['items']) == 3
+    assert client.get('/api/v1/jobs?skill=sql&skill=rust').get_json()['items'] == []
+    assert len(client.get('/api/v1/jobs?skill=SQL').get_json()['items']) == 3
+
+    single = client.post('/api/v1/analyses', json={'resume_id': resume_id, 'job_description': JD})
+    assert single.status_code == 201
+    analysis_id = single.get_json()['id']
+
+    bulk = client.post('/api/v1/analyses/bulk', json={'resume_id': resume_id,
+                                                      'job_ids': job_ids + ['missing-id']})
+    assert bulk.status_code == 201
+    body = bulk.get_json()
+    assert [item['job_id'] for item in body['items']] == job_ids
+    assert body['missing_job_ids'] == ['missing-id']
+
+    # ETags: an unchanged analysis revalidates with 304
+    fetched = client.get(f'/api/v1/analyses/{analysis_id}')
+    assert fetched.status_code == 200 and fetched.get_json()['match_score'] == single.get_json()['match_score']
+    etag = fetched.headers['ETag']
+    assert client.get(f'/api/v1/analyses/{analysis_id}', headers={'If-None-Match': etag}).status_code == 304
+
+    # Cursor pagination walks the four analyses newest first without repeats
+    seen, query = [], {'limit': 3}
+    while True:
+        page = client.get('/api/v1/analyses', query_string=query).get_json()
+        seen += [item['id'] for item in page['items']]
+        if not page['next_cursor']:
+            break
+        query = {'limit': 3, 'cursor': page['next_cursor']}
+    assert len(seen) == 4 and len(set(seen)) == 4 and analysis_id in seen
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
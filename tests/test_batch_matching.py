@@ -0,0 +1,77 @@
+import os
+import sys
+
+# Add parent directory to path to import utils
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.matcher as matcher
+import utils.batch as batch
+
+JD = "python engineer flask sql docker aws plus"
+RESUMES = [
+    "python developer flask docker aws experience build machine learning pipeline pandas",
+    "java spring boot backend developer sql",
+    "",
+    "python python sql sql aws",
+]
+RESUME_SKILLS = [["python", "flask", "docker", "aws"], ["java", "sql"], [], ["python", "sql", "aws"]]
+JD_SKILLS = ["python", "flask", "sql", "docker", "aws"]
+
+
+def test_batch_scores_match_single_pair():
+    batched = matcher.calculate_batch_hybrid_scores(RESUMES, JD, RESUME_SKILLS, JD_SKILLS)
+    single = [matcher.calculate_hybrid_score(text, JD, skills, JD_SKILLS)
+              for text, skills in zip(RESUMES, RESUME_SKILLS)]
+    print(f"Batch: {batched}  Single: {single}")
+    assert batched == single
+
+
+def test_batch_content_scores_match_tfidf():
+    scores = matcher.calculate_batch_match_scores(RESUMES, JD)
+    for text, score in zip(RESUMES, scores):
+        assert abs(score - matcher.calculate_match_score(text, JD)) < 1e-12
+
+
+def test_multi_jd_scores_match_single_pair():
+    resume, resume_skills = RESUMES[0], RESUME_SKILLS[0]
+    jds = [JD, "java spring sql", "", "python pandas machine learning"]
+    jd_skills_list = [JD_SKILLS, ["java", "sql"], [], ["python", "pandas", "machine learning"]]
+    multi = matcher.calculate_multi_jd_hybrid_scores(resume, jds, resume_skills, jd_skills_list)
+    single = [matcher.calculate_hybrid_score(resume, jd, resume_skills, jd_skills)
+              for jd, jd_skills in zip(jds, jd_skills_list)]
+    print(f"Multi: {multi}  Single: {single}")
+    assert multi == single
+
+
+def test_parse_job_descriptions():
+    pasted = "Backend Engineer\nPython and SQL\n---\nFrontend Engineer\nReact\n"
+    jsonl = b'{"title": "Data Scientist", "description": "pandas"}\n\n{"text": "docker"}\n{"title": "empty"}\n'
+    jobs = batch.parse_job_descriptions(pasted, "jobs.jsonl", jsonl)
+    assert [job["title"] for job in jobs] == ["Backend Engineer", "Frontend Engineer", "Data Scientist", "JD 4"]
+    assert jobs[3]["description"] == "docker"
+
+    csv_jobs = batch.parse_job_descriptions("", "jobs.csv", b"Title,Description\nSRE,kubernetes and linux\n")
+    assert csv_jobs == [{"title": "SRE", "description": "kubernetes and linux"}]
+
+
+def test_resume_cache_drops_least_recently_used():
+    cache = batch.ResumeCache(max_entries=2)
+    cache.put("a", {"filename": "a.pdf"})
+    cache.put("b", {"filename": "b.pdf"})
+    assert cache.get("a") == {"filename": "a.pdf"}
+    cache.put("c", {"filename": "c.pdf"})
+    assert cache.get("b") is None and len(cache) == 2
+    assert [cache.get(key)["filename"] for key in ("a", "c")] == ["a.pdf", "c.pdf"]
+
+
+if __name__ == "__main__":
+    try:
+        test_batch_scores_match_single_pair()
+        test_batch_content_scores_match_tfidf()
+        test_multi_jd_scores_match_single_pair()
+        test_parse_job_descriptions()
+        test_resume_cache_drops_least_recently_used()
+        print("ALL BATCH MATCHING TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,74 @@
+import os
+import sys
+import tempfile
+
+# Add parent directory to path to import flask_app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+import sqlalchemy as sa
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from flask_app.config import Config
+from flask_app.database import READ_ENGINE_KEY, RoutingSession, init_database, is_sqlite_file
+
+
+def make_app(db_path):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+    class Note(db.Model):
+        id = db.Column(db.Integer, primary_key=True)
+        body = db.Column(db.String(100))
+
+    init_database(app, db)
+    with app.app_context():
+        db.create_all()
+    return app, db, Note
+
+
+def test_is_sqlite_file():
+    assert is_sqlite_file('sqlite:////tmp/app.db')
+    assert not is_sqlite_file('sqlite:///:memory:')
+    assert not is_sqlite_file('sqlite://')
+    assert not is_sqlite_file('postgresql://localhost/app')
+
+
+def test_pragmas_and_read_write_routing():
+    app, db, Note = make_app(os.path.join(tempfile.mkdtemp(), 'app.db'))
+    with app.app_context():
+        reader = app.extensions[READ_ENGINE_KEY]
+        for engine in (db.engine, reader):
+            with engine.connect() as conn:
+                assert conn.exec_driver_sql('PRAGMA journal_mode').scalar() == 'wal'
+                assert conn.exec_driver_sql('PRAGMA synchronous').scalar() == 1  # NORMAL
+                assert conn.exec_driver_sql('PRAGMA busy_timeout').scalar() == Config.SQLITE_PRAGMAS['busy_timeout']
+        # The read pool cannot write
+        with reader.connect() as conn:
+            with pytest.raises(sa.exc.OperationalError):
+                conn.exec_driver_sql("INSERT INTO note (body) VALUES ('x')")
+
+        session = db.session
+        select = sa.select(Note)
+        assert session.get_bind(clause=select) is reader
+        session.add(Note(body='first'))
+        assert session.scalars(select).one().body == 'first'  # autoflushed, read back on the writer
+        assert session.get_bind(clause=select) is db.engine
+        session.commit()
+        assert session.get_bind(clause=select) is reader
+        assert session.scalars(select).one().body == 'first'
+        assert session.get_bind(clause=select.with_for_update()) is db.engine
+        session.rollback()
+        db.session.remove()
+
+
+if __name__ == "__main__":
+    try:
+        test_is_sqlite_file()
+        test_pragmas_and_read_write_routing()
+        print("ALL DATABASE TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,53 @@
+import os
+import sys
+import time
+import uuid
+
+# Add parent directory to path to import flask_app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sqlalchemy as sa
+from flask_app.keys import UUIDKey, new_id, key_bytes, key_string
+
+
+def test_new_id_is_time_ordered():
+    ids = []
+    for _ in range(5):
+        ids.append(new_id())
+        time.sleep(0.002)
+    assert ids == sorted(ids)
+    assert all(uuid.UUID(id_).version == 7 for id_ in ids)
+    assert key_string(key_bytes(ids[0])) == ids[0]
+    assert key_bytes('r1') is None
+
+
+def test_binary_keys_round_trip():
+    engine = sa.create_engine('sqlite://')
+    metadata = sa.MetaData()
+    users = sa.Table('users', metadata, sa.Column('id', UUIDKey(binary=True), primary_key=True))
+    resumes = sa.Table('resumes', metadata,
+                       sa.Column('id', UUIDKey(binary=True), primary_key=True),
+                       sa.Column('user_id', UUIDKey(binary=True), sa.ForeignKey('users.id')))
+    metadata.create_all(engine)
+    user_id, resume_id = new_id(), new_id()
+    with engine.begin() as conn:
+        conn.execute(users.insert().values(id=user_id))
+        conn.execute(resumes.insert().values(id=resume_id, user_id=user_id))
+    with engine.connect() as conn:
+        # Stored as 16 bytes, returned as the id string
+        assert conn.exec_driver_sql('SELECT length(id), typeof(id) FROM users').one() == (16, 'blob')
+        row = conn.execute(sa.select(resumes.c.id, users.c.id).join(users)
+                           .where(resumes.c.user_id == user_id)).one()
+        assert row == (resume_id, user_id)
+        # Malformed ids match nothing instead of raising
+        assert conn.execute(sa.select(users.c.id).where(users.c.id == 'not-an-id')).first() is None
+
+
+if __name__ == "__main__":
+    try:
+        test_new_id_is_time_ordered()
+        test_binary_keys_round_trip()
+        print("ALL KEY TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        sys.exit(1)
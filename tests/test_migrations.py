@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+
+# Add parent directory to path to import flask_app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sqlalchemy as sa
+from flask_app import create_app, db
+from flask_app.models import ResumeText, Analysis
+from flask_app.ai_engine import ResumeMatcher
+from flask_app.migrations import upgrade, current_version, latest_version, route_queries, explain_queries
+
+ATS_FINDINGS = ["Email address not detected.", "Missing 'Summary' section header.", "Custom note"]
+
+
+def make_legacy_db(db_path):
+    # Schema of a database created before migrate_db.py's columns and without version tracking
+    conn = sqlite3.connect(db_path)
+    conn.executescript("""
+        CREATE TABLE users (id VARCHAR(36) PRIMARY KEY, username VARCHAR(80) NOT NULL,
+                            email VARCHAR(120) NOT NULL, password_hash VARCHAR(255) NOT NULL);
+        CREATE TABLE resumes (id VARCHAR(36) PRIMARY KEY, user_id VARCHAR(36) NOT NULL,
+                              filename VARCHAR(255) NOT NULL, filepath VARCHAR(500) NOT NULL,
+                              extracted_text TEXT, extracted_skills JSON, created_at DATETIME);
+        CREATE TABLE analyses (id VARCHAR(36) PRIMARY KEY, user_id VARCHAR(36) NOT NULL,
+                               resume_id VARCHAR(36) NOT NULL, job_id VARCHAR(36), match_score FLOAT,
+                               matched_skills JSON, missing_skills JSON, suggestions JSON,
+                               match_percentage INTEGER, ats_score FLOAT, ats_details JSON,
+                               job_description TEXT, created_at DATETIME, updated_at DATETIME);
+        INSERT INTO users VALUES ('u1', 'jane', 'jane@example.com', 'x');
+        INSERT INTO resumes VALUES ('r1', 'u1', 'cv.pdf', '/tmp/cv.pdf', 'Python', '["Python", "sql", "python"]',
+                                    '2024-01-01 00:00:00');
+    """)
+    # One analysis with the text the engine generated and one with edited suggestions
+    suggestions, _, _ = ResumeMatcher.derived_text(['aws'])
+    ats_details = {'findings': ATS_FINDINGS}
+    for analysis_id, stored_suggestions in [('a1', suggestions), ('a2', ['Custom suggestion'])]:
+        conn.execute("INSERT INTO analyses (id, user_id, resume_id, missing_skills, suggestions, ats_details) "
+                     "VALUES (?, 'u1', 'r1', ?, ?, ?)",
+                     (analysis_id, json.dumps(['aws']), json.dumps(stored_suggestions), json.dumps(ats_details)))
+    conn.commit()
+    conn.close()
+
+
+def test_upgrade_legacy_database():
+    db_path = os.path.join(tempfile.mkdtemp(), 'app.db')
+    make_legacy_db(db_path)
+    engine = sa.create_engine(f'sqlite:///{db_path}')
+
+    with engine.connect() as conn:
+        assert current_version(conn) == 0
+    assert upgrade(engine, target=1) == [1]
+    assert upgrade(engine) == list(range(2, latest_version() + 1))
+    assert upgrade(engine) == []
+
+    inspector = sa.inspect(engine)
+    resume_columns = {col['name'] for col in inspector.get_columns('resumes')}
+    assert {'embedding', 'content_hash', 'minhash', 'duplicate_of_id'} <= resume_columns
+    # Resume text moved to the compressed side table
+    assert 'extracted_text' not in resume_columns
+    assert {'ix_analyses_user_id_created_at', 'ix_analyses_resume_id'} <= \
+        {index['name'] for index in inspector.get_indexes('analyses')}
+    assert inspector.has_table('job_postings')
+    with engine.connect() as conn:
+        assert current_version(conn) == latest_version()
+        body = conn.exec_driver_sql("SELECT body FROM resume_texts WHERE resume_id = 'r1'").scalar()
+        assert ResumeText.decode(body) == 'Python'
+        # Skill lists are backfilled into the normalized link table
+        linked = conn.exec_driver_sql("SELECT s.name FROM resume_skill rs JOIN skills s ON s.id = rs.skill_id "
+                                      "WHERE rs.resume_id = 'r1' ORDER BY s.name").scalars().all()
+        assert linked == ['python', 'sql']
+
+    # Derived text is dropped where it matches the banks and kept where it was edited
+    session = sa.orm.Session(engine)
+    generated, edited = session.get(Analysis, 'a1'), session.get(Analysis, 'a2')
+    assert generated.stored_suggestions is None and generated.stored_ats_details is None
+    assert generated.engine_version == ResumeMatcher.ENGINE_VERSION
+    assert generated.ats_codes == ['no_email', 'missing_section:summary', 'Custom note']
+    assert generated.ats_findings == ATS_FINDINGS
+    assert generated.suggestions == ResumeMatcher.derived_text(['aws'])[0]
+    assert generated.interview_questions == ResumeMatcher.derived_text(['aws'])[1]
+    assert edited.suggestions == ['Custom suggestion'] and edited.engine_version is None
+    session.close()
+    engine.dispose()
+
+
+def test_derived_text_follows_engine_version(monkeypatch):
+    v1 = ResumeMatcher.derived_text(['aws'])
+    # A bump that rewrites the suggestion bank keeps the version 1 renderers registered
+    renderers = ResumeMatcher.DERIVED_TEXT[1]
+    monkeypatch.setattr(ResumeMatcher, 'ENGINE_VERSION', 2)
+    monkeypatch.setitem(ResumeMatcher.DERIVED_TEXT, 2, (lambda skills: ['Learn ' + ', '.join(skills)],) + renderers[1:])
+
+    old, new = Analysis(missing_skills=['aws'], engine_version=1), Analysis(missing_skills=['aws'], engine_version=2)
+    legacy = Analysis(missing_skills=['aws'], stored_suggestions=['Custom suggestion'])
+    assert old.suggestions == v1[0] and new.suggestions == ['Learn aws']
+    assert legacy.suggestions == ['Custom suggestion'] and legacy.interview_questions == v1[1]
+    assert ResumeMatcher.derived_text(['aws'])[0] == ['Learn aws']
+    # Versions without registered renderers use the current banks
+    assert Analysis(missing_skills=['aws'], engine_version=7).suggestions == ['Learn aws']
+
+
+def test_route_queries_use_indexes():
+    # The factory migrates the in-memory test database at startup
+    app = create_app('testing')
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert current_version(conn) == latest_version()
+            report = explain_queries(conn, route_queries())
+    assert len(report) == len(route_queries())
+    for label, plan in report:
+        # Every lookup is an index search, never a full table scan
+        assert any('USING' in step and 'INDEX' in step for step in plan), (label, plan)
+        assert not any(step.startswith('SCAN') and 'INDEX' not in step for step in plan), (label, plan)
+        assert not any('TEMP B-TREE' in step for step in plan), (label, plan)
+
+
+if __name__ == "__main__":
+    try:
+        test_upgrade_legacy_database()
+        test_route_queries_use_indexes()
+        print("ALL MIGRATION TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        sys.exit(1)
@@ -0,0 +1,78 @@
+import os
+import sys
+
+# Add parent directory to path to import flask_app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+from flask_app import db
+from flask_app.database import json_contains, postgres_url
+from flask_app.models import User, Resume, JobPosting
+from flask_app.migrations import upgrade, schema_migrations
+
+# A throwaway database, e.g. postgresql://postgres@localhost/resume_analyzer_test
+POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL')
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason='TEST_POSTGRES_URL is not set')
+
+
+def reset(engine):
+    db.metadata.drop_all(engine)
+    schema_migrations.drop(engine, checkfirst=True)
+
+
+def test_jsonb_skills_and_gin_containment():
+    engine = sa.create_engine(postgres_url(POSTGRES_URL))
+    reset(engine)
+    try:
+        upgrade(engine)
+        columns = {col['name']: col['type'] for col in sa.inspect(engine).get_columns('resumes')}
+        assert type(columns['extracted_skills']).__name__ == 'JSONB'
+        assert 'ix_job_postings_required_skills_gin' in \
+            {index['name'] for index in sa.inspect(engine).get_indexes('job_postings')}
+
+        with Session(engine) as session:
+            user = User(username='u', email='u@example.com', password_hash='x')
+            session.add(user)
+            session.flush()
+            session.add_all([Resume(user_id=user.id, filename=f'{i}.pdf', filepath=f'/{i}.pdf',
+                                    extracted_skills=skills)
+                             for i, skills in enumerate([['python', 'kubernetes'], ['python'], ['java']])])
+            session.commit()
+
+            query = sa.select(Resume.filename).where(json_contains(Resume.extracted_skills, ['kubernetes']))
+            assert session.scalars(query).all() == ['0.pdf']
+            query = sa.select(Resume.filename).where(json_contains(Resume.extracted_skills, ['python']))
+            assert sorted(session.scalars(query).all()) == ['0.pdf', '1.pdf']
+
+            # Job requirements use the same containment, so every listed skill must be required
+            session.add_all([JobPosting(title=title, company='Acme', description='Build things', required_skills=skills)
+                             for title, skills in [('Backend', ['python', 'sql']), ('Platform', ['kubernetes'])]])
+            session.commit()
+            jobs = sa.select(JobPosting.title).where(json_contains(JobPosting.required_skills, ['python', 'sql']))
+            assert session.scalars(jobs).all() == ['Backend']
+            assert session.scalars(sa.select(JobPosting.title).where(
+                json_contains(JobPosting.required_skills, ['python', 'kubernetes']))).all() == []
+
+            # The planner can answer containment from the GIN index
+            session.execute(sa.text('SET LOCAL enable_seqscan = off'))
+            compiled = query.compile(engine)
+            plan = session.connection().exec_driver_sql('EXPLAIN ' + str(compiled), compiled.params).scalars().all()
+            assert any('ix_resumes_extracted_skills_gin' in line for line in plan), plan
+    finally:
+        reset(engine)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    if not POSTGRES_URL:
+        print("SKIPPED: TEST_POSTGRES_URL is not set")
+        sys.exit(0)
+    try:
+        test_jsonb_skills_and_gin_containment()
+        print("ALL POSTGRES TESTS PASSED")
+    except Exception as e:
+        print(f"TEST FAILED: {e}")
+        sys.exit(1)
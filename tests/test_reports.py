@@ -0,0 +1,176 @@
+import io
+import os
+import sys
+import time
+import zipfile
+import threading
+
+# Add parent directory to path to import flask_app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from sqlalchemy import event
+from flask_app import db, reports
+from flask_app.models import User, Resume, Analysis, JobPosting
+
+
+def make_analysis(app):
+    """A user with one analysed resume; returns (user id, analysis id)"""
+    with app.app_context():
+        user = User(username='alice', email='alice@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        resume = Resume(user_id=user.id, filename='alice.pdf', filepath='/alice.pdf')
+        db.session.add(resume)
+        db.session.flush()
+        analysis = Analysis(user_id=user.id, resume_id=resume.id, match_score=72.5,
+                            matched_skills=['python'], missing_skills=['docker'])
+        db.session.add(analysis)
+        db.session.commit()
+        return user.id, analysis.id
+
+
+def count_renders(monkeypatch, delay=0.0):
+    """Wrap reports.render_report so calls are counted (and slowed down by delay)"""
+    calls = []
+    render = reports.render_report
+
+    def counted(analysis):
+        calls.append(analysis.id)
+        time.sleep(delay)
+        return render(analysis)
+
+    monkeypatch.setattr(reports, 'render_report', counted)
+    return calls
+
+
+def test_write_cache_from_many_threads(tmp_path):
+    path = str(tmp_path / 'cache' / 'report.pdf')
+    payloads = [bytes([n]) * 200_000 for n in range(8)]
+    errors = []
+
+    def write(payload):
+        try:
+            reports._write_cache(path, payload)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(payload,)) for payload in payloads]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    with open(path, 'rb') as f:
+        assert f.read() in payloads
+    assert os.listdir(os.path.dirname(path)) == ['report.pdf']
+
+
+def test_concurrent_requests_share_one_render(app, monkeypatch):
+    _, analysis_id = make_analysis(app)
+    calls = count_renders(monkeypatch, delay=0.2)
+    paths, errors = [], []
+
+    def download():
+        with app.app_context():
+            try:
+                paths.append(reports.get_report(db.session.get(Analysis, analysis_id)))
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=download) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == [] and calls == [analysis_id]
+    assert len(set(paths)) == 1 and os.listdir(app.config['REPORT_CACHE_DIR']) == [os.path.basename(paths[0])]
+
+
+def test_download_report(app, client, login, monkeypatch):
+    user_id, analysis_id = make_analysis(app)
+    calls = count_renders(monkeypatch)
+    app.config['REPORT_EAGER_RENDER'] = True
+    login(client, user_id)
+
+    # The background render scheduled after analysis and the download render once between them
+    with app.app_context():
+        pending = reports.schedule_report(db.session.get(Analysis, analysis_id))
+    first = client.get(f'/analysis/result/{analysis_id}/report')
+    pending.result()
+    assert first.status_code == 200 and first.mimetype == 'application/pdf'
+    assert first.data.startswith(b'%PDF')
+    second = client.get(f'/analysis/result/{analysis_id}/report')
+    assert second.data == first.data and calls == [analysis_id]
+
+    # Editing the analysis renders a new version and drops the old file
+    with app.app_context():
+        db.session.get(Analysis, analysis_id).match_score = 90.0
+        db.session.commit()
+    assert client.get(f'/analysis/result/{analysis_id}/report').status_code == 200
+    assert len(calls) == 2 and len(os.listdir(app.config['REPORT_CACHE_DIR'])) == 1
+
+
+def test_export_job_reports_zip(app, client, login):
+    app.config['REPORT_EXPORT_WORKERS'] = 2
+    with app.app_context():
+        hr = User(username='hr', email='hr@example.com', password_hash='x', role='hr')
+        applicant = User(username='bob', email='bob@example.com', password_hash='x')
+        db.session.add_all([hr, applicant])
+        db.session.flush()
+        job = JobPosting(title='Backend Dev', company='Acme', description='Build APIs', posted_by=hr.id)
+        resume = Resume(user_id=applicant.id, filename='bob.pdf', filepath='/bob.pdf')
+        db.session.add_all([job, resume])
+        db.session.flush()
+        # Same applicant and resume, created within the same millisecond
+        db.session.add_all([Analysis(user_id=applicant.id, resume_id=resume.id, job_id=job.id, match_score=score)
+                            for score in (40.0, 60.0, 80.0)])
+        db.session.commit()
+        hr_id, job_id = hr.id, job.id
+        reports.get_report(Analysis.query.filter_by(match_score=60.0).one())
+
+    login(client, hr_id)
+    assert b'Reports (3)' in client.get('/hr/jobs').data
+    response = client.get(f'/hr/jobs/{job_id}/reports.zip')
+    assert response.status_code == 200 and response.mimetype == 'application/zip'
+    with zipfile.ZipFile(io.BytesIO(response.data)) as archive:
+        names = archive.namelist()
+        assert len(set(names)) == 3 and all(name.startswith('bob_bob_') for name in names)
+        assert all(archive.read(name).startswith(b'%PDF') for name in names)
+    # The two renders made for the archive were cached alongside the existing one
+    assert len(os.listdir(app.config['REPORT_CACHE_DIR'])) == 3
+
+
+def test_export_history(app, client, login):
+    user_id, _ = make_analysis(app)
+    with app.app_context():
+        resume = Resume(user_id=user_id, filename='alice_v2.pdf', filepath='/alice_v2.pdf')
+        db.session.add(resume)
+        db.session.flush()
+        db.session.add(Analysis(user_id=user_id, resume_id=resume.id, match_score=80.0))
+        db.session.commit()
+    login(client, user_id)
+
+    # Resume filenames come with the analyses rather than one query per row
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        response = client.get('/analysis/history/export?format=json')
+        records = response.get_json()
+    finally:
+        with app.app_context():
+            event.remove(db.engine, 'before_cursor_execute', listener)
+    assert response.status_code == 200
+    assert sorted(record['resume'] for record in records) == ['alice.pdf', 'alice_v2.pdf']
+    assert sum('FROM analyses' in statement for statement in statements) == 1
+    assert not any('FROM resumes' in statement and 'analyses' not in statement for statement in statements)
+
+    csv_lines = client.get('/analysis/history/export?format=csv').data.decode().splitlines()
+    assert len(csv_lines) == 3
+    assert client.get('/analysis/history/export?format=xml').status_code == 302
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,62 @@
+import os
+import sys
+
+# Add parent directory to path to import flask_app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+from flask_app import db
+from flask_app.models import User, Resume, JobPosting, Skill, resume_skill
+from flask_app.skills import resumes_with_skills, count_candidates, jobs_with_skills, top_skills
+
+DESCRIPTION = 'A role building web interfaces and the services behind them for our customers.'
+
+
+def test_skill_links_and_queries(app, client, login):
+    with app.app_context():
+        hr = User(username='hr', email='hr@example.com', role='hr', password_hash='x')
+        alice = User(username='alice', email='alice@example.com', password_hash='x')
+        bob = User(username='bob', email='bob@example.com', password_hash='x')
+        db.session.add_all([hr, alice, bob])
+        db.session.flush()
+        db.session.add_all([
+            Resume(user_id=alice.id, filename='a1.pdf', filepath='/a1', extracted_skills=['docker', 'python']),
+            Resume(user_id=alice.id, filename='a2.pdf', filepath='/a2', extracted_skills=['docker', 'aws']),
+            Resume(user_id=bob.id, filename='b.pdf', filepath='/b', extracted_skills=['python']),
+            JobPosting(title='Frontend', company='Acme', description=DESCRIPTION, location='Berlin, DE',
+                       required_skills=['React', ' CSS '], posted_by=hr.id),
+            JobPosting(title='Frontend', company='Acme', description=DESCRIPTION, location='Munich',
+                       required_skills=['react'], posted_by=hr.id),
+        ])
+        db.session.commit()
+
+        # Links are written at ingest, with names normalized
+        assert Skill.query.count() == 5
+        assert count_candidates(['docker']) == 1
+        assert count_candidates(['Python']) == 2
+        assert count_candidates(['docker', 'python']) == 1
+        assert count_candidates(['cobol']) == 0
+        assert [job.location for job in jobs_with_skills(['react'], 'berlin')] == ['Berlin, DE']
+        assert jobs_with_skills(['react', 'css']).count() == 1
+        assert top_skills(limit=2) == [('docker', 2), ('python', 2)]
+
+        # Edits and deletes keep the links in sync
+        resume = Resume.query.filter_by(filename='b.pdf').one()
+        resume.extracted_skills = ['go']
+        db.session.commit()
+        assert count_candidates(['python']) == 1
+        assert [r.filename for r in resumes_with_skills(['go'])] == ['b.pdf']
+        db.session.delete(resume)
+        db.session.commit()
+        assert db.session.query(resume_skill).count() == 4
+        hr_id = hr.id
+
+    login(client, hr_id)
+    page = client.get('/hr/?skill=docker')
+    assert page.status_code == 200 and b'<strong>1</strong> candidate' in page.data
+    page = client.get('/hr/jobs?skill=react&location=munich')
+    assert page.status_code == 200 and page.data.count(b'<strong>Frontend</strong>') == 1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
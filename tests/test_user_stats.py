@@ -0,0 +1,81 @@
+import os
+import sys
+import pytest
+from datetime import datetime, timedelta
+
+# Add parent directory to path to import flask_app
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask_sqlalchemy.record_queries import get_recorded_queries
+from flask_app import db
+from flask_app.models import User, Resume, Analysis, UserStats
+from flask_app.migrations import rebuild_user_stats
+
+
+def stats_of(user_id):
+    db.session.expire_all()
+    stats = db.session.get(UserStats, user_id)
+    return (stats.resume_count, stats.analysis_count, stats.scored_count, stats.score_sum,
+            stats.last_analysis_at)
+
+
+def test_user_stats_follow_writes(app, client, login):
+    start = datetime(2026, 1, 1)
+    with app.app_context():
+        alice = User(username='alice', email='alice@example.com', password_hash='x')
+        db.session.add(alice)
+        db.session.commit()
+        user_id = alice.id
+        assert stats_of(user_id) == (0, 0, 0, 0.0, None)
+
+        resume = Resume(user_id=user_id, filename='a.pdf', filepath='/a')
+        other = Resume(user_id=user_id, filename='b.pdf', filepath='/b')
+        db.session.add_all([resume, other])
+        db.session.flush()
+        db.session.add_all([
+            Analysis(user_id=user_id, resume_id=resume.id, match_score=80.0, created_at=start),
+            Analysis(user_id=user_id, resume_id=resume.id, match_score=20.0, created_at=start + timedelta(days=2)),
+            Analysis(user_id=user_id, resume_id=other.id, match_score=60.0, created_at=start + timedelta(days=1)),
+        ])
+        db.session.commit()
+        assert stats_of(user_id) == (2, 3, 3, 160.0, start + timedelta(days=2))
+        assert db.session.get(UserStats, user_id).avg_score == 160.0 / 3
+
+        # Rescoring moves the sum, deleting recomputes the last analysis time
+        Analysis.query.filter_by(match_score=20.0).one().match_score = 40.0
+        db.session.commit()
+        assert stats_of(user_id) == (2, 3, 3, 180.0, start + timedelta(days=2))
+        Analysis.query.filter_by(match_score=40.0).one().match_score = None
+        db.session.commit()
+        assert stats_of(user_id) == (2, 3, 2, 140.0, start + timedelta(days=2))
+        Analysis.query.filter_by(match_score=None).one().match_score = 40.0
+        db.session.commit()
+        db.session.delete(Analysis.query.filter_by(match_score=40.0).one())
+        db.session.commit()
+        assert stats_of(user_id) == (2, 2, 2, 140.0, start + timedelta(days=1))
+
+        # Deleting a resume takes its analyses with it
+        db.session.delete(db.session.get(Resume, other.id))
+        db.session.commit()
+        assert stats_of(user_id) == (1, 1, 1, 80.0, start)
+
+        # The migration backfill arrives at the same figures
+        with db.engine.begin() as conn:
+            assert rebuild_user_stats(conn) == 1
+        assert stats_of(user_id) == (1, 1, 1, 80.0, start)
+
+    login(client, user_id)
+    with app.app_context():
+        page = client.get('/dashboard')
+        assert page.status_code == 200 and b'80.0%' in page.data
+        statements = [query.statement for query in get_recorded_queries()]
+        assert not any('avg(' in statement.lower() or 'count(' in statement.lower() for statement in statements)
+
+    with app.app_context():
+        db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+        assert UserStats.query.count() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__]))
@@ -0,0 +1,55 @@
+"""
+Trains the LSA embedding model offline and backfills stored embeddings.
+
+Fits TF-IDF + TruncatedSVD over every stored resume and job description,
+saves the model to LSA_MODEL_PATH and re-embeds all rows so that the
+stored float32 vectors match the new latent space.
+
+Usage:
+    python train_embeddings.py [n_components]
+"""
+
+import os
+import sys
+from flask_app import create_app, db
+from flask_app.models import Resume, ResumeText, JobPosting
+from flask_app.ai_engine.semantic import LSAEmbedder
+
+app = create_app(os.environ.get('FLASK_ENV', 'development'))
+
+
+def backfill(model, text_attr, has_text, embedder, batch_size=256):
+    """Re-embed every row of a model in batches"""
+    updated = 0
+    ids = [row.id for row in db.session.query(model.id).filter(has_text)]
+    for start in range(0, len(ids), batch_size):
+        rows = model.query.filter(model.id.in_(ids[start:start + batch_size])).all()
+        vectors = embedder.transform([getattr(row, text_attr) for row in rows])
+        for row, vector in zip(rows, vectors):
+            row.embedding = embedder.to_bytes(vector)
+        db.session.commit()
+        updated += len(rows)
+    return updated
+
+
+def train(n_components=LSAEmbedder.DEFAULT_COMPONENTS):
+    with app.app_context():
+        corpus = [ResumeText.decode(body) for (body,) in db.session.query(ResumeText.body)]
+        corpus += [text for (text,) in db.session.query(JobPosting.description) if text]
+        if len(corpus) < 2:
+            print("Not enough documents to train an embedding model.")
+            return
+
+        embedder = LSAEmbedder(n_components=n_components).fit(corpus)
+        path = app.config['LSA_MODEL_PATH']
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        embedder.save(path)
+        print(f"Trained {embedder.dim}-dimensional LSA model on {len(corpus)} documents -> {path}")
+
+        resumes = backfill(Resume, 'extracted_text', Resume.text_record.has(), embedder)
+        jobs = backfill(JobPosting, 'description', JobPosting.description.isnot(None), embedder)
+        print(f"Embedded {resumes} resumes and {jobs} job postings.")
+
+
+if __name__ == '__main__':
+    train(int(sys.argv[1]) if len(sys.argv) > 1 else LSAEmbedder.DEFAULT_COMPONENTS)
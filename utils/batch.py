@@ -0,0 +1,179 @@
+import io
+import os
+import re
+import csv
+import json
+import threading
+from collections import OrderedDict
+import utils.parser as parser
+import utils.nlp_processing as nlp_processing
+import utils.matcher as matcher
+
+def process_resume_file(name, data):
+    """
+    Extracts and preprocesses one uploaded resume.
+    Top-level (picklable) so it can run in a worker process; each worker loads
+    its own spaCy pipeline on first use.
+    Returns a dict with the filename, raw text, lemmatized text and skills,
+    or with text None if the PDF has no extractable text.
+    """
+    resume_text = parser.extract_text_from_pdf(io.BytesIO(data))
+    if not resume_text:
+        return {"filename": name, "text": None, "lemma": "", "skills": []}
+
+    resume_clean = nlp_processing.clean_text(resume_text)
+    return {
+        "filename": name,
+        "text": resume_text,
+        "lemma": nlp_processing.preprocess_text(resume_clean),
+        "skills": nlp_processing.extract_skills(resume_clean),
+    }
+
+class ResumeCache:
+    """
+    Processed resumes keyed on file hash, shared by every session of the app.
+    Holds at most max_entries resumes; the least recently used one is dropped first.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, file_hash):
+        """
+        Returns the cached resume, or None if it was never stored or has been dropped.
+        """
+        with self._lock:
+            resume = self._entries.get(file_hash)
+            if resume is not None:
+                self._entries.move_to_end(file_hash)
+            return resume
+
+    def put(self, file_hash, resume):
+        with self._lock:
+            self._entries[file_hash] = resume
+            self._entries.move_to_end(file_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+def rank_resumes(processed, jd_text):
+    """
+    Scores many processed resumes against one job description in a single
+    vectorized pass and returns per-candidate results, best match first.
+    Resumes without extractable text are kept at the end with score None.
+    """
+    jd_clean = nlp_processing.clean_text(jd_text)
+    jd_lemma = nlp_processing.preprocess_text(jd_clean)
+    jd_skills = nlp_processing.extract_skills(jd_clean)
+
+    readable = [p for p in processed if p["text"]]
+    scores = matcher.calculate_batch_hybrid_scores(
+        [p["lemma"] for p in readable], jd_lemma, [p["skills"] for p in readable], jd_skills
+    )
+
+    results = []
+    for resume, score in zip(readable, scores):
+        matched_skills = sorted(set(resume["skills"]).intersection(jd_skills))
+        missing_skills = sorted(set(jd_skills).difference(resume["skills"]))
+        results.append({
+            "filename": resume["filename"],
+            "score": score,
+            "matched": matched_skills,
+            "missing": missing_skills,
+            "suggestions": nlp_processing.generate_suggestions(missing_skills),
+            "critique": nlp_processing.generate_critique(missing_skills, score, resume["text"]),
+        })
+    results.sort(key=lambda r: r["score"], reverse=True)
+
+    for resume in processed:
+        if not resume["text"]:
+            results.append({"filename": resume["filename"], "score": None, "matched": [], "missing": [],
+                            "suggestions": [], "critique": ["Could not extract text. PDF might be image-based."]})
+    return results
+
+# Text/JSON/CSV fields accepted for a job description and its title
+JD_TEXT_FIELDS = ("description", "job_description", "jd", "text")
+JD_TITLE_FIELDS = ("title", "job_title", "role", "name")
+
+def _job_from_record(record, position):
+    lowered = {str(k).strip().lower(): v for k, v in record.items() if k is not None}
+    description = next((lowered[f] for f in JD_TEXT_FIELDS if lowered.get(f)), None)
+    if not description:
+        return None
+    title = next((lowered[f] for f in JD_TITLE_FIELDS if lowered.get(f)), None)
+    return {"title": str(title).strip() if title else f"JD {position}", "description": str(description).strip()}
+
+def parse_job_descriptions(text="", file_name=None, data=None):
+    """
+    Collects job descriptions from pasted text and/or an uploaded file.
+    Pasted descriptions are separated by a line containing only '---'.
+    Files may be JSONL (one object per line) or CSV with a header; a
+    'description' (or 'jd'/'text') field is required, 'title' is optional.
+    Returns a list of dicts with title and description.
+    """
+    jobs = []
+    for chunk in re.split(r"^\s*---+\s*$", text or "", flags=re.MULTILINE):
+        if chunk.strip():
+            first_line = chunk.strip().splitlines()[0]
+            jobs.append({"title": first_line[:60], "description": chunk.strip()})
+
+    if data:
+        content = data.decode("utf-8-sig") if isinstance(data, bytes) else data
+        if (file_name or "").lower().endswith(".csv"):
+            records = csv.DictReader(io.StringIO(content))
+        else:
+            records = (json.loads(line) for line in content.splitlines() if line.strip())
+        for record in records:
+            job = _job_from_record(record, len(jobs) + 1) if isinstance(record, dict) else None
+            if job:
+                jobs.append(job)
+    return jobs
+
+def compare_job_descriptions(resume, jobs):
+    """
+    Scores one processed resume (see process_resume_file) against many job
+    descriptions. The JDs are lemmatized in one spaCy pipe and scored in a
+    single vectorized pass.
+    Returns per-JD results in input order.
+    """
+    jd_cleans = [nlp_processing.clean_text(job["description"]) for job in jobs]
+    jd_lemmas = nlp_processing.preprocess_texts(jd_cleans)
+    jd_skills_list = [nlp_processing.extract_skills(jd_clean) for jd_clean in jd_cleans]
+
+    scores = matcher.calculate_multi_jd_hybrid_scores(resume["lemma"], jd_lemmas, resume["skills"], jd_skills_list)
+
+    results = []
+    for job, jd_skills, score in zip(jobs, jd_skills_list, scores):
+        results.append({
+            "title": job["title"],
+            "score": score,
+            "required": jd_skills,
+            "matched": sorted(set(resume["skills"]).intersection(jd_skills)),
+            "missing": sorted(set(jd_skills).difference(resume["skills"])),
+        })
+    return results
+
+def match_resume_path(path, jobs, name=None, snippet_chars=1000):
+    """
+    Worker entry point: parses the resume stored at path and scores it against
+    many job descriptions. Taking a path keeps the upload out of the pickled
+    call arguments.
+    Returns a dict with the filename, a text snippet, the resume skills and the
+    per-JD matches best first, or None if the PDF has no extractable text.
+    """
+    with open(path, "rb") as f:
+        resume = process_resume_file(name or os.path.basename(path), f.read())
+    if not resume["text"]:
+        return None
+    matches = compare_job_descriptions(resume, jobs) if jobs else []
+    matches.sort(key=lambda m: m["score"], reverse=True)
+    return {
+        "filename": resume["filename"],
+        "snippet": resume["text"][:snippet_chars],
+        "skills": resume["skills"],
+        "matches": matches,
+    }
@@ -1,4 +1,6 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
 def calculate_match_score(resume_text, jd_text):
@@ -46,3 +48,99 @@ def calculate_hybrid_score(resume_text, jd_text, resume_skills, jd_skills):
     final_score = (content_sim * 0.4) + (skill_match * 0.6)
     
     return round(final_score * 100, 2)
+
+def pairwise_tfidf_cosine(left_counts, right_counts):
+    """
+    Row-wise calculate_match_score for pairs of documents given as term counts.
+    With the TF-IDF fitted on each pair alone, smoothed IDF weighs a term shared
+    by both documents 1 and any other term ln(3/2) + 1, so every pair is scored
+    at once from the shared term mass of its two rows.
+    Returns a numpy array of similarities between 0 and 1 (0 for empty rows).
+    """
+    left = sparse.csr_matrix(left_counts, dtype=np.float64)
+    right = sparse.csr_matrix(right_counts, dtype=np.float64)
+    unshared_idf_sq = (np.log(1.5) + 1.0) ** 2
+
+    dot = np.asarray(left.multiply(right).sum(axis=1)).ravel()
+    left_sq = left.multiply(left)
+    right_sq = right.multiply(right)
+    left_shared = np.asarray(left_sq.multiply(right > 0).sum(axis=1)).ravel()
+    right_shared = np.asarray(right_sq.multiply(left > 0).sum(axis=1)).ravel()
+    left_norm_sq = unshared_idf_sq * (np.asarray(left_sq.sum(axis=1)).ravel() - left_shared) + left_shared
+    right_norm_sq = unshared_idf_sq * (np.asarray(right_sq.sum(axis=1)).ravel() - right_shared) + right_shared
+
+    denominator = np.sqrt(left_norm_sq * right_norm_sq)
+    return np.divide(dot, denominator, out=np.zeros_like(dot), where=denominator > 0)
+
+def calculate_batch_match_scores(resume_texts, jd_text):
+    """
+    Content similarity of many resumes against one job description in a single
+    vectorized pass with pairwise_tfidf_cosine. Each score equals
+    calculate_match_score(resume, jd).
+    Returns a numpy array of similarities between 0 and 1.
+    """
+    scores = np.zeros(len(resume_texts))
+    if not jd_text or not resume_texts:
+        return scores
+
+    try:
+        counts = CountVectorizer().fit_transform(list(resume_texts) + [jd_text]).astype(np.float64)
+    except ValueError:
+        # No tokens at all
+        return scores
+    # Pair every resume row with the job description row
+    jd_rows = np.full(len(resume_texts), counts.shape[0] - 1)
+    scores = pairwise_tfidf_cosine(counts[:-1], counts[jd_rows])
+    # Empty resumes score 0, as in calculate_match_score
+    scores[[not text for text in resume_texts]] = 0.0
+    return scores
+
+def calculate_batch_hybrid_scores(resume_texts, jd_text, resume_skills_list, jd_skills):
+    """
+    calculate_hybrid_score for many resumes against one job description.
+    Returns a list of final scores between 0 and 100, aligned with resume_texts.
+    """
+    if not jd_text:
+        return [0.0] * len(resume_texts)
+
+    content_sims = calculate_batch_match_scores(resume_texts, jd_text)
+    jd_skill_set = set(jd_skills)
+
+    scores = []
+    for text, content_sim, resume_skills in zip(resume_texts, content_sims, resume_skills_list):
+        if not text:
+            scores.append(0.0)
+            continue
+        if not jd_skills:
+            skill_match = 1.0 if resume_skills else 0.0
+        else:
+            skill_match = len(set(resume_skills).intersection(jd_skill_set)) / len(jd_skills)
+        final_score = (float(content_sim) * 0.4) + (skill_match * 0.6)
+        scores.append(round(final_score * 100, 2))
+    return scores
+
+def calculate_multi_jd_hybrid_scores(resume_text, jd_texts, resume_skills, jd_skills_list):
+    """
+    calculate_hybrid_score for one resume against many job descriptions.
+    The pair-local TF-IDF cosine is symmetric, so the JDs are scored against the
+    resume with the same single vectorized pass as calculate_batch_match_scores.
+    Returns a list of final scores between 0 and 100, aligned with jd_texts.
+    """
+    if not resume_text:
+        return [0.0] * len(jd_texts)
+
+    content_sims = calculate_batch_match_scores(jd_texts, resume_text)
+    resume_skill_set = set(resume_skills)
+
+    scores = []
+    for jd_text, content_sim, jd_skills in zip(jd_texts, content_sims, jd_skills_list):
+        if not jd_text:
+            scores.append(0.0)
+            continue
+        if not jd_skills:
+            skill_match = 1.0 if resume_skills else 0.0
+        else:
+            skill_match = len(resume_skill_set.intersection(jd_skills)) / len(jd_skills)
+        final_score = (float(content_sim) * 0.4) + (skill_match * 0.6)
+        scores.append(round(final_score * 100, 2))
+    return scores
@@ -1,14 +1,54 @@
-import spacy
+import os
 import re
 
-# Load spaCy model with fallback
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Downloading 'en_core_web_sm' model...")
-    from spacy.cli import download
-    download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+# spaCy and its model are loaded on first use, so importing this module stays cheap
+_nlp = None
+
+# With this set (see run_engine.py), lemmatization runs on the engine sidecar and this
+# process never loads spaCy; it falls back to the local model while the sidecar is down
+ENGINE_SOCKET_ENV = "AI_ENGINE_SOCKET"
+
+def get_nlp():
+    """
+    Returns the spaCy pipeline, loading (and if needed downloading) it once per process.
+    """
+    global _nlp
+    if _nlp is None:
+        import spacy
+        try:
+            _nlp = spacy.load("en_core_web_sm")
+        except OSError:
+            print("Downloading 'en_core_web_sm' model...")
+            from spacy.cli import download
+            download("en_core_web_sm")
+            _nlp = spacy.load("en_core_web_sm")
+    return _nlp
+
+def _delegate(method, *args):
+    """
+    Runs an NLP method on the engine sidecar when AI_ENGINE_SOCKET is set.
+    Returns None when the work should run in this process instead.
+    """
+    if not os.environ.get(ENGINE_SOCKET_ENV):
+        return None
+    # Only deployments running the sidecar need flask_app importable
+    from flask_app.ai_engine.sidecar import delegate, NOT_DELEGATED
+    result = delegate(method, *args)
+    return None if result is NOT_DELEGATED else result
+
+def warm_up():
+    """
+    Loads spaCy ahead of the first request, unless lemmatization is delegated to the sidecar.
+    """
+    if os.environ.get(ENGINE_SOCKET_ENV):
+        return None
+    return get_nlp()
+
+def __getattr__(name):
+    # Backwards compatible `nlp_processing.nlp`
+    if name == "nlp":
+        return get_nlp()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Common technical skills list (extendable)
 SKILLS_DB = {
@@ -38,10 +78,25 @@ def preprocess_text(text):
     Tokenization and lemmatization using spaCy.
     Returns a clean string of joined tokens.
     """
-    doc = nlp(text)
+    delegated = _delegate("preprocess_text", text)
+    if delegated is not None:
+        return delegated
+    doc = get_nlp()(text)
     tokens = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct]
     return " ".join(tokens)
 
+def preprocess_texts(texts, batch_size=32):
+    """
+    preprocess_text for many texts, streamed through spaCy's nlp.pipe in batches.
+    Returns a list of strings aligned with texts.
+    """
+    texts = list(texts)
+    delegated = _delegate("preprocess_texts", texts)
+    if delegated is not None:
+        return delegated
+    return [" ".join(token.lemma_ for token in doc if not token.is_stop and not token.is_punct)
+            for doc in get_nlp().pipe(texts, batch_size=batch_size)]
+
 def extract_skills(text):
     """
     Extracts skills from text based on the SKILLS_DB.
@@ -5,6 +5,29 @@ from reportlab.lib import colors
 from reportlab.pdfgen import canvas
 import io
 
+# Styles are built on first use and shared by every report in the process
+_STYLES = None
+_TABLE_STYLE = None
+
+def _get_styles():
+    global _STYLES, _TABLE_STYLE
+    if _STYLES is None:
+        styles = getSampleStyleSheet()
+        styles.add(ParagraphStyle(name='Justify', alignment=1))
+        styles.add(ParagraphStyle(name='Header', fontSize=18, spaceAfter=20, alignment=1, textColor=colors.HexColor("#2E86C1")))
+        styles.add(ParagraphStyle(name='SubSection', fontSize=14, spaceBefore=15, spaceAfter=10, textColor=colors.HexColor("#2874A6")))
+        _TABLE_STYLE = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ])
+        _STYLES = styles
+    return _STYLES, _TABLE_STYLE
+
 def generate_report(resume_name, match_score, matched_skills, missing_skills, suggestions):
     """
     Generates a PDF report for the resume analysis.
@@ -13,10 +36,7 @@ def generate_report(resume_name, match_score, matched_skills, missing_skills, su
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
     
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(name='Justify', alignment=1))
-    styles.add(ParagraphStyle(name='Header', fontSize=18, spaceAfter=20, alignment=1, textColor=colors.HexColor("#2E86C1")))
-    styles.add(ParagraphStyle(name='SubSection', fontSize=14, spaceBefore=15, spaceAfter=10, textColor=colors.HexColor("#2874A6")))
+    styles, table_style = _get_styles()
     
     # Content Container
     elements = []
@@ -48,15 +68,7 @@ def generate_report(resume_name, match_score, matched_skills, missing_skills, su
 
     # Table Style
     table = Table(data, colWidths=[200, 200])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-    ]))
+    table.setStyle(table_style)
     elements.append(table)
     elements.append(Spacer(1, 20))
     
@@ -70,3 +82,12 @@ def generate_report(resume_name, match_score, matched_skills, missing_skills, su
     doc.build(elements)
     buffer.seek(0)
     return buffer
+
+def generate_reports(reports):
+    """
+    Generates PDF reports for a batch of analyses with the shared styles.
+    Takes an iterable of dicts with generate_report's arguments and yields
+    the PDF bytes of each, in order.
+    """
+    for report in reports:
+        yield generate_report(**report).getvalue()